@@ -0,0 +1,78 @@
+"""批量激活吞吐基准
+
+使用模拟SDK(每次SADP_ActivateDevice阻塞固定时长并释放GIL)，
+对比逐台调用 activate_device 与不同并发数的 activate_many
+
+运行:
+    python benchmarks/bench_activate.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pysadp import SADP, DeviceInfo
+from pysadp.base import SADP_DEVICE_INFO_V40
+
+DEVICES = 300
+LATENCY = 0.05
+"""模拟的单次激活往返耗时(秒)"""
+
+
+class StubLib:
+    """模拟的Sadp.dll，按线程记录错误码"""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self._errors = threading.local()
+
+    def SADP_SetAutoRequestInterval(self, interval):
+        return 1
+
+    def SADP_ActivateDevice(self, serial_no, password):
+        time.sleep(self.latency)
+        # 序列号以9结尾的设备模拟激活失败(风险密码)
+        if serial_no.endswith(b"9"):
+            self._errors.code = 2020
+            return 0
+        return 1
+
+    def SADP_GetLastError(self):
+        return getattr(self._errors, "code", 0)
+
+
+def make_devices(count: int):
+    devices = []
+    for i in range(count):
+        record = SADP_DEVICE_INFO_V40()
+        record.struSadpDeviceInfo.szSerialNO = f"DS-2CD2T47G2-L{i:09d}".encode()
+        record.struSadpDeviceInfo.szMAC = f"ac-cb-51-00-{i >> 8 & 0xff:02x}-{i & 0xff:02x}".encode()
+        record.struSadpDeviceInfo.byActivated = 1
+        devices.append(DeviceInfo(record))
+    return devices
+
+
+def main():
+    sadp = SADP(backend=StubLib(LATENCY))
+    devices = make_devices(DEVICES)
+    print(f"设备数: {DEVICES}，单次激活耗时: {LATENCY * 1000:.0f}ms")
+    print(f"{'方式':<16}{'耗时(s)':>10}{'吞吐(台/s)':>14}{'失败数':>8}")
+
+    start = time.perf_counter()
+    failed = sum(1 for device in devices if not sadp._activate(device, "abc123456")["success"])
+    elapsed = time.perf_counter() - start
+    print(f"{'serial':<16}{elapsed:>10.2f}{DEVICES / elapsed:>14.1f}{failed:>8}")
+
+    for concurrency in (8, 32, 64):
+        start = time.perf_counter()
+        results = sadp.activate_many(devices, "abc123456", concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for result in results.values() if not result["success"])
+        print(f"{f'concurrency={concurrency}':<16}{elapsed:>10.2f}{DEVICES / elapsed:>14.1f}{failed:>8}")
+
+
+if __name__ == "__main__":
+    main()
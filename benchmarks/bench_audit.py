@@ -0,0 +1,53 @@
+"""网络参数审计基准
+
+生成指定数量的设备记录(含出厂默认IP重复、网关错误、掩码错误)，测量一次audit()的耗时
+
+运行:
+    python benchmarks/bench_audit.py [设备数，默认100000]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pysadp.audit import audit
+from pysadp.base import SADP_DEVICE_INFO_V40
+from pysadp.model import DeviceInfo
+
+
+def make_device(i: int) -> DeviceInfo:
+    record = SADP_DEVICE_INFO_V40()
+    info = record.struSadpDeviceInfo
+    info.szMAC = f"ac-cb-51-{i >> 16 & 0xff:02x}-{i >> 8 & 0xff:02x}-{i & 0xff:02x}".encode()
+    if i % 1000 == 0:
+        # 出厂默认地址
+        info.szIPv4Address = b"192.168.1.64"
+        info.szIPv4SubnetMask = b"255.255.255.0"
+        info.szIPv4Gateway = b"192.168.1.1"
+    else:
+        info.szIPv4Address = f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}".encode()
+        # 少量设备掩码或网关配置错误
+        info.szIPv4SubnetMask = b"255.255.0.0" if i % 997 == 0 else b"255.255.255.0"
+        info.szIPv4Gateway = b"10.99.99.1" if i % 991 == 0 else f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.1".encode()
+    return DeviceInfo(record)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    devices = [make_device(i) for i in range(count)]
+    # 先访问一次字段，与常驻设备列表的状态一致
+    for device_info in devices:
+        device_info.ipv4_address
+    start = time.perf_counter()
+    report = audit(devices, plan=["10.0.0.0/14"])
+    elapsed = time.perf_counter() - start
+    print(f"设备数: {count}，耗时: {elapsed * 1000:.1f}ms")
+    print(f"重复IP: {len(report.duplicate_ips)}个地址，{sum(len(v) for v in report.duplicate_ips.values())}台设备")
+    print(f"无效地址: {len(report.invalid_addresses)}  网关不在子网内: {len(report.gateway_outside_subnet)}  "
+          f"重叠子网: {len(report.overlapping_subnets)}  不在目标网段: {len(report.outside_plan)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""DeviceInfo解码微基准
+
+对比原逐字段ctypes读取+解码的实现与只保存原始记录、按偏移延迟解包并缓存字符串的实现：
+    - 每次回调的解码耗时（构造对象并读取mac、ipv4_address、activated）
+    - 10000台设备常驻内存占用
+
+运行:
+    python benchmarks/bench_decode.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pysadp.base import SADP_DEVICE_INFO_V40
+from pysadp.model import DeviceInfo
+
+DEVICES = 10000
+ROUNDS = 20000
+
+
+class LegacyDeviceInfo:
+    """优化前的DeviceInfo实现（逐字段读取并立即解码全部字符串）"""
+
+    def __init__(self, sadp_device_info_v40):
+        # 保存原始结构体引用
+        self._raw = sadp_device_info_v40
+        
+        # 映射基础设备信息
+        base_info = sadp_device_info_v40.struSadpDeviceInfo
+        
+        # 字符串字段需要解码
+        self.series = base_info.szSeries.decode('utf-8').strip('\x00')
+        self.serial_no = base_info.szSerialNO.decode('utf-8').strip('\x00')
+        self.mac = base_info.szMAC.decode('utf-8').strip('\x00')
+        self.ipv4_address = base_info.szIPv4Address.decode('utf-8').strip('\x00')
+        self.ipv4_subnet_mask = base_info.szIPv4SubnetMask.decode('utf-8').strip('\x00')
+        self.device_type = base_info.dwDeviceType
+        self.port = base_info.dwPort
+        self.number_of_encoders = base_info.dwNumberOfEncoders
+        self.number_of_hard_disk = base_info.dwNumberOfHardDisk
+        self.device_software_version = base_info.szDeviceSoftwareVersion.decode('utf-8').strip('\x00')
+        self.dsp_version = base_info.szDSPVersion.decode('utf-8').strip('\x00')
+        self.boot_time = base_info.szBootTime.decode('utf-8').strip('\x00')
+        self.result = base_info.iResult
+        self.dev_desc = base_info.szDevDesc.decode('utf-8').strip('\x00')
+        self.oem_info = base_info.szOEMinfo.decode('utf-8').strip('\x00')
+        self.ipv4_gateway = base_info.szIPv4Gateway.decode('utf-8').strip('\x00')
+        self.ipv6_address = base_info.szIPv6Address.decode('utf-8').strip('\x00')
+        self.ipv6_gateway = base_info.szIPv6Gateway.decode('utf-8').strip('\x00')
+        self.ipv6_mask_len = base_info.byIPv6MaskLen
+        self.support = base_info.bySupport
+        self.dhcp_enabled = base_info.byDhcpEnabled
+        self.device_ability = base_info.byDeviceAbility
+        self.http_port = base_info.wHttpPort
+        self.digital_channel_num = base_info.wDigitalChannelNum
+        self.cms_ipv4 = base_info.szCmsIPv4.decode('utf-8').strip('\x00')
+        self.cms_port = base_info.wCmsPort
+        self.oem_code = base_info.byOEMCode
+        self.activated = base_info.byActivated
+        self.base_desc = base_info.szBaseDesc.decode('utf-8').strip('\x00')
+        self.support1 = base_info.bySupport1
+        self.hc_platform = base_info.byHCPlatform
+        self.enable_hc_platform = base_info.byEnableHCPlatform
+        self.ezviz_code = base_info.byEZVIZCode
+        self.detail_oem_code = base_info.dwDetailOEMCode
+        self.modify_verification_code = base_info.byModifyVerificationCode
+        self.max_bind_num = base_info.byMaxBindNum
+        self.oem_command_port = base_info.wOEMCommandPort
+        self.support_wifi_region = base_info.bySupportWifiRegion
+        self.enable_wifi_enhancement = base_info.byEnableWifiEnhancement
+        self.wifi_region = base_info.byWifiRegion
+        self.support2 = base_info.bySupport2
+        
+        # 映射V40扩展字段
+        self.licensed = sadp_device_info_v40.byLicensed
+        self.system_mode = sadp_device_info_v40.bySystemMode
+        self.controller_type = sadp_device_info_v40.byControllerType
+        self.ehmoe_version = sadp_device_info_v40.szEhmoeVersion.decode('utf-8').strip('\x00')
+        self.specific_device_type = sadp_device_info_v40.bySpecificDeviceType
+        self.sdk_over_tls_port = sadp_device_info_v40.dwSDKOverTLSPort
+        self.security_mode = sadp_device_info_v40.bySecurityMode
+        self.sdk_server_status = sadp_device_info_v40.bySDKServerStatus
+        self.sdk_over_tls_server_status = sadp_device_info_v40.bySDKOverTLSServerStatus
+        self.user_name = sadp_device_info_v40.szUserName.decode('utf-8').strip('\x00')
+        self.wifi_mac = sadp_device_info_v40.szWifiMAC.decode('utf-8').strip('\x00')
+        self.data_from_multicast = sadp_device_info_v40.byDataFromMulticast
+        self.support_ezviz_unbind = sadp_device_info_v40.bySupportEzvizUnbind
+        self.support_code_encrypt = sadp_device_info_v40.bySupportCodeEncrypt
+        self.support_password_reset_type = sadp_device_info_v40.bySupportPasswordResetType
+        self.ezviz_bind_status = sadp_device_info_v40.byEZVIZBindStatus
+        self.physical_access_verification = sadp_device_info_v40.szPhysicalAccessVerification.decode('utf-8').strip('\x00')
+
+
+def make_record(i: int) -> SADP_DEVICE_INFO_V40:
+    """构造一条字段填充完整的模拟回调数据"""
+    record = SADP_DEVICE_INFO_V40()
+    base = record.struSadpDeviceInfo
+    base.szSerialNO = f"DS-2CD2T47G2-L20230101AACH{i:09d}".encode()
+    base.szMAC = f"ac-cb-51-{i >> 16 & 0xff:02x}-{i >> 8 & 0xff:02x}-{i & 0xff:02x}".encode()
+    base.szIPv4Address = f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}".encode()
+    base.szIPv4SubnetMask = b"255.255.0.0"
+    base.szIPv4Gateway = b"10.0.0.1"
+    base.szDeviceSoftwareVersion = b"V5.7.3build 220112"
+    base.szDSPVersion = b"V7.3 build 220112"
+    base.szBootTime = b"2023 01 01 08:00:00"
+    base.szDevDesc = b"DS-2CD2T47G2-L"
+    base.szOEMinfo = b"hikvision"
+    base.szBaseDesc = b"DS-2CD2T47G2-L"
+    base.szIPv6Address = b"fe80::aecb:51ff:fe00:1"
+    base.szIPv6Gateway = b"::"
+    base.iResult = 1
+    base.byActivated = i & 1
+    base.dwPort = 8000
+    base.wHttpPort = 80
+    record.szEhmoeVersion = b"1.0"
+    record.szUserName = b"admin"
+    return record
+
+
+def bench_decode(cls, record) -> float:
+    def callback():
+        device_info = cls(record)
+        device_info.mac, device_info.ipv4_address, device_info.activated
+    return min(timeit.repeat(callback, number=ROUNDS, repeat=5)) / ROUNDS * 1e6
+
+
+def bench_memory(cls, records) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    devices = [cls(record) for record in records]
+    for device_info in devices:
+        device_info.mac, device_info.ipv4_address, device_info.activated
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del devices
+    return (after - before) / len(records)
+
+
+def main():
+    record = make_record(1)
+    records = [make_record(i) for i in range(DEVICES)]
+    print(f"{'实现':<12}{'每次回调(us)':>14}{'每台设备内存(B)':>18}")
+    for name, cls in (("legacy", LegacyDeviceInfo), ("lazy", DeviceInfo)):
+        print(f"{name:<12}{bench_decode(cls, record):>14.2f}{bench_memory(cls, records):>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""IPGenerator构造与分配基准
+
+对比原先构造时展开全部主机地址列表的实现与按整数区间计算的实现：
+    - 构造耗时与构造期间的内存峰值
+    - 每次get_next_ip的耗时
+
+运行:
+    python benchmarks/bench_ip_generator.py          # /24、/16
+    python benchmarks/bench_ip_generator.py --all    # 另含/8，原实现需要数GB内存
+"""
+
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+import ipaddress
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pysadp.ip_generator import IPGenerator
+
+ALLOCATIONS = 10000
+
+
+class LegacyIPGenerator:
+    """优化前的IPGenerator实现（构造时展开全部主机地址）"""
+
+    def __init__(self, start_ip, netmask):
+        start_ip_obj = ipaddress.IPv4Address(start_ip)
+        self.network = ipaddress.IPv4Network(f"{start_ip}/{netmask}", strict=False)
+        self.available_hosts = list(self.network.hosts())
+        try:
+            self.current_index = self.available_hosts.index(start_ip_obj)
+        except ValueError:
+            self.current_index = 0
+        self.max_available = len(self.available_hosts)
+
+    def get_next_ip(self):
+        if self.current_index >= self.max_available:
+            raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+        next_ip = str(self.available_hosts[self.current_index])
+        self.current_index += 1
+        return next_ip
+
+
+def bench_construct(cls, start_ip, prefix):
+    tracemalloc.start()
+    start = time.perf_counter()
+    generator = cls(start_ip, prefix)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return generator, elapsed, peak
+
+
+def bench_allocate(generator):
+    number = min(ALLOCATIONS, generator.max_available - generator.current_index)
+    return timeit.timeit(generator.get_next_ip, number=number) / number * 1e6
+
+
+def main():
+    prefixes = [24, 16, 8] if "--all" in sys.argv else [24, 16]
+    print(f"{'网段':<8}{'实现':<10}{'构造(ms)':>12}{'构造峰值内存(KB)':>20}{'每次分配(us)':>16}")
+    for prefix in prefixes:
+        # 起始地址位于网段中部，原实现需要线性查找
+        start_ip = str(ipaddress.IPv4Network(f"10.0.0.0/{prefix}")[2 ** (32 - prefix) // 2])
+        for name, cls in (("legacy", LegacyIPGenerator), ("integer", IPGenerator)):
+            generator, elapsed, peak = bench_construct(cls, start_ip, prefix)
+            allocate = bench_allocate(generator)
+            del generator
+            print(f"/{prefix:<7}{name:<10}{elapsed * 1000:>12.2f}{peak / 1024:>20.1f}{allocate:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""模拟后端端到端吞吐基准
+
+使用SimulatedSADP在后台线程中发出虚拟设备回调，测量：
+    - 全部设备上线的处理速度，对比回调线程直接处理(ring_size=0)与环形缓冲区
+    - 开启churn后自动搜索的持续处理速度
+    - activate_many / modify_many 在给定往返耗时下的吞吐
+
+运行:
+    python benchmarks/bench_simulator.py [--devices 20000] [--latency 0.05]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pysadp import SADP
+from pysadp.simulator import SimulatedSADP
+
+PASSWORD = "abcd1234"
+
+
+def wait_for(predicate, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("等待超时")
+        time.sleep(0.005)
+
+
+def bench_discovery(devices: int, ring_size: int) -> float:
+    """全部设备同时上线，返回每秒处理的回调数"""
+    backend = SimulatedSADP(devices=devices, announce_time=0, interval=0, seed=1)
+    sadp = SADP(auto_request_interval=0, backend=backend)
+    start = time.perf_counter()
+    sadp.start(ring_size=ring_size)
+    wait_for(lambda: len(sadp.device_list) >= devices)
+    elapsed = time.perf_counter() - start
+    sadp.sadp_stop()
+    return devices / elapsed
+
+
+def drained(sadp: SADP, backend: SimulatedSADP, count: int) -> bool:
+    """后端已发出count条回调且环形缓冲区已处理完"""
+    return backend.emitted >= count and sadp.ingest_stats()["size"] == 0
+
+
+def bench_churn(devices: int, churn: float, rounds: int = 3) -> str:
+    """每秒一轮自动搜索，返回每秒处理的回调数及缓冲区情况"""
+    backend = SimulatedSADP(devices=devices, announce_time=0, interval=1, churn=churn, seed=1)
+    sadp = SADP(auto_request_interval=1, backend=backend)
+    sadp.start(ring_size=65536)
+    wait_for(lambda: drained(sadp, backend, devices))
+    emitted = backend.emitted
+    start = time.perf_counter()
+    time.sleep(rounds)
+    target = backend.emitted
+    wait_for(lambda: drained(sadp, backend, target))
+    elapsed = time.perf_counter() - start
+    stats = sadp.ingest_stats()
+    sadp.sadp_stop()
+    return (f"{f'churn={churn:.0%}':<16}{(target - emitted) / elapsed:>14.0f}"
+            f"{stats['high_water']:>14}{stats['dropped']:>10}")
+
+
+def bench_operations(devices: int, latency: float, concurrency: int) -> None:
+    backend = SimulatedSADP(devices=devices, inactive_ratio=1.0, announce_time=0, interval=0,
+                            latency=latency, seed=1)
+    sadp = SADP(auto_request_interval=0, backend=backend)
+    sadp.start(ring_size=65536)
+    wait_for(lambda: len(sadp.device_list) >= devices)
+    targets = sadp.snapshot()
+
+    start = time.perf_counter()
+    results = sadp.activate_many(targets, PASSWORD, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results.values() if not result["success"])
+    print(f"{'activate_many':<16}{elapsed:>10.2f}{devices / elapsed:>14.1f}{failed:>8}")
+
+    params = {device: {"ipv4_address": f"172.16.{i >> 8 & 0xff}.{i & 0xff}"} for i, device in enumerate(targets)}
+    start = time.perf_counter()
+    results = sadp.modify_many(params, PASSWORD, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results.values() if not result["success"])
+    print(f"{'modify_many':<16}{elapsed:>10.2f}{devices / elapsed:>14.1f}{failed:>8}")
+    sadp.sadp_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.05, help="激活/修改的往返耗时(秒)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"设备数: {args.devices}")
+    print(f"{'上线处理':<16}{'回调/s':>14}")
+    for name, ring_size in (("direct", 0), ("ring=65536", 65536)):
+        print(f"{name:<16}{bench_discovery(args.devices, ring_size):>14.0f}")
+
+    print(f"{'自动搜索(每秒)':<16}{'回调/s':>14}{'缓冲区最高':>14}{'丢弃':>10}")
+    for churn in (0.0, 0.05):
+        print(bench_churn(args.devices, churn))
+
+    operations = min(args.devices, 2000)
+    print(f"批量操作: {operations}台，往返耗时 {args.latency * 1000:.0f}ms，并发 {args.concurrency}")
+    print(f"{'方式':<16}{'耗时(s)':>10}{'吞吐(台/s)':>14}{'失败数':>8}")
+    bench_operations(operations, args.latency, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
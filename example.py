@@ -6,10 +6,10 @@ email: newluo@163.com
 url: https://github.com/luo703/pysadp
 """
 
-import time
 import logging
+from concurrent.futures import Future, TimeoutError
 from typing import List
-from pysadp import SADP, DeviceInfo, IPGenerator
+from pysadp import SADP, DeviceInfo, IPGenerator, OperationError
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -41,23 +41,6 @@ def device_discovered_callback(device: DeviceInfo) -> None:
             logger.info(f"{device.result_desc}: {device.dev_desc} {device.ipv4_address} {device.mac} {'已激活' if device.is_activated else '未激活'}")
     
 
-def wait_for_devices(device_list: List[DeviceInfo], timeout: int = 3) -> None:
-    """等待设备响应
-    
-    Args:
-        device_list: 设备列表
-        timeout: 等待超时时间，单位秒， 如果等待时间内没有新设备发现,则结束等待,否则重置等待时间继续等待
-    """
-    last_device_sum = len(device_list)
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        if len(device_list) > last_device_sum:
-            # 发现新设备，重置等待时间
-            start_time = time.time()
-            last_device_sum = len(device_list)
-        time.sleep(1)
-    logger.info(f"等待设备响应完成,已发现设备数: {len(device_list)}")
-
 def main():
     global first_search
 
@@ -78,25 +61,25 @@ def main():
     try:
         logger.info(f"SDK版本: {sadp.get_sdk_version()}")
         logger.info("正在搜索设备...")
-        # 等待设备响应 如设备较多搜索不全,应适当增加超时时间
-        wait_for_devices(sadp.device_list, timeout=3)
+        # 等待设备响应，按新设备上线速率自动判断搜索完成
+        sadp.discover(until="settled")
         first_search = False
 
         #示例：激活设备
-        activated_devices: List[DeviceInfo] = []
+        activations: List[Future] = []
         for device in sadp.device_list:
             if not device.is_activated:
                 logger.info(f"尝试激活设备 {device.serial_no}...")
-                if sadp.activate_device(device, password):
-                    logger.info(f"{device.serial_no} 设备激活成功")
-                    activated_devices.append(device)
+                activations.append(sadp.submit_activate(device, password, timeout=30))
         
-        #等待全部已激活设备状态更新
-        if len(activated_devices) > 0:
+        #等待全部已激活设备报告新状态
+        if len(activations) > 0:
             logger.info(f"等待已激活设备信息更新...")
-            for device in activated_devices:
-                while not any(d.mac == device.mac and d.is_activated for d in sadp.device_list):
-                    time.sleep(1)
+            for future in activations:
+                try:
+                    logger.info(f"{future.result().serial_no} 设备激活成功")
+                except (OperationError, TimeoutError) as e:
+                    logger.error(f"设备激活失败: {e}")
         
         # 示例：修改设备IP地址
         for device in sadp.device_list:
@@ -11,11 +11,36 @@ __url__ = "https://github.com/luo703/pysadp"
 """
 
 from .sadp import SADP
+from .aio import AsyncSADP
+from .backend import SADPBackend
+from .simulator import SimulatedSADP
+from .multicast import MulticastSADP
+from .responder import SADPResponder
 from .model import DeviceInfo
-from .ip_generator import IPGenerator
+from .ip_generator import IPGenerator, IPv6Generator
+from .allocator import IPAllocator
+from .leases import LeaseStore
+from .pending import OperationError
+from .scheduler import NetParamScheduler
+from .registry import DeviceRegistry, DeviceListView, InventorySnapshot, InventoryDelta, normalize_mac
 
 __all__ = [
     "SADP",
+    "AsyncSADP",
+    "SADPBackend",
+    "SimulatedSADP",
+    "MulticastSADP",
+    "SADPResponder",
     "DeviceInfo",
     "IPGenerator",
+    "IPv6Generator",
+    "IPAllocator",
+    "LeaseStore",
+    "DeviceRegistry",
+    "DeviceListView",
+    "InventorySnapshot",
+    "InventoryDelta",
+    "normalize_mac",
+    "OperationError",
+    "NetParamScheduler",
 ]
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+asyncio接口模块
+
+将SDK线程中的设备事件安全地转发到事件循环，提供异步事件流与可等待的条件等待，
+阻塞的SDK调用在线程池中执行
+"""
+
+import asyncio
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .base import SADP_DEC
+from .model import DeviceInfo
+from .registry import InventorySnapshot, normalize_mac
+from .sadp import SADP
+
+DevicePredicate = Callable[[DeviceInfo], bool]
+
+
+class AsyncSADP:
+    """SADP的asyncio封装
+
+    Example:
+        >>> sadp = AsyncSADP(SADP())
+        >>> await sadp.start()
+        >>> async for device in sadp.events():
+        ...     print(device)
+    """
+
+    sadp: SADP
+    """被封装的同步SADP对象"""
+
+    def __init__(self, sadp: SADP) -> None:
+        self.sadp = sadp
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 事件流队列 -> 积压上限(0为不限制)
+        self._queues: Dict[asyncio.Queue, int] = {}
+        self._waiters: List[Tuple[DevicePredicate, asyncio.Future]] = []
+        # 注册与移除使用同一个绑定方法对象
+        self._listener = self._on_device
+
+    def _attach(self) -> asyncio.AbstractEventLoop:
+        """绑定当前事件循环并注册监听函数，首次调用时执行"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self.sadp.add_listener(self._listener, filtered=False)
+        return self._loop
+
+    def close(self) -> None:
+        """解除与SADP的绑定，结束全部事件流"""
+        if self._loop is not None:
+            self.sadp.remove_listener(self._listener)
+            for queue in self._queues:
+                queue.put_nowait(None)
+            self._loop = None
+
+    def _on_device(self, device_info: DeviceInfo) -> None:
+        """SDK线程中调用，转发到事件循环"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, device_info)
+
+    def _deliver(self, device_info: DeviceInfo) -> None:
+        """事件循环中调用，分发给事件流与等待者"""
+        for queue, limit in self._queues.items():
+            if not limit or queue.qsize() < limit:
+                queue.put_nowait(device_info)
+        if self._waiters:
+            pending = []
+            for predicate, future in self._waiters:
+                if future.done():
+                    continue
+                if predicate(device_info):
+                    future.set_result(device_info)
+                else:
+                    pending.append((predicate, future))
+            self._waiters = pending
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """在线程池中执行阻塞调用"""
+        return await self._attach().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def start(self, **kwargs: Any) -> bool:
+        """开始设备搜索，参数同 SADP.start()
+
+        Returns:
+            bool: 是否启动成功
+        """
+        self._attach()
+        return await self._run(self.sadp.start, **kwargs)
+
+    async def stop(self) -> bool:
+        """停止SADP协议并结束全部事件流
+
+        Returns:
+            bool: 是否停止成功
+        """
+        res = await self._run(self.sadp.sadp_stop)
+        self.close()
+        return res
+
+    def snapshot(self) -> InventorySnapshot:
+        """获取已发现设备的不可变快照"""
+        return self.sadp.snapshot()
+
+    async def events(self, max_queue: int = 0) -> AsyncIterator[DeviceInfo]:
+        """设备事件异步流，每个迭代器独立接收之后到达的全部事件
+
+        Args:
+            max_queue: 未读取事件的最大积压数，超出后丢弃新事件，0表示不限制
+
+        Yields:
+            DeviceInfo: 设备信息
+        """
+        self._attach()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues[queue] = max_queue
+        try:
+            while True:
+                device_info = await queue.get()
+                if device_info is None:
+                    return
+                yield device_info
+        finally:
+            self._queues.pop(queue, None)
+
+    async def wait_for(self, predicate: DevicePredicate, timeout: Optional[float] = None) -> DeviceInfo:
+        """等待满足条件的设备出现，已存在则立即返回
+
+        Args:
+            predicate: 判断函数，参数为设备信息
+            timeout: 超时时间(秒)，None表示一直等待
+
+        Returns:
+            DeviceInfo: 第一个满足条件的设备
+
+        Raises:
+            asyncio.TimeoutError: 超时
+        """
+        loop = self._attach()
+        future = loop.create_future()
+        # 先登记再检查当前设备，避免两者之间到达的事件被遗漏
+        self._waiters.append((predicate, future))
+        for device_info in self.sadp.snapshot():
+            if predicate(device_info):
+                future.set_result(device_info)
+                break
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            future.cancel()
+
+    async def wait_for_device(self, mac: str, predicate: Optional[DevicePredicate] = None,
+                              timeout: Optional[float] = None) -> DeviceInfo:
+        """等待指定MAC的设备出现，并可附加条件，例如等待设备激活完成
+
+        Args:
+            mac: 设备MAC地址
+            predicate: 附加判断函数，例如 lambda d: d.is_activated
+            timeout: 超时时间(秒)
+
+        Returns:
+            DeviceInfo: 满足条件的设备
+
+        Raises:
+            asyncio.TimeoutError: 超时
+        """
+        target = normalize_mac(mac)
+
+        def matches(device_info: DeviceInfo) -> bool:
+            return (device_info.result != SADP_DEC and normalize_mac(device_info.mac) == target
+                    and (predicate is None or predicate(device_info)))
+
+        return await self.wait_for(matches, timeout)
+
+    async def activate_device(self, device_info: DeviceInfo, password: str) -> bool:
+        """激活设备，参数同 SADP.activate_device()"""
+        return await self._run(self.sadp.activate_device, device_info, password)
+
+    async def modify_device_net_param(self, device_info: DeviceInfo, password: str, **kwargs: Any) -> dict:
+        """修改设备网络参数，参数同 SADP.modify_device_net_param()"""
+        return await self._run(self.sadp.modify_device_net_param, device_info, password, **kwargs)
+
+    async def submit_activate(self, device_info: DeviceInfo, password: str, timeout: float = 30.0) -> asyncio.Future:
+        """激活设备，SDK调用完成后返回在设备报告已激活时完成的Future，参数同 SADP.submit_activate()
+
+        Example:
+            >>> confirmed = await sadp.submit_activate(device, password)
+            >>> device = await confirmed
+        """
+        future = await self._run(self.sadp.submit_activate, device_info, password, timeout)
+        return asyncio.wrap_future(future, loop=self._attach())
+
+    async def submit_modify(self, device_info: DeviceInfo, password: str, timeout: float = 30.0,
+                            **params: Any) -> asyncio.Future:
+        """修改设备网络参数，SDK调用完成后返回在设备报告新参数时完成的Future，参数同 SADP.submit_modify()"""
+        future = await self._run(self.sadp.submit_modify, device_info, password, timeout, **params)
+        return asyncio.wrap_future(future, loop=self._attach())
@@ -0,0 +1,286 @@
+"""
+IP地址分配器模块
+
+在IPGenerator按顺序分配的基础上，跳过已被设备占用及保留的地址：
+已占用与保留的地址合并为一个有序、不相交的整数区间集合，查找下一个空闲地址为O(log n)，
+占用信息来自已发现设备的ipv4_address，并随设备事件更新
+"""
+
+import ipaddress
+import threading
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .base import SADP_DEC
+from .interval_set import IntervalSet
+from .ip_generator import _int_to_ip
+from .model import DeviceInfo
+from .registry import normalize_mac
+
+
+class IPAllocator:
+    """避开已占用与保留地址的IPv4地址分配器，接口与IPGenerator一致，线程安全
+
+    Example:
+        >>> allocator = IPAllocator("192.168.1.100", 24, reserved=["192.168.1.200-192.168.1.250"])
+        >>> allocator.attach(sadp)   # 以已发现设备的IP初始化，并随设备事件更新
+        >>> ip = allocator.get_next_ip()
+    """
+
+    gateway: str
+    """网关IP地址"""
+
+    def __init__(self, start_ip: str, netmask: Union[str, int], gateway: Optional[str] = None,
+                 reserved: Iterable[str] = ()) -> None:
+        """初始化IP地址分配器
+
+        Args:
+            start_ip: 起始IP地址，例如 "192.168.1.100"
+            netmask: 子网掩码，例如 "255.255.255.0" 或 24
+            gateway: 网关IP地址，如不指定则默认为网络地址中的第一个IP，网关地址自动保留
+            reserved: 保留地址，格式同 reserve()，例如DHCP地址池
+        """
+        self.start_ip = start_ip
+        self.network = ipaddress.IPv4Network(f"{start_ip}/{netmask}", strict=False)
+        if self.network.prefixlen >= 31:
+            self._first_host = int(self.network.network_address)
+            self._last_host = int(self.network.broadcast_address)
+        else:
+            self._first_host = int(self.network.network_address) + 1
+            self._last_host = int(self.network.broadcast_address) - 1
+        if gateway is None:
+            self.gateway = str(self.network.network_address + 1)
+        elif ipaddress.IPv4Address(gateway) not in self.network:
+            raise ValueError(f"网关IP {gateway} 不在网络 {self.network} 范围内")
+        else:
+            self.gateway = gateway
+
+        start = int(ipaddress.IPv4Address(start_ip))
+        self._cursor = start if self._first_host <= start <= self._last_host else self._first_host
+        self._current: Optional[int] = None
+        # 不可分配的地址(已占用或保留)，另记保留地址以便取消保留；两者之差即已占用地址
+        self._blocked = IntervalSet()
+        self._reserved = IntervalSet()
+        # 设备MAC -> 设备报告的IP，IP -> 报告该IP的设备数
+        self._observed: Dict[str, int] = {}
+        self._holders: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        self.reserve(self.gateway)
+        for spec in reserved:
+            self.reserve(spec)
+
+    @property
+    def netmask(self) -> str:
+        """子网掩码"""
+        return str(self.network.netmask)
+
+    @property
+    def max_available(self) -> int:
+        """网段内可用主机地址总数"""
+        return self._last_host - self._first_host + 1
+
+    def _parse_range(self, spec: str) -> Tuple[int, int]:
+        """解析地址范围，支持单个地址、"起始-结束" 及CIDR，结果限制在可用主机范围内"""
+        if "/" in spec:
+            network = ipaddress.IPv4Network(spec, strict=False)
+            start, end = int(network.network_address), int(network.broadcast_address)
+        elif "-" in spec:
+            first, last = spec.split("-", 1)
+            start, end = int(ipaddress.IPv4Address(first.strip())), int(ipaddress.IPv4Address(last.strip()))
+        else:
+            start = end = int(ipaddress.IPv4Address(spec.strip()))
+        if start > end:
+            raise ValueError(f"地址范围起点大于终点: {spec}")
+        return max(start, self._first_host), min(end, self._last_host)
+
+    def reserve(self, spec: str) -> None:
+        """保留地址范围，保留的地址不会被分配
+
+        Args:
+            spec: 单个地址 "192.168.1.1"、范围 "192.168.1.200-192.168.1.250" 或CIDR "192.168.1.192/26"
+        """
+        start, end = self._parse_range(spec)
+        if start > end:
+            return
+        with self._lock:
+            self._reserved.add(start, end)
+            self._blocked.add(start, end)
+
+    def unreserve(self, spec: str) -> None:
+        """取消保留地址范围，格式同 reserve()，范围内仍有设备报告的地址保持占用"""
+        start, end = self._parse_range(spec)
+        if start > end:
+            return
+        with self._lock:
+            for first, last in self._reserved.overlap(start, end):
+                self._blocked.remove(first, last)
+            self._reserved.remove(start, end)
+            for value in self._holders:
+                if start <= value <= end:
+                    self._blocked.add(value, value)
+
+    def _occupy(self, value: int) -> None:
+        if self._first_host <= value <= self._last_host:
+            self._blocked.add(value, value)
+
+    def _release(self, value: int) -> None:
+        if value not in self._reserved:
+            self._blocked.remove(value, value)
+
+    def occupy(self, ip: str) -> None:
+        """标记地址已被占用
+
+        Args:
+            ip: IPv4地址，网段外的地址忽略
+        """
+        with self._lock:
+            self._occupy(int(ipaddress.IPv4Address(ip)))
+
+    def release(self, ip: str) -> None:
+        """释放任意已占用或已分配的地址，使其可以再次分配
+
+        Args:
+            ip: IPv4地址
+        """
+        value = int(ipaddress.IPv4Address(ip))
+        with self._lock:
+            self._release(value)
+
+    def is_free(self, ip: str) -> bool:
+        """判断地址是否在网段内且未被占用或保留"""
+        value = int(ipaddress.IPv4Address(ip))
+        with self._lock:
+            return self._first_host <= value <= self._last_host and value not in self._blocked
+
+    def observe(self, device_info: DeviceInfo) -> None:
+        """根据设备事件更新占用情况，可注册为SADP监听函数
+
+        设备报告的IP标记为已占用；设备改用其它IP后，若原IP不再有设备报告则释放。
+        设备下线时保留其IP，以免静态配置的设备重新上线时地址冲突
+
+        Args:
+            device_info: 设备信息
+        """
+        if device_info.result == SADP_DEC or not device_info.ipv4_address:
+            return
+        try:
+            value = int(ipaddress.IPv4Address(device_info.ipv4_address))
+        except ValueError:
+            return
+        key = normalize_mac(device_info.mac)
+        with self._lock:
+            previous = self._observed.get(key)
+            if previous == value:
+                return
+            self._observed[key] = value
+            self._holders[value] = self._holders.get(value, 0) + 1
+            self._occupy(value)
+            if previous is not None:
+                self._holders[previous] -= 1
+                if not self._holders[previous]:
+                    del self._holders[previous]
+                    self._release(previous)
+
+    def seed(self, devices: Iterable[DeviceInfo]) -> None:
+        """以设备当前IP初始化占用情况
+
+        Args:
+            devices: 设备信息，例如 sadp.device_list
+        """
+        for device_info in devices:
+            self.observe(device_info)
+
+    def attach(self, sadp) -> None:
+        """以已发现设备初始化占用情况，并注册为监听函数随设备事件更新
+
+        Args:
+            sadp: SADP对象
+        """
+        sadp.add_listener(self.observe, filtered=False)
+        self.seed(sadp.snapshot())
+
+    def _next_free(self, value: int, last: int) -> Optional[int]:
+        """[value, last]中第一个空闲地址"""
+        if value > last:
+            return None
+        end = self._blocked.end_of(value)
+        if end is None:
+            return value
+        # 区间相邻时已合并，终点的下一个地址必然空闲
+        return end + 1 if end < last else None
+
+    def get_next_ip(self) -> str:
+        """分配下一个空闲的IP地址，到达网段末尾后从头查找已释放的地址
+
+        Returns:
+            str: IP地址
+
+        Raises:
+            IndexError: 网段内已没有空闲地址
+        """
+        with self._lock:
+            value = self._next_free(self._cursor, self._last_host)
+            if value is None:
+                value = self._next_free(self._first_host, self._cursor - 1)
+            if value is None:
+                raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+            self._blocked.add(value, value)
+            self._current = value
+            self._cursor = value + 1
+            return _int_to_ip(value)
+
+    def get_current_ip(self) -> Optional[str]:
+        """获取最近一次分配的IP地址
+
+        Returns:
+            Optional[str]: IP地址，还没有分配或已回收则返回None
+        """
+        return _int_to_ip(self._current) if self._current is not None else None
+
+    def recycle_current_ip(self) -> bool:
+        """回收最近一次分配的IP，使得下次get_next_ip可以重新获得相同的IP
+
+        Returns:
+            bool: 回收是否成功（如果当前没有IP被分配则返回False）
+        """
+        with self._lock:
+            if self._current is None:
+                return False
+            self._release(self._current)
+            self._cursor = self._current
+            self._current = None
+            return True
+
+    def get_remaining_count(self) -> int:
+        """获取剩余空闲的IP地址数量
+
+        Returns:
+            int: 剩余空闲IP数量
+        """
+        with self._lock:
+            return self.max_available - self._blocked.size
+
+    def get_network_info(self) -> dict:
+        """获取网络信息
+
+        Returns:
+            dict: 包含网络信息的字典，字段同 IPGenerator.get_network_info()，另含
+                - reserved_hosts: int，保留地址数量
+        """
+        with self._lock:
+            used, reserved = self._blocked.size - self._reserved.size, self._reserved.size
+        return {
+            "network_address": str(self.network.network_address),
+            "broadcast_address": str(self.network.broadcast_address),
+            "netmask": str(self.network.netmask),
+            "total_hosts": self.max_available,
+            "used_hosts": used,
+            "reserved_hosts": reserved,
+            "available_hosts": self.max_available - used - reserved,
+            "gateway": self.gateway
+        }
+
+    def __str__(self) -> str:
+        return (f"IPAllocator(start_ip='{self.start_ip}', netmask={self.netmask}, "
+                f"used={self._blocked.size - self._reserved.size}, reserved={self._reserved.size}, "
+                f"max_available={self.max_available})")
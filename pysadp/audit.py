@@ -0,0 +1,199 @@
+"""
+网络参数审计模块
+
+将设备的IPv4地址、子网掩码与网关转换为整数数组，一次向量化计算检查：
+重复IP、无效掩码、网关不在设备子网内、子网相互重叠，以及不在目标网段内的设备。
+需要安装numpy
+"""
+
+import socket
+import ipaddress
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .model import DEVICE_INFO_WIDTHS, DeviceInfo
+
+
+class AuditReport(NamedTuple):
+    """审计结果，设备均以MAC地址表示"""
+
+    duplicate_ips: Dict[str, List[str]]
+    """IP地址 -> 使用该地址的设备(两台及以上)"""
+
+    invalid_addresses: List[str]
+    """IP地址或掩码无法解析、IP为0.0.0.0或掩码不连续的设备"""
+
+    gateway_outside_subnet: List[str]
+    """网关不在设备自身子网内的设备"""
+
+    overlapping_subnets: List[Tuple[str, str]]
+    """相互重叠但不相同的子网对(CIDR)，通常由个别设备掩码配置错误引起"""
+
+    outside_plan: List[str]
+    """IP地址不在目标网段内的设备，未指定目标网段时为空"""
+
+    @property
+    def ok(self) -> bool:
+        """是否未发现任何问题"""
+        return not (self.duplicate_ips or self.invalid_addresses or self.gateway_outside_subnet
+                    or self.overlapping_subnets or self.outside_plan)
+
+
+def _field_bytes(devices: List[DeviceInfo], name: str) -> "np.ndarray":
+    """取出字符串字段的原始定长字节，不解码为str
+
+    Returns:
+        np.ndarray: 形状为(设备数, 字段长度)的uint8数组
+    """
+    values = [device_info.raw_value(name) for device_info in devices]
+    return np.frombuffer(b"".join(values), dtype=np.uint8).reshape(len(values), DEVICE_INFO_WIDTHS[name])
+
+
+def _parse_ipv4(chars: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """按列向量化解析点分十进制地址，遇到\0结束
+
+    Args:
+        chars: 形状为(设备数, 字段长度)的uint8数组
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint32地址数组，以及是否为合法地址的布尔数组
+    """
+    count = len(chars)
+    rows = np.arange(count)
+    octets = np.zeros((count, 4), dtype=np.int64)
+    digits = np.zeros(count, dtype=np.int64)
+    part = np.zeros(count, dtype=np.int64)
+    ended = np.zeros(count, dtype=bool)
+    valid = np.ones(count, dtype=bool)
+    for column in chars.T:
+        active = ~ended
+        is_digit = active & (column >= 48) & (column <= 57)
+        is_dot = active & (column == 46)
+        ended |= column == 0
+        # 非数字、非点、非\0的字符，以及空的段或超过3位的段均不合法
+        valid &= ~(active & ~is_digit & ~is_dot & (column != 0))
+        valid &= ~(is_dot & (digits == 0))
+        valid &= ~(is_digit & (digits >= 3))
+        target = np.minimum(part, 3)
+        octets[rows[is_digit], target[is_digit]] = octets[rows[is_digit], target[is_digit]] * 10 + column[is_digit] - 48
+        digits = np.where(is_digit, digits + 1, np.where(is_dot, 0, digits))
+        part += is_dot
+    valid &= ended & (part == 3) & (digits > 0) & (octets <= 255).all(axis=1)
+    value = (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+    return np.where(valid, value, 0).astype(np.uint32), valid
+
+
+def _int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(int(value).to_bytes(4, "big"))
+
+
+def _cidr(network: int, mask: int) -> str:
+    return f"{_int_to_ip(network)}/{bin(mask).count('1')}"
+
+
+def _plan_ranges(plan: Iterable[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """目标网段(CIDR)转换为按起点排序、合并后的地址区间"""
+    ranges = sorted((int(network.network_address), int(network.broadcast_address))
+                    for network in (ipaddress.IPv4Network(spec, strict=False) for spec in plan))
+    merged: List[List[int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    starts = np.array([start for start, _ in merged], dtype=np.int64)
+    ends = np.array([end for _, end in merged], dtype=np.int64)
+    return starts, ends
+
+
+def audit(devices: Iterable[DeviceInfo], plan: Optional[Iterable[str]] = None) -> AuditReport:
+    """审计设备网络参数
+
+    地址字段直接从原始定长字节向量化解析，不逐个解码为str
+
+    Args:
+        devices: 设备信息，例如 sadp.snapshot()
+        plan: 目标网段(CIDR)，例如 ["192.168.10.0/24"]，为None则不检查
+
+    Returns:
+        AuditReport: 审计结果
+
+    Example:
+        >>> report = audit(sadp.snapshot(), plan=["192.168.10.0/24"])
+        >>> report.duplicate_ips
+        {'192.168.1.64': ['ac-cb-51-00-00-01', 'ac-cb-51-00-00-02']}
+    """
+    if np is None:
+        raise ImportError("审计功能需要安装numpy: pip install numpy")
+    devices = list(devices)
+    if not devices:
+        return AuditReport({}, [], [], [], [])
+    ip, ip_valid = _parse_ipv4(_field_bytes(devices, "ipv4_address"))
+    mask, mask_valid = _parse_ipv4(_field_bytes(devices, "ipv4_subnet_mask"))
+    gateway, gateway_valid = _parse_ipv4(_field_bytes(devices, "ipv4_gateway"))
+
+    def macs(selected: "np.ndarray") -> List[str]:
+        # 只为有问题的设备读取MAC
+        return [devices[index].mac for index in np.flatnonzero(selected)]
+
+    # 掩码必须为连续的1：取反后加1应为2的幂
+    inverted = ~mask
+    contiguous = (inverted & (inverted + np.uint32(1))) == 0
+    valid = ip_valid & mask_valid & contiguous & (ip != 0)
+
+    # 重复IP：排序后相邻相等
+    duplicate_ips: Dict[str, List[str]] = {}
+    candidates = np.flatnonzero(ip_valid & (ip != 0))
+    order = candidates[np.argsort(ip[candidates], kind="stable")]
+    sorted_ip = ip[order]
+    same = sorted_ip[1:] == sorted_ip[:-1]
+    if same.any():
+        flagged = np.zeros(len(order), dtype=bool)
+        flagged[1:] |= same
+        flagged[:-1] |= same
+        for index in order[flagged]:
+            duplicate_ips.setdefault(_int_to_ip(ip[index]), []).append(devices[index].mac)
+
+    # 网关不在子网内(未配置网关的设备不检查)
+    network = ip & mask
+    has_gateway = gateway_valid & (gateway != 0)
+    gateway_outside = valid & has_gateway & ((gateway & mask) != network)
+
+    # 子网重叠：不同的(网络地址, 掩码)按起点排序，起点不大于之前子网的最大终点即重叠
+    overlapping: List[Tuple[str, str]] = []
+    if valid.any():
+        # 网络地址与掩码合成一个整数去重，排序后同一起点的大子网在前
+        subnets = np.unique(network[valid].astype(np.uint64) << np.uint64(32) | (~mask[valid]).astype(np.uint64))
+        starts = (subnets >> np.uint64(32)).astype(np.int64)
+        ends = starts | (subnets & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        order = np.lexsort((-ends, starts))
+        starts, ends = starts[order], ends[order]
+        masks = ~(ends - starts) & 0xFFFFFFFF
+        reach = np.maximum.accumulate(ends)
+        owner = np.maximum.accumulate(np.where(ends == reach, np.arange(len(ends)), 0))
+        for i in np.flatnonzero(starts[1:] <= reach[:-1]) + 1:
+            outer = owner[i - 1]
+            overlapping.append((_cidr(starts[outer], masks[outer]), _cidr(starts[i], masks[i])))
+
+    # 不在目标网段内
+    outside_plan: List[str] = []
+    if plan is not None:
+        plan_starts, plan_ends = _plan_ranges(plan)
+        if len(plan_starts):
+            position = np.searchsorted(plan_starts, ip.astype(np.int64), side="right") - 1
+            inside = (position >= 0) & (ip.astype(np.int64) <= plan_ends[np.maximum(position, 0)])
+        else:
+            inside = np.zeros(len(devices), dtype=bool)
+        outside_plan = macs(ip_valid & ~inside)
+
+    return AuditReport(
+        duplicate_ips=duplicate_ips,
+        invalid_addresses=macs(~valid),
+        gateway_outside_subnet=macs(gateway_outside),
+        overlapping_subnets=overlapping,
+        outside_plan=outside_plan,
+    )
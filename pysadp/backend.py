@@ -0,0 +1,85 @@
+"""
+SDK后端接口模块
+
+SADP通过call_func按函数名调用后端，默认后端为ctypes加载的Sadp.dll。
+实现同名方法的任意对象均可作为后端传给SADP，例如模拟器或纯Python协议实现
+"""
+
+import os
+import abc
+import ctypes
+from typing import Any
+
+
+def deref(argument: Any) -> Any:
+    """取出ctypes.byref()参数引用的结构体，其它参数原样返回
+
+    SADP调用SDK时以ctypes.byref()传递结构体，Python后端用此函数读写结构体内容
+    """
+    return getattr(argument, "_obj", argument)
+
+
+def load_sdk_library(sdk_path: str):
+    """加载SDK动态库
+
+    Args:
+        sdk_path: SDK文件所在目录
+
+    Returns:
+        Sadp.dll库对象
+
+    Raises:
+        FileNotFoundError: 缺少SDK文件
+    """
+    dlls = ["libcrypto-1_1-x64.dll", "libssl-1_1-x64.dll", "Sadp.dll"]
+    for dll in dlls:
+        dll_path = os.path.join(sdk_path, dll)
+        if not os.path.exists(dll_path):
+            raise FileNotFoundError(f"未找到sadp库文件: {dll_path}")
+        lib = ctypes.CDLL(dll_path)
+    return lib
+
+
+class SADPBackend(abc.ABC):
+    """SDK后端接口
+
+    方法名、参数与返回值与Sadp.dll的导出函数一致：成功返回非0，失败返回0并可通过SADP_GetLastError获取错误码。
+    结构体参数以ctypes.byref()传入，可用deref()取出。子类须实现全部方法，
+    未继承本类但提供同名方法的对象(例如ctypes加载的Sadp.dll)同样可作为后端
+    """
+
+    @abc.abstractmethod
+    def SADP_Start_V40(self, callback, user_data=None) -> int:
+        """开始搜索，此后在后端线程中以SADP_DEVICE_INFO_V40指针调用callback(pointer, user_data)"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_Stop(self) -> int:
+        """停止搜索，返回后不再调用回调"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_GetSadpVersion(self) -> int:
+        """SDK版本，31~24位、23~16位、15~8位、7~0位依次为版本号的四段"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_SetAutoRequestInterval(self, interval: int) -> int:
+        """设置自动搜索间隔(秒)，0为不自动搜索"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_ActivateDevice(self, serial_no: bytes, password: bytes) -> int:
+        """激活设备"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_ModifyDeviceNetParam_V40(self, mac: bytes, password: bytes, net_param, ret_net_param,
+                                      ret_size: int) -> int:
+        """修改网络参数，net_param为SADP_DEV_NET_PARAM，结果写入ret_net_param(SADP_DEV_RET_NET_PARAM)"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def SADP_GetLastError(self) -> int:
+        """当前线程最近一次调用的错误码"""
+        raise NotImplementedError
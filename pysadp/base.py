@@ -6,6 +6,13 @@ MAX_IPV6_ADDR_LEN = 128
 MAX_IPV4_ADDR_LEN = 16
 MAX_PORT_LEN = 5
 
+# SADP_DEVICE_INFO.iResult 消息类型
+SADP_ADD = 1         # 新设备上线
+SADP_UPDATE = 2      # 设备网络参数或状态改变
+SADP_DEC = 3         # 设备下线
+SADP_RESTART = 4     # 下线过的设备再次上线
+SADP_UPDATEFAIL = 5  # 设备更新失败
+
 class SADP_DEVICE_INFO(Structure):
     _fields_ = [
         ("szSeries", c_char * 12),                 # 设备系列（保留）
@@ -0,0 +1,118 @@
+"""
+批量回调模块
+
+将逐条的设备事件按MAC合并，攒够条数或超过最长等待时间后一次性交给用户回调，
+同一窗口内同一设备只保留最新状态
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, List
+
+from .model import DeviceInfo
+from .registry import normalize_mac
+
+logger = logging.getLogger(__name__)
+
+
+class BatchDispatcher:
+    """按MAC合并设备事件并批量投递
+
+    事件由SDK回调线程或消费线程写入，批量回调在独立的投递线程中执行。
+    """
+
+    def __init__(self, callback: Callable[[List[DeviceInfo]], None], max_items: int = 500,
+                 max_delay_ms: int = 50) -> None:
+        """初始化批量投递
+
+        Args:
+            callback: 批量回调函数，参数为设备事件列表
+            max_items: 单批最多事件数(合并后)，达到后立即投递
+            max_delay_ms: 第一条事件到达后最长等待时间(毫秒)
+        """
+        if max_items <= 0:
+            raise ValueError(f"max_items必须大于0: {max_items}")
+        self.callback = callback
+        self.max_items = max_items
+        self.max_delay = max_delay_ms / 1000
+        self._pending: "OrderedDict[str, DeviceInfo]" = OrderedDict()
+        self._deadline = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.delivered_batches = 0
+        """已投递批次数"""
+
+        self.coalesced = 0
+        """被同MAC后续事件覆盖而合并掉的事件数"""
+
+        # 投递线程会读取上面的状态，全部初始化后再启动
+        self._thread = threading.Thread(target=self._run, name="pysadp-batch", daemon=True)
+        self._thread.start()
+
+    def __call__(self, device_info: DeviceInfo) -> None:
+        """写入一条设备事件，可直接注册为SADP监听函数
+
+        Args:
+            device_info: 设备信息
+        """
+        key = normalize_mac(device_info.mac)
+        with self._cond:
+            if self._closed:
+                return
+            if not self._pending:
+                self._deadline = time.monotonic() + self.max_delay
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = device_info
+            if len(self._pending) == 1 or len(self._pending) >= self.max_items:
+                self._cond.notify()
+
+    def _take(self) -> List[DeviceInfo]:
+        """取出当前全部待投递事件，调用方需持有锁"""
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+    def _deliver(self, batch: List[DeviceInfo]) -> None:
+        if not batch:
+            return
+        try:
+            self.callback(batch)
+        except Exception:
+            logger.exception("批量回调执行失败")
+        self.delivered_batches += 1
+
+    def _run(self) -> None:
+        """投递线程"""
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        remaining = self._deadline - time.monotonic()
+                        if remaining <= 0 or len(self._pending) >= self.max_items:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                batch = self._take()
+                closed = self._closed
+            self._deliver(batch)
+            if closed:
+                return
+
+    def flush(self) -> None:
+        """立即投递当前待投递事件（在调用线程中执行回调）"""
+        with self._cond:
+            batch = self._take()
+        self._deliver(batch)
+
+    def close(self) -> None:
+        """停止投递线程，剩余事件会在退出前投递"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
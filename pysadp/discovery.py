@@ -0,0 +1,84 @@
+"""
+搜索完成判定模块
+
+根据新设备上线消息的到达间隔估计到达速率，
+当静默时间足以在给定置信度下认为不会再有新设备时判定搜索完成
+"""
+
+import math
+from typing import Optional
+
+
+class SettleDetector:
+    """按新设备到达速率判定搜索是否收敛
+
+    设备上线视为泊松到达，以指数加权平均的到达间隔 g 估计速率 1/g，
+    静默时间 t 内仍有设备到达的概率为 1 - exp(-t/g)，
+    当静默时间超过 g * ln(1 / (1 - confidence)) 时判定收敛。
+    """
+
+    def __init__(self, confidence: float = 0.95, prior_gap: float = 1.0, smoothing: float = 0.3,
+                 min_quiet: float = 0.5) -> None:
+        """初始化判定器
+
+        Args:
+            confidence: 判定收敛的置信度，取值(0, 1)，越大等待越久
+            prior_gap: 尚无设备到达时假定的到达间隔(秒)
+            smoothing: 到达间隔指数加权平均的平滑系数，取值(0, 1]，越大越偏重最近的间隔
+            min_quiet: 所需静默时间的下限(秒)，避免突发到达时间隔过小导致过早判定
+        """
+        if not 0 < confidence < 1:
+            raise ValueError(f"置信度必须在(0, 1)之间: {confidence}")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"平滑系数必须在(0, 1]之间: {smoothing}")
+        self.confidence = confidence
+        self.smoothing = smoothing
+        self.min_quiet = min_quiet
+        self.mean_gap = prior_gap
+        self.arrivals = 0
+        self._factor = math.log(1 / (1 - confidence))
+        self._last: Optional[float] = None
+
+    def begin(self, now: float) -> None:
+        """开始计时
+
+        Args:
+            now: 当前时间(秒，单调时钟)
+        """
+        self._last = now
+
+    def observe(self, now: float) -> None:
+        """记录一次新设备到达
+
+        Args:
+            now: 到达时间(秒，单调时钟)
+        """
+        if self._last is None:
+            self.begin(now)
+        gap = now - self._last
+        if self.arrivals == 0:
+            self.mean_gap = gap if gap > 0 else self.mean_gap
+        else:
+            self.mean_gap += self.smoothing * (gap - self.mean_gap)
+        self._last = now
+        self.arrivals += 1
+
+    @property
+    def quiet_needed(self) -> float:
+        """判定收敛所需的静默时间(秒)"""
+        return max(self.min_quiet, self.mean_gap * self._factor)
+
+    def settle_time(self) -> float:
+        """按当前估计判定收敛的时间点(秒，单调时钟)"""
+        return self._last + self.quiet_needed
+
+    def settled(self, now: float) -> bool:
+        """判断是否已收敛
+
+        Args:
+            now: 当前时间(秒，单调时钟)
+
+        Returns:
+            bool: 静默时间是否已超过所需时间
+        """
+        return now >= self.settle_time()
@@ -0,0 +1,81 @@
+"""
+原始记录过滤模块
+
+按base.py中的结构体布局直接读取原始数值字段并判断，不解码字符串。
+SADP在构造设备信息之前判断，不满足条件的事件仍会更新设备列表，
+只是不分发给sadp_data_callback和用户注册的监听函数
+"""
+
+import struct
+from typing import Callable, Collection, List, Tuple, Union
+
+from .base import SADP_DEVICE_INFO_V40
+from .model import DEVICE_INFO_FIELDS, field_format, field_layout
+
+FilterValue = Union[int, Collection[int], Callable[[int], bool]]
+"""过滤条件：等于某值、属于某集合，或自定义判断函数"""
+
+
+def _predicate(value: FilterValue) -> Callable[[int], bool]:
+    """将过滤条件转换为判断函数"""
+    if callable(value):
+        return value
+    if isinstance(value, int):
+        return value.__eq__
+    values = frozenset(value)
+    return values.__contains__
+
+
+class RecordFilter:
+    """原始记录数值字段过滤器，多个条件之间为“且”关系"""
+
+    def __init__(self) -> None:
+        self._conditions: List[Tuple[str, struct.Struct, int, Callable[[int], bool]]] = []
+
+    def add(self, field: str, value: FilterValue) -> None:
+        """添加过滤条件
+
+        Args:
+            field: DeviceInfo数值字段名，例如 "activated"、"result"、"device_type"
+            value: 字段值、值集合，或参数为字段值的判断函数
+
+        Raises:
+            ValueError: 字段不存在或不是数值字段
+        """
+        path = DEVICE_INFO_FIELDS.get(field)
+        if path is None:
+            raise ValueError(f"未知的设备信息字段: {field}")
+        offset, field_type = field_layout(SADP_DEVICE_INFO_V40, path)
+        fmt = field_format(field_type)
+        if fmt.endswith("s"):
+            raise ValueError(f"只支持按数值字段过滤: {field}")
+        conditions = self._conditions + [(field, struct.Struct("=" + fmt), offset, _predicate(value))]
+        # 替换整个列表，回调线程遍历期间不受影响
+        self._conditions = conditions
+
+    def clear(self) -> None:
+        """清除全部过滤条件"""
+        self._conditions = []
+
+    @property
+    def fields(self) -> List[str]:
+        """已添加条件的字段名"""
+        return [field for field, _, _, _ in self._conditions]
+
+    def matches(self, buffer, offset: int = 0) -> bool:
+        """判断原始记录是否满足全部过滤条件
+
+        Args:
+            buffer: 包含SADP_DEVICE_INFO_V40结构体数据的缓冲区
+            offset: 结构体在缓冲区中的偏移
+
+        Returns:
+            bool: 是否满足
+        """
+        for _, decoder, field_offset, predicate in self._conditions:
+            if not predicate(decoder.unpack_from(buffer, offset + field_offset)[0]):
+                return False
+        return True
+
+    def __bool__(self) -> bool:
+        return bool(self._conditions)
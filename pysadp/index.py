@@ -0,0 +1,148 @@
+"""
+设备二级索引模块
+
+为注册表维护序列号、IP地址、网段、型号、激活状态、设备类型等二级索引，
+随回调增量更新，查询时按索引求交集，无需遍历全部设备
+"""
+
+import socket
+import struct
+import bisect
+import ipaddress
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .model import DeviceInfo
+
+_IPV4 = struct.Struct("!I")
+
+
+def ipv4_to_int(ip: str) -> Optional[int]:
+    """IPv4地址字符串转整数
+
+    Args:
+        ip: IPv4地址，例如 "192.168.1.64"
+
+    Returns:
+        Optional[int]: 整数形式的地址，地址无效则为None
+    """
+    try:
+        return _IPV4.unpack(socket.inet_aton(ip))[0] if ip.count(".") == 3 else None
+    except OSError:
+        return None
+
+
+# 等值索引: 查询参数名 -> 取值函数，参数名与DeviceInfo属性同名，语义与未索引时的属性等值过滤一致
+EQUALITY_INDEXES: Dict[str, Callable[[DeviceInfo], Hashable]] = {
+    "serial_no": lambda d: d.serial_no,
+    "ipv4_address": lambda d: d.ipv4_address,
+    "dev_desc": lambda d: d.dev_desc,
+    "base_desc": lambda d: d.base_desc,
+    "activated": lambda d: d.activated,
+    "is_activated": lambda d: d.is_activated,
+    "device_type": lambda d: d.device_type,
+}
+
+
+class DeviceIndex:
+    """设备二级索引
+
+    等值索引为 值 -> MAC集合 的字典；网段查询使用按IPv4整数排序的有序表，
+    二分查找定位区间。本类非线程安全，由注册表在持锁状态下调用。
+    """
+
+    def __init__(self) -> None:
+        self._equality: Dict[str, Dict[Hashable, Set[str]]] = {name: {} for name in EQUALITY_INDEXES}
+        # (IPv4整数, MAC) 有序表
+        self._ipv4_sorted: List[Tuple[int, str]] = []
+
+    @property
+    def indexed_fields(self) -> Set[str]:
+        """已建立等值索引的查询参数名"""
+        return set(self._equality)
+
+    def add(self, key: str, device_info: DeviceInfo) -> None:
+        """将设备加入索引
+
+        Args:
+            key: 规范化后的MAC地址
+            device_info: 设备信息
+        """
+        for name, getter in EQUALITY_INDEXES.items():
+            self._equality[name].setdefault(getter(device_info), set()).add(key)
+        ip_int = ipv4_to_int(device_info.ipv4_address)
+        if ip_int is not None:
+            bisect.insort(self._ipv4_sorted, (ip_int, key))
+
+    def remove(self, key: str, device_info: DeviceInfo) -> None:
+        """将设备移出索引
+
+        Args:
+            key: 规范化后的MAC地址
+            device_info: 加入索引时的设备信息
+        """
+        for name, getter in EQUALITY_INDEXES.items():
+            index = self._equality[name]
+            value = getter(device_info)
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+        ip_int = ipv4_to_int(device_info.ipv4_address)
+        if ip_int is not None:
+            pos = bisect.bisect_left(self._ipv4_sorted, (ip_int, key))
+            if pos < len(self._ipv4_sorted) and self._ipv4_sorted[pos] == (ip_int, key):
+                del self._ipv4_sorted[pos]
+
+    def clear(self) -> None:
+        """清空索引"""
+        for index in self._equality.values():
+            index.clear()
+        self._ipv4_sorted.clear()
+
+    def _lookup(self, name: str, value: Any) -> Set[str]:
+        """单个条件的候选MAC集合，value为list/tuple/set时取并集"""
+        if name == "subnet":
+            values: Iterable[Any] = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+            result: Set[str] = set()
+            for subnet in values:
+                network = ipaddress.IPv4Network(subnet, strict=False)
+                lo = bisect.bisect_left(self._ipv4_sorted, (int(network.network_address), ""))
+                hi = bisect.bisect_right(self._ipv4_sorted, (int(network.broadcast_address), "\uffff"))
+                result.update(key for _, key in self._ipv4_sorted[lo:hi])
+            return result
+        index = self._equality[name]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            result = set()
+            for item in value:
+                result |= index.get(item, set())
+            return result
+        return set(index.get(value, ()))
+
+    def _estimate(self, name: str, value: Any) -> int:
+        """估算单个条件的候选数量"""
+        if name == "subnet" or isinstance(value, (list, tuple, set, frozenset)):
+            return len(self._ipv4_sorted)
+        return len(self._equality[name].get(value, ()))
+
+    def query(self, criteria: Dict[str, Any]) -> Optional[Set[str]]:
+        """按已索引的条件求候选MAC集合
+
+        Args:
+            criteria: 查询条件，仅处理已索引的参数名及 subnet
+
+        Returns:
+            Optional[Set[str]]: 满足全部已索引条件的MAC集合，没有已索引条件时为None
+        """
+        indexed = [(name, value) for name, value in criteria.items()
+                   if name in self._equality or name == "subnet"]
+        if not indexed:
+            return None
+        # 先取候选最少的条件，减少求交集的代价
+        indexed.sort(key=lambda item: self._estimate(*item))
+        result = self._lookup(*indexed[0])
+        for name, value in indexed[1:]:
+            if not result:
+                break
+            result &= self._lookup(name, value)
+        return result
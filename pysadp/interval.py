@@ -0,0 +1,158 @@
+"""
+自动搜索间隔控制模块
+
+根据进行中的激活/修改操作和最近的设备变化，运行时调整SADP_SetAutoRequestInterval：
+有操作进行时进入突发模式快速刷新，网络平静时按指数退避逐步拉长间隔
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+from .base import SADP_DEC
+from .model import DeviceInfo
+
+logger = logging.getLogger(__name__)
+
+REASON_BURST = "burst"
+"""有激活/修改操作进行中或刚完成"""
+
+REASON_CHURN = "churn"
+"""最近有设备上线、下线或参数变化"""
+
+REASON_QUIET = "quiet"
+"""网络平静，按指数退避拉长间隔"""
+
+
+class AutoRequestController:
+    """自动搜索间隔控制器，在独立线程中按固定节拍评估并调整间隔"""
+
+    def __init__(self, apply: Callable[[int], bool], min_interval: int = 1, base_interval: int = 10,
+                 max_interval: int = 120, burst_hold: float = 30.0, tick: float = 1.0) -> None:
+        """初始化控制器
+
+        Args:
+            apply: 设置自动搜索间隔的函数，参数为秒数，返回是否成功
+            min_interval: 突发模式下的间隔(秒)
+            base_interval: 有设备变化时的间隔(秒)，也是退避的起点
+            max_interval: 退避的上限(秒)
+            burst_hold: 操作结束后保持突发模式的时间(秒)，以便尽快看到设备的新状态
+            tick: 评估节拍(秒)
+        """
+        if not 0 < min_interval <= base_interval <= max_interval:
+            raise ValueError(f"需满足 0 < min_interval({min_interval}) <= base_interval({base_interval}) "
+                             f"<= max_interval({max_interval})")
+        self._apply = apply
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.burst_hold = burst_hold
+        self.tick = tick
+
+        self.current_interval = 0
+        """当前生效的自动搜索间隔(秒)"""
+
+        self.reason = ""
+        """当前间隔的原因: burst / churn / quiet"""
+
+        self.listener: Callable[[DeviceInfo], None] = self.observe
+        """注册为SADP监听函数的绑定方法，注册与移除须使用同一对象"""
+
+        self._pending = 0
+        self._burst_until = 0.0
+        self._last_churn = time.monotonic()
+        self._changed_at = self._last_churn
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """立即按当前状态设置一次间隔并启动控制线程"""
+        self._evaluate()
+        self._thread = threading.Thread(target=self._run, name="pysadp-interval", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止控制线程，间隔保持最后一次设置的值"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def operation_started(self) -> None:
+        """激活/修改等操作开始，立即进入突发模式"""
+        with self._cond:
+            self._pending += 1
+            self._cond.notify()
+
+    def operation_finished(self) -> None:
+        """激活/修改等操作结束，保持突发模式burst_hold秒"""
+        with self._cond:
+            self._pending = max(0, self._pending - 1)
+            self._burst_until = time.monotonic() + self.burst_hold
+
+    def observe(self, device_info: DeviceInfo) -> None:
+        """记录设备事件，可注册为SADP监听函数
+
+        Args:
+            device_info: 设备信息
+        """
+        # 首次出现、下线及字段变化计为变化，内容未变的更新不计
+        if device_info.changed_fields is None or device_info.changed_fields or device_info.result == SADP_DEC:
+            self._last_churn = time.monotonic()
+
+    def _target(self, now: float) -> Tuple[int, str]:
+        """计算目标间隔及原因"""
+        if self._pending or now < self._burst_until:
+            return self.min_interval, REASON_BURST
+        if now - self._last_churn < self.base_interval:
+            return self.base_interval, REASON_CHURN
+        # 平静期内每经过一个完整间隔翻倍一次
+        if self.reason != REASON_QUIET:
+            return max(self.base_interval, self.current_interval), REASON_QUIET
+        if now - self._changed_at >= self.current_interval:
+            return min(self.max_interval, self.current_interval * 2), REASON_QUIET
+        return self.current_interval, REASON_QUIET
+
+    def _evaluate(self) -> None:
+        now = time.monotonic()
+        with self._cond:
+            interval, reason = self._target(now)
+        if interval != self.current_interval:
+            if self._apply(interval):
+                logger.info(f"自动搜索间隔调整为{interval}秒({reason})")
+                self.current_interval = interval
+                self._changed_at = now
+            else:
+                logger.error(f"设置自动搜索间隔失败: {interval}秒")
+        elif reason != self.reason:
+            self._changed_at = now
+        self.reason = reason
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                self._cond.wait(self.tick)
+                if self._closed:
+                    return
+            self._evaluate()
+
+    def status(self) -> dict:
+        """获取控制器状态
+
+        Returns:
+            dict: 状态信息
+                - interval: int，当前自动搜索间隔(秒)
+                - reason: str，当前间隔的原因
+                - pending_operations: int，进行中的操作数
+        """
+        return {
+            "interval": self.current_interval,
+            "reason": self.reason,
+            "pending_operations": self._pending,
+        }
@@ -0,0 +1,73 @@
+"""
+整数区间集合模块
+
+以有序、不相交的闭区间保存整数集合，IPv4/IPv6地址分配器用其记录不可分配的地址，
+连续分配的地址合并为一个区间，查找下一个空闲地址为O(log n)
+"""
+
+import bisect
+from typing import List, Optional, Tuple
+
+
+class IntervalSet:
+    """有序、不相交的整数闭区间集合，相邻区间自动合并"""
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self.size = 0
+        """集合中的整数个数"""
+
+    def __len__(self) -> int:
+        """区间个数"""
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends))
+
+    def add(self, start: int, end: int) -> None:
+        """加入区间[start, end]"""
+        i = bisect.bisect_left(self._ends, start - 1)
+        j = bisect.bisect_right(self._starts, end + 1)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+            self.size -= sum(e - s + 1 for s, e in zip(self._starts[i:j], self._ends[i:j]))
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+        self.size += end - start + 1
+
+    def remove(self, start: int, end: int) -> None:
+        """移除区间[start, end]"""
+        i = bisect.bisect_left(self._ends, start)
+        j = bisect.bisect_right(self._starts, end)
+        if i >= j:
+            return
+        starts: List[int] = []
+        ends: List[int] = []
+        if self._starts[i] < start:
+            starts.append(self._starts[i])
+            ends.append(start - 1)
+        if self._ends[j - 1] > end:
+            starts.append(end + 1)
+            ends.append(self._ends[j - 1])
+        self.size -= sum(e - s + 1 for s, e in zip(self._starts[i:j], self._ends[i:j]))
+        self.size += sum(e - s + 1 for s, e in zip(starts, ends))
+        self._starts[i:j] = starts
+        self._ends[i:j] = ends
+
+    def overlap(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """集合与区间[start, end]的交集，按顺序返回各段闭区间"""
+        i = bisect.bisect_left(self._ends, start)
+        j = bisect.bisect_right(self._starts, end)
+        return [(max(s, start), min(e, end)) for s, e in zip(self._starts[i:j], self._ends[i:j])]
+
+    def end_of(self, value: int) -> Optional[int]:
+        """包含value的区间的终点，不在集合中则为None"""
+        i = bisect.bisect_right(self._starts, value) - 1
+        if i >= 0 and self._ends[i] >= value:
+            return self._ends[i]
+        return None
+
+    def __contains__(self, value: int) -> bool:
+        return self.end_of(value) is not None
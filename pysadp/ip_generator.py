@@ -4,10 +4,21 @@ IP地址生成器模块
 提供IP地址生成功能，根据给定的IP和掩码长度，每次调用返回下一个可用的IP地址
 """
 
+import random
 import logging
+import itertools
 import ipaddress
 from typing import Optional, Union
 
+from .interval_set import IntervalSet
+from .leases import LeaseStore
+
+
+def _int_to_ip(value: int) -> str:
+    """整数转换为点分十进制IPv4地址"""
+    return f"{value >> 24}.{value >> 16 & 0xFF}.{value >> 8 & 0xFF}.{value & 0xFF}"
+
+
 class IPGenerator:
     """IP地址生成器类"""
 
@@ -15,15 +26,22 @@ class IPGenerator:
     gateway: str
     """网关IP地址"""
 
-    def __init__(self, start_ip: str, netmask: Union[str, int],gateway: Optional[str] = None):
+    def __init__(self, start_ip: str, netmask: Union[str, int],gateway: Optional[str] = None,
+                 lease_store: Optional[LeaseStore] = None):
         """初始化IP地址生成器
         
         Args:
             start_ip: 起始IP地址，例如 "192.168.1.100"
             netmask: 子网掩码，例如 "255.255.255.0" 或 24
             gateway: 网关IP地址，如不提定则默认为网络地址中的第一个IP
+            lease_store: 租约存储，指定后分配结果跨运行保存：同一MAC总是得到相同地址，已分配的地址不会再分配给其它设备
         """
         self.start_ip = start_ip
+        self.lease_store = lease_store
+        # 最近一次分配的地址、是否移动了指针，以及分配给的设备
+        self._current: Optional[int] = None
+        self._advanced = False
+        self._current_mac: Optional[str] = None
        
         
         # 创建起始IP对象
@@ -32,8 +50,13 @@ class IPGenerator:
         # 创建网络对象（基于起始IP和掩码长度）
         self.network = ipaddress.IPv4Network(f"{start_ip}/{netmask}", strict=False)
         
-        # 获取可用的主机地址范围
-        self.available_hosts = list(self.network.hosts())
+        # 可用主机地址范围，以整数表示，与network.hosts()一致：/31两个地址均可用，/32为单个地址
+        if self.network.prefixlen >= 31:
+            self._first_host = int(self.network.network_address)
+            self._last_host = int(self.network.broadcast_address)
+        else:
+            self._first_host = int(self.network.network_address) + 1
+            self._last_host = int(self.network.broadcast_address) - 1
 
         if gateway is None:
             self.gateway = str(self.network.network_address + 1)
@@ -45,36 +68,64 @@ class IPGenerator:
             self.gateway = gateway
 
 
-        # 找到起始IP在可用主机列表中的位置
-        try:
-            self.current_index = self.available_hosts.index(start_ip_obj)
-        except ValueError:
-            # 如果起始IP不在可用主机列表中，从第一个可用主机开始
+        # 起始IP在可用主机范围中的位置
+        if self._first_host <= int(start_ip_obj) <= self._last_host:
+            self.current_index = int(start_ip_obj) - self._first_host
+        else:
+            # 如果起始IP不在可用主机范围内，从第一个可用主机开始
             self.current_index = 0
             logging.warning(f"警告: 起始IP {start_ip} 不在可用主机范围内，将从第一个可用IP开始")
         
         # 最大可用IP数量
-        self.max_available = len(self.available_hosts)
+        self.max_available = self._last_host - self._first_host + 1
         
         if self.max_available == 0:
             raise ValueError("该网络没有可用的主机地址")
     
-    def get_next_ip(self) -> str:
+    def get_next_ip(self, mac: Optional[str] = None) -> str:
         """获取下一个可用的IP地址
         
+        Args:
+            mac: 设备MAC地址，配合lease_store使用：该设备已有租约时直接返回原地址，否则记录新租约
+        
         Returns:
             str: 下一个可用的IP地址
             
         Raises:
             IndexError: 当超出最大可用IP数量时抛出异常
         """
+        self._current_mac = mac
+        if self.lease_store is not None:
+            return self._next_leased_ip(mac)
         if self.current_index >= self.max_available:
             raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
         
-        next_ip = str(self.available_hosts[self.current_index])
+        self._current = self._first_host + self.current_index
         self.current_index += 1
+        self._advanced = True
         
-        return next_ip
+        return _int_to_ip(self._current)
+
+    def _next_leased_ip(self, mac: Optional[str]) -> str:
+        """按租约存储分配地址，跳过已租给其它设备的地址"""
+        network = str(self.network)
+        if mac is not None:
+            leased = self.lease_store.lookup(network, mac)
+            if leased is not None and self._first_host <= leased <= self._last_host:
+                self._current = leased
+                self._advanced = False
+                return _int_to_ip(leased)
+        value = None
+        if self.current_index < self.max_available:
+            value = self.lease_store.next_free(network, self._first_host + self.current_index, self._last_host)
+        if value is None:
+            raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+        if mac is not None:
+            self.lease_store.assign(network, mac, value)
+        self.current_index = value - self._first_host + 1
+        self._current = value
+        self._advanced = True
+        return _int_to_ip(value)
     
     @property
     def netmask(self) -> str:
@@ -86,26 +137,31 @@ class IPGenerator:
         return str(self.network.netmask)
     
     def get_current_ip(self) -> Optional[str]:
-        """获取当前IP地址（不移动指针）
+        """获取当前IP地址（不移动指针），即最近一次get_next_ip返回的地址，含按租约返回的原地址
         
         Returns:
             Optional[str]: 当前IP地址，如果还没有开始获取则返回None
         """
-        if self.current_index == 0:
+        if self._current is None:
             return None
-        return str(self.available_hosts[self.current_index - 1])
+        return _int_to_ip(self._current)
     
     def reset(self) -> None:
         """重置生成器，从头开始"""
         self.current_index = 0
+        self._current = None
     
     def get_remaining_count(self) -> int:
-        """获取剩余可用的IP地址数量
+        """获取剩余可用的IP地址数量，使用租约存储时不含已租给设备的地址
         
         Returns:
             int: 剩余可用IP数量
         """
-        return self.max_available - self.current_index
+        remaining = self.max_available - self.current_index
+        if self.lease_store is not None and remaining > 0:
+            remaining -= self.lease_store.count(str(self.network), self._first_host + self.current_index,
+                                                self._last_host)
+        return remaining
     
     def recycle_current_ip(self) -> bool:
         """回收当前IP，使得下次get_next_ip可以重新获得相同的IP
@@ -113,11 +169,19 @@ class IPGenerator:
         Returns:
             bool: 回收是否成功（如果当前没有IP被使用则返回False）
         """
+        if self.lease_store is not None and self._current_mac is not None:
+            # 同时删除租约，该地址可以再分配给其它设备
+            self.lease_store.release(str(self.network), self._current_mac)
+            self._current_mac = None
+            if not self._advanced:
+                self._current = None
+                return True
         if self.current_index <= 0:
             return False
         
         # 将当前索引减1，这样下次get_next_ip会重新获得相同的IP
         self.current_index -= 1
+        self._current = self._first_host + self.current_index - 1 if self.current_index > 0 else None
         return True
     
     def get_network_info(self) -> dict:
@@ -126,13 +190,14 @@ class IPGenerator:
         Returns:
             dict: 包含网络信息的字典
         """
+        remaining = self.get_remaining_count()
         return {
             "network_address": str(self.network.network_address),
             "broadcast_address": str(self.network.broadcast_address),
             "netmask": str(self.network.netmask),
             "total_hosts": self.max_available,
-            "used_hosts": self.current_index,
-            "available_hosts": self.get_remaining_count(),
+            "used_hosts": self.max_available - remaining,
+            "available_hosts": remaining,
             "gateway": self.gateway
         }
     
@@ -143,6 +208,257 @@ class IPGenerator:
 
 
 
+STRATEGY_SEQUENTIAL = "sequential"
+"""从起始地址开始依次分配"""
+
+STRATEGY_RANDOM = "random"
+"""在前缀内随机稀疏分配，地址不易被扫描猜到"""
+
+STRATEGY_EUI64 = "eui64"
+"""由设备MAC地址生成EUI-64接口标识，同一设备总是得到相同地址"""
+
+
+def eui64_interface_id(mac: str) -> int:
+    """由MAC地址生成修改后的EUI-64接口标识(RFC 4291)
+
+    Args:
+        mac: MAC地址，例如 "ac-cb-51-12-34-56" 或 "AC:CB:51:12:34:56"
+
+    Returns:
+        int: 64位接口标识
+    """
+    digits = mac.replace("-", "").replace(":", "").replace(".", "")
+    if len(digits) != 12:
+        raise ValueError(f"无效的MAC地址: {mac}")
+    value = int(digits, 16)
+    # 在OUI与设备标识之间插入FFFE，并翻转U/L位
+    return ((value >> 24) << 40 | 0xFFFE << 24 | value & 0xFFFFFF) ^ (1 << 57)
+
+
+class IPv6Generator:
+    """IPv6地址生成器类，接口与IPGenerator一致
+
+    内存只随已分配地址数增长，与前缀大小无关：sequential策略分配的地址连续，以整数区间集合记录，
+    查找下一个空闲地址时整段跳过已分配的区间；random与eui64策略分配的地址稀疏，以哈希集合记录，
+    每次分配与释放为O(1)
+    """
+
+    gateway: str
+    """网关IPv6地址"""
+
+    def __init__(self, prefix: str, strategy: str = STRATEGY_SEQUENTIAL, gateway: Optional[str] = None,
+                 start_ip: Optional[str] = None, seed: Optional[int] = None):
+        """初始化IPv6地址生成器
+
+        Args:
+            prefix: 网络前缀，例如 "2001:db8:1::/64"
+            strategy: 分配策略
+                - sequential: 从start_ip开始依次分配(默认)
+                - random: 在前缀内随机分配
+                - eui64: 由设备MAC地址生成，要求前缀长度不大于64
+            gateway: 网关IPv6地址，如不指定则默认为前缀中的第一个地址
+            start_ip: sequential策略的起始地址，默认为网关之后的第一个地址
+            seed: random策略的随机数种子，用于复现分配结果
+        """
+        if strategy not in (STRATEGY_SEQUENTIAL, STRATEGY_RANDOM, STRATEGY_EUI64):
+            raise ValueError(f"不支持的分配策略: {strategy}")
+        self.network = ipaddress.IPv6Network(prefix, strict=False)
+        if strategy == STRATEGY_EUI64 and self.network.prefixlen > 64:
+            raise ValueError(f"EUI-64要求前缀长度不大于64: {self.network}")
+        self.strategy = strategy
+
+        # 可用地址范围，/127与/128外不使用前缀本身(子网路由器任播地址)
+        self._network_int = int(self.network.network_address)
+        self._first_host = self._network_int + (1 if self.network.prefixlen < 127 else 0)
+        self._last_host = int(self.network.broadcast_address)
+
+        if gateway is None:
+            self.gateway = str(self.network.network_address + 1)
+        else:
+            if ipaddress.IPv6Address(gateway) not in self.network:
+                raise ValueError(f"网关IP {gateway} 不在网络 {self.network} 范围内")
+            self.gateway = str(ipaddress.IPv6Address(gateway))
+        self._excluded = {int(ipaddress.IPv6Address(self.gateway))}
+
+        if start_ip is None:
+            self._start = self._first_host
+        else:
+            start = int(ipaddress.IPv6Address(start_ip))
+            if not self._first_host <= start <= self._last_host:
+                raise ValueError(f"起始IP {start_ip} 不在网络 {self.network} 范围内")
+            self._start = start
+        self._random = random.Random(seed)
+        self._current: Optional[int] = None
+        self.reset()
+
+        # 最大可用IP数量
+        self.max_available = self._last_host - self._first_host + 1 - len(
+            [value for value in self._excluded if self._first_host <= value <= self._last_host])
+        if self.max_available <= 0:
+            raise ValueError("该网络没有可用的主机地址")
+
+    @property
+    def mask_len(self) -> int:
+        """前缀长度，对应 modify_device_net_param() 的ipv6_mask_len参数"""
+        return self.network.prefixlen
+
+    def _used_count(self) -> int:
+        """已分配的地址数"""
+        if isinstance(self._allocated, set):
+            return len(self._allocated)
+        return self._allocated.size
+
+    def _is_free(self, value: int) -> bool:
+        if isinstance(self._allocated, set):
+            return value not in self._allocated and value not in self._excluded
+        return value not in self._blocked
+
+    def _next_free(self, value: int, last: int) -> Optional[int]:
+        """[value, last]中第一个空闲地址"""
+        if value > last:
+            return None
+        end = self._blocked.end_of(value)
+        if end is None:
+            return value
+        # 区间相邻时已合并，终点的下一个地址必然空闲
+        return end + 1 if end < last else None
+
+    def _next_sequential(self) -> int:
+        value = self._next_free(self._cursor, self._last_host)
+        if value is None:
+            value = self._next_free(self._first_host, self._cursor - 1)
+        if value is None:
+            raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+        return value
+
+    def _next_random(self) -> int:
+        span = self._last_host - self._first_host + 1
+        # 稀疏时几乎总是一次命中；接近分配完时改为从随机位置顺序查找
+        for _ in range(16):
+            value = self._first_host + self._random.randrange(span)
+            if self._is_free(value):
+                return value
+        start = self._first_host + self._random.randrange(span)
+        for value in itertools.chain(range(start, self._last_host + 1), range(self._first_host, start)):
+            if self._is_free(value):
+                return value
+        raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+
+    def get_next_ip(self, mac: Optional[str] = None) -> str:
+        """获取下一个可用的IPv6地址
+
+        Args:
+            mac: 设备MAC地址，eui64策略必须提供，用其生成接口标识
+
+        Returns:
+            str: IPv6地址
+
+        Raises:
+            IndexError: 当超出最大可用IP数量时抛出异常
+        """
+        if self.strategy == STRATEGY_EUI64:
+            if mac is None:
+                raise ValueError("eui64策略需要提供设备MAC地址")
+            value = self._network_int | eui64_interface_id(mac)
+            # 同一设备总是得到相同地址，重复分配时直接返回
+            if value in self._allocated:
+                self._current = value
+                return str(ipaddress.IPv6Address(value))
+        if self._used_count() >= self.max_available:
+            raise IndexError(f"超出最大可用IP数量 ({self.max_available})")
+        if self.strategy == STRATEGY_EUI64:
+            self._allocated.add(value)
+        elif self.strategy == STRATEGY_RANDOM:
+            value = self._next_random()
+            self._allocated.add(value)
+        else:
+            value = self._next_sequential()
+            self._cursor = value + 1
+            self._allocated.add(value, value)
+            self._blocked.add(value, value)
+        self._current = value
+        return str(ipaddress.IPv6Address(value))
+
+    def get_current_ip(self) -> Optional[str]:
+        """获取最近一次分配的IP地址
+
+        Returns:
+            Optional[str]: 当前IP地址，如果还没有开始获取或已回收则返回None
+        """
+        return str(ipaddress.IPv6Address(self._current)) if self._current is not None else None
+
+    def release(self, ip: str) -> None:
+        """释放已分配的地址，使其可以再次分配
+
+        Args:
+            ip: IPv6地址
+        """
+        self._release(int(ipaddress.IPv6Address(ip)))
+
+    def _release(self, value: int) -> None:
+        if isinstance(self._allocated, set):
+            self._allocated.discard(value)
+            return
+        self._allocated.remove(value, value)
+        if value not in self._excluded:
+            self._blocked.remove(value, value)
+
+    def reset(self) -> None:
+        """重置生成器，清除全部分配记录并从头开始"""
+        if self.strategy == STRATEGY_SEQUENTIAL:
+            self._allocated = IntervalSet()
+            # 不可分配的地址：已分配地址与网关
+            self._blocked = IntervalSet()
+            for value in self._excluded:
+                self._blocked.add(value, value)
+        else:
+            self._allocated = set()
+        self._cursor = self._start
+        self._current = None
+
+    def get_remaining_count(self) -> int:
+        """获取剩余可用的IP地址数量
+
+        Returns:
+            int: 剩余可用IP数量
+        """
+        return self.max_available - self._used_count()
+
+    def recycle_current_ip(self) -> bool:
+        """回收当前IP，使得下次get_next_ip可以重新获得相同的IP(sequential策略)
+
+        Returns:
+            bool: 回收是否成功（如果当前没有IP被使用则返回False）
+        """
+        if self._current is None:
+            return False
+        self._release(self._current)
+        if self.strategy == STRATEGY_SEQUENTIAL:
+            self._cursor = self._current
+        self._current = None
+        return True
+
+    def get_network_info(self) -> dict:
+        """获取网络信息
+
+        Returns:
+            dict: 包含网络信息的字典
+        """
+        return {
+            "network_address": str(self.network.network_address),
+            "prefix_len": self.network.prefixlen,
+            "strategy": self.strategy,
+            "total_hosts": self.max_available,
+            "used_hosts": self._used_count(),
+            "available_hosts": self.get_remaining_count(),
+            "gateway": self.gateway
+        }
+
+    def __str__(self) -> str:
+        return (f"IPv6Generator(prefix='{self.network}', strategy={self.strategy}, "
+                f"used={self._used_count()}, max_available={self.max_available})")
+
+
 # 示例使用
 if __name__ == "__main__":
     print("示例1: 使用IP和掩码长度")
@@ -0,0 +1,172 @@
+"""
+IP地址租约存储模块
+
+以SQLite文件记录 MAC地址 -> IP地址 的分配及时间，供IPGenerator跨多次运行保持分配结果：
+同一设备重复运行时得到相同地址，其它设备不会拿到已分配的地址。
+查询均走索引，启动时不需要把全部租约读入内存
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from .registry import normalize_mac
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    network TEXT NOT NULL,
+    mac TEXT NOT NULL,
+    ip INTEGER NOT NULL,
+    assigned_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (network, mac),
+    UNIQUE (network, ip)
+)
+"""
+
+
+class LeaseStore:
+    """基于SQLite的IP地址租约存储，线程安全
+
+    Example:
+        >>> store = LeaseStore("leases.db")
+        >>> ip_gen = IPGenerator("192.168.1.100", 24, lease_store=store)
+        >>> ip_gen.get_next_ip(device.mac)   # 重新运行时同一设备得到相同地址
+    """
+
+    def __init__(self, path: str) -> None:
+        """打开或创建租约文件
+
+        Args:
+            path: SQLite文件路径，":memory:"表示只保存在内存中
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭租约文件"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leases").fetchone()[0]
+
+    def lookup(self, network: str, mac: str) -> Optional[int]:
+        """查询设备在网段中的租约
+
+        Args:
+            network: 网段(CIDR)
+            mac: 设备MAC地址
+
+        Returns:
+            Optional[int]: 已分配的IP地址(整数)，没有租约则为None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT ip FROM leases WHERE network = ? AND mac = ?",
+                                     (network, normalize_mac(mac))).fetchone()
+        return row[0] if row else None
+
+    def holder(self, network: str, ip: int) -> Optional[str]:
+        """查询IP地址的租约持有者
+
+        Args:
+            network: 网段(CIDR)
+            ip: IP地址(整数)
+
+        Returns:
+            Optional[str]: 持有该地址的设备MAC地址(规范化后)，未分配则为None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT mac FROM leases WHERE network = ? AND ip = ?", (network, ip)).fetchone()
+        return row[0] if row else None
+
+    def count(self, network: str, start: int, end: int) -> int:
+        """统计[start, end]中已分配的地址数
+
+        Args:
+            network: 网段(CIDR)
+            start: 起始地址(整数)
+            end: 结束地址(整数)
+
+        Returns:
+            int: 已分配的地址数
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leases WHERE network = ? AND ip >= ? AND ip <= ?",
+                                      (network, start, end)).fetchone()[0]
+
+    def next_free(self, network: str, start: int, end: int) -> Optional[int]:
+        """查找[start, end]中第一个没有租约的地址
+
+        按地址顺序遍历连续的已分配地址，遇到第一个空位即返回
+
+        Args:
+            network: 网段(CIDR)
+            start: 起始地址(整数)
+            end: 结束地址(整数)
+
+        Returns:
+            Optional[int]: 空闲地址，范围内全部已分配则为None
+        """
+        candidate = start
+        with self._lock:
+            cursor = self._conn.execute("SELECT ip FROM leases WHERE network = ? AND ip >= ? AND ip <= ? ORDER BY ip",
+                                        (network, start, end))
+            for (ip,) in cursor:
+                if ip != candidate:
+                    break
+                candidate += 1
+        return candidate if candidate <= end else None
+
+    def assign(self, network: str, mac: str, ip: int) -> None:
+        """记录租约，设备已有租约时改为新地址
+
+        Args:
+            network: 网段(CIDR)
+            mac: 设备MAC地址
+            ip: IP地址(整数)
+
+        Raises:
+            ValueError: 地址已分配给其它设备
+        """
+        key = normalize_mac(mac)
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO leases (network, mac, ip, assigned_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (network, mac) DO UPDATE SET ip = excluded.ip, updated_at = excluded.updated_at",
+                    (network, key, ip, now, now))
+            except sqlite3.IntegrityError:
+                raise ValueError(f"IP地址已分配给其它设备: {ip}") from None
+
+    def release(self, network: str, mac: str) -> bool:
+        """删除设备的租约
+
+        Args:
+            network: 网段(CIDR)
+            mac: 设备MAC地址
+
+        Returns:
+            bool: 是否存在并已删除
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM leases WHERE network = ? AND mac = ?",
+                                        (network, normalize_mac(mac)))
+        return cursor.rowcount > 0
+
+    def get(self, network: str, mac: str) -> Optional[Tuple[int, float, float]]:
+        """获取设备租约详情
+
+        Returns:
+            Optional[Tuple[int, float, float]]: (IP地址, 首次分配时间, 最近更新时间)，时间为Unix时间戳
+        """
+        with self._lock:
+            return self._conn.execute("SELECT ip, assigned_at, updated_at FROM leases WHERE network = ? AND mac = ?",
+                                      (network, normalize_mac(mac))).fetchone()
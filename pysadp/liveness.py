@@ -0,0 +1,168 @@
+"""
+设备存活跟踪模块
+
+基于分层时间轮记录每台设备最近一次出现的时间，超过存活时间(TTL)未出现的设备判定为下线。
+每条回调只更新最近出现时间，时间轮条目到期时才按最新时间决定下线或重新挂入，
+每个节拍的均摊代价为O(1)，不需要为每台设备维护定时器
+"""
+
+import time
+import threading
+from typing import Callable, Dict, Hashable, List, Set, Tuple
+
+
+class TimingWheel:
+    """分层时间轮
+
+    第l层每个槽覆盖 slots**l 个节拍，高层的条目在进入其时间范围时逐层下移，
+    最终在第0层对应节拍到期。
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 4) -> None:
+        """初始化时间轮
+
+        Args:
+            slots: 每层槽数
+            levels: 层数，可表示的最长时间为 slots**levels 个节拍，超出的条目到期后重新挂入
+        """
+        self.slots = slots
+        self.levels = levels
+        self.current = 0
+        """当前节拍"""
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+
+    def schedule(self, key: Hashable, expire: int) -> None:
+        """挂入一个条目
+
+        Args:
+            key: 条目标识
+            expire: 到期节拍，不晚于当前节拍时在下一节拍到期
+        """
+        at = max(expire, self.current + 1)
+        delta = at - self.current
+        level = 0
+        while level < self.levels - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        if delta >= self._spans[self.levels]:
+            # 超出时间轮范围，先挂在最远处，到期后再重新挂入
+            at = self.current + self._spans[self.levels] - 1
+        self._wheels[level][(at // self._spans[level]) % self.slots][key] = expire
+
+    def advance(self, to: int) -> List[Tuple[Hashable, int]]:
+        """推进到指定节拍
+
+        Args:
+            to: 目标节拍
+
+        Returns:
+            List[Tuple[Hashable, int]]: 到期的(条目标识, 到期节拍)
+        """
+        expired: List[Tuple[Hashable, int]] = []
+        while self.current < to:
+            self.current += 1
+            # 高层槽进入时间范围时整体下移
+            for level in range(1, self.levels):
+                if self.current % self._spans[level]:
+                    break
+                index = (self.current // self._spans[level]) % self.slots
+                bucket = self._wheels[level][index]
+                if bucket:
+                    self._wheels[level][index] = {}
+                    for key, expire in bucket.items():
+                        if expire <= self.current:
+                            expired.append((key, expire))
+                        else:
+                            self.schedule(key, expire)
+            index = self.current % self.slots
+            bucket = self._wheels[0][index]
+            if bucket:
+                self._wheels[0][index] = {}
+                for key, expire in bucket.items():
+                    if expire > self.current:
+                        self.schedule(key, expire)
+                    else:
+                        expired.append((key, expire))
+        return expired
+
+
+class LivenessTracker:
+    """设备存活跟踪器，线程安全"""
+
+    def __init__(self, ttl: float, tick: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        """初始化存活跟踪器
+
+        Args:
+            ttl: 存活时间(秒)，超过该时间未出现的设备判定为下线
+            tick: 时间轮节拍(秒)，即下线判定的时间精度
+            clock: 时钟函数
+        """
+        if ttl <= 0 or tick <= 0:
+            raise ValueError(f"ttl与tick必须大于0: ttl={ttl}, tick={tick}")
+        self.ttl = ttl
+        self.tick = tick
+        self._clock = clock
+        self._origin = clock()
+        self._wheel = TimingWheel()
+        self._last_seen: Dict[str, float] = {}
+        # 已在时间轮中挂有条目的key
+        self._scheduled: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _tick_of(self, moment: float) -> int:
+        """时间点对应的节拍(向上取整)"""
+        return -int(-(moment - self._origin) // self.tick)
+
+    def touch(self, key: str, now: float) -> None:
+        """记录设备出现
+
+        Args:
+            key: 规范化后的MAC地址
+            now: 出现时间(秒，与clock同一时钟)
+        """
+        with self._lock:
+            self._last_seen[key] = now
+            if key not in self._scheduled:
+                self._scheduled.add(key)
+                self._wheel.schedule(key, self._tick_of(now + self.ttl))
+
+    def forget(self, key: str) -> None:
+        """停止跟踪设备，例如收到设备下线消息时
+
+        Args:
+            key: 规范化后的MAC地址
+        """
+        with self._lock:
+            self._last_seen.pop(key, None)
+
+    def last_seen(self, key: str) -> float:
+        """设备最近一次出现的时间，未跟踪则为0"""
+        return self._last_seen.get(key, 0.0)
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def advance(self, now: float) -> List[str]:
+        """推进时间轮并返回已超时的设备
+
+        Args:
+            now: 当前时间(秒，与clock同一时钟)
+
+        Returns:
+            List[str]: 超时未出现的设备MAC地址(规范化后)，返回后即不再跟踪
+        """
+        expired: List[str] = []
+        with self._lock:
+            for key, _ in self._wheel.advance(self._tick_of(now)):
+                last_seen = self._last_seen.get(key)
+                if last_seen is None:
+                    self._scheduled.discard(key)
+                    continue
+                deadline = last_seen + self.ttl
+                if deadline <= now:
+                    del self._last_seen[key]
+                    self._scheduled.discard(key)
+                    expired.append(key)
+                else:
+                    self._wheel.schedule(key, self._tick_of(deadline))
+        return expired
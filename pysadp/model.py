@@ -1,7 +1,311 @@
+import sys
+import struct
+import ctypes
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from .base import SADP_DEVICE_INFO_V40
+
+# DeviceInfo属性名 -> SADP_DEVICE_INFO_V40字段路径
+DEVICE_INFO_FIELDS: Dict[str, str] = {
+    "series": "struSadpDeviceInfo.szSeries",
+    "serial_no": "struSadpDeviceInfo.szSerialNO",
+    "mac": "struSadpDeviceInfo.szMAC",
+    "ipv4_address": "struSadpDeviceInfo.szIPv4Address",
+    "ipv4_subnet_mask": "struSadpDeviceInfo.szIPv4SubnetMask",
+    "device_type": "struSadpDeviceInfo.dwDeviceType",
+    "port": "struSadpDeviceInfo.dwPort",
+    "number_of_encoders": "struSadpDeviceInfo.dwNumberOfEncoders",
+    "number_of_hard_disk": "struSadpDeviceInfo.dwNumberOfHardDisk",
+    "device_software_version": "struSadpDeviceInfo.szDeviceSoftwareVersion",
+    "dsp_version": "struSadpDeviceInfo.szDSPVersion",
+    "boot_time": "struSadpDeviceInfo.szBootTime",
+    "result": "struSadpDeviceInfo.iResult",
+    "dev_desc": "struSadpDeviceInfo.szDevDesc",
+    "oem_info": "struSadpDeviceInfo.szOEMinfo",
+    "ipv4_gateway": "struSadpDeviceInfo.szIPv4Gateway",
+    "ipv6_address": "struSadpDeviceInfo.szIPv6Address",
+    "ipv6_gateway": "struSadpDeviceInfo.szIPv6Gateway",
+    "ipv6_mask_len": "struSadpDeviceInfo.byIPv6MaskLen",
+    "support": "struSadpDeviceInfo.bySupport",
+    "dhcp_enabled": "struSadpDeviceInfo.byDhcpEnabled",
+    "device_ability": "struSadpDeviceInfo.byDeviceAbility",
+    "http_port": "struSadpDeviceInfo.wHttpPort",
+    "digital_channel_num": "struSadpDeviceInfo.wDigitalChannelNum",
+    "cms_ipv4": "struSadpDeviceInfo.szCmsIPv4",
+    "cms_port": "struSadpDeviceInfo.wCmsPort",
+    "oem_code": "struSadpDeviceInfo.byOEMCode",
+    "activated": "struSadpDeviceInfo.byActivated",
+    "base_desc": "struSadpDeviceInfo.szBaseDesc",
+    "support1": "struSadpDeviceInfo.bySupport1",
+    "hc_platform": "struSadpDeviceInfo.byHCPlatform",
+    "enable_hc_platform": "struSadpDeviceInfo.byEnableHCPlatform",
+    "ezviz_code": "struSadpDeviceInfo.byEZVIZCode",
+    "detail_oem_code": "struSadpDeviceInfo.dwDetailOEMCode",
+    "modify_verification_code": "struSadpDeviceInfo.byModifyVerificationCode",
+    "max_bind_num": "struSadpDeviceInfo.byMaxBindNum",
+    "oem_command_port": "struSadpDeviceInfo.wOEMCommandPort",
+    "support_wifi_region": "struSadpDeviceInfo.bySupportWifiRegion",
+    "enable_wifi_enhancement": "struSadpDeviceInfo.byEnableWifiEnhancement",
+    "wifi_region": "struSadpDeviceInfo.byWifiRegion",
+    "support2": "struSadpDeviceInfo.bySupport2",
+    # V40扩展字段
+    "licensed": "byLicensed",
+    "system_mode": "bySystemMode",
+    "controller_type": "byControllerType",
+    "ehmoe_version": "szEhmoeVersion",
+    "specific_device_type": "bySpecificDeviceType",
+    "sdk_over_tls_port": "dwSDKOverTLSPort",
+    "security_mode": "bySecurityMode",
+    "sdk_server_status": "bySDKServerStatus",
+    "sdk_over_tls_server_status": "bySDKOverTLSServerStatus",
+    "user_name": "szUserName",
+    "wifi_mac": "szWifiMAC",
+    "data_from_multicast": "byDataFromMulticast",
+    "support_ezviz_unbind": "bySupportEzvizUnbind",
+    "support_code_encrypt": "bySupportCodeEncrypt",
+    "support_password_reset_type": "bySupportPasswordResetType",
+    "ezviz_bind_status": "byEZVIZBindStatus",
+    "physical_access_verification": "szPhysicalAccessVerification",
+}
+
+_INT_FORMATS = {(1, False): "B", (2, False): "H", (4, False): "I", (8, False): "Q",
+                (1, True): "b", (2, True): "h", (4, True): "i", (8, True): "q"}
+
+
+def field_layout(structure, path: str) -> Tuple[int, type]:
+    """获取结构体字段的偏移与ctypes类型
+
+    Args:
+        structure: ctypes结构体类型，例如 SADP_DEVICE_INFO_V40
+        path: 字段路径，嵌套结构体以'.'分隔，例如 "struSadpDeviceInfo.byActivated"
+
+    Returns:
+        Tuple[int, type]: 字段相对结构体起始的偏移及其ctypes类型
+    """
+    offset = 0
+    field_type = structure
+    for name in path.split("."):
+        offset += getattr(field_type, name).offset
+        field_type = dict(field_type._fields_)[name]
+    return offset, field_type
+
+
+def field_format(field_type) -> str:
+    """ctypes字段类型对应的struct格式符
+
+    Args:
+        field_type: ctypes类型，整数或c_char数组
+
+    Returns:
+        str: struct格式符，例如 "B"、"I"、"48s"
+    """
+    if issubclass(field_type, ctypes.Array):
+        return f"{ctypes.sizeof(field_type)}s"
+    signed = field_type(-1).value < 0
+    return _INT_FORMATS[(ctypes.sizeof(field_type), signed)]
+
+
+def _build_decoder() -> Tuple[struct.Struct, List[Tuple[str, bool]]]:
+    """按ctypes结构体布局生成一次解包全部字段的struct.Struct
+
+    Returns:
+        Tuple[struct.Struct, List[Tuple[str, bool]]]: 解码器，以及与解包结果一一对应的(属性名, 是否字符串)列表
+    """
+    layout = sorted((*field_layout(SADP_DEVICE_INFO_V40, path), name) for name, path in DEVICE_INFO_FIELDS.items())
+    fmt = "="
+    position = 0
+    fields = []
+    for offset, field_type, name in layout:
+        if offset > position:
+            fmt += f"{offset - position}x"
+        fmt += field_format(field_type)
+        position = offset + ctypes.sizeof(field_type)
+        fields.append((name, issubclass(field_type, ctypes.Array)))
+    return struct.Struct(fmt), fields
+
+
+DEVICE_INFO_DECODER, DEVICE_INFO_LAYOUT = _build_decoder()
+
+RECORD_PREFIX = DEVICE_INFO_DECODER.size
+"""覆盖全部DeviceInfo字段所需的记录前缀字节数，其后均为保留字节"""
+
+DEVICE_INFO_WIDTHS: Dict[str, int] = {
+    name: ctypes.sizeof(field_layout(SADP_DEVICE_INFO_V40, path)[1]) for name, path in DEVICE_INFO_FIELDS.items()
+}
+"""DeviceInfo字段名 -> 字段字节数"""
+
+_MAC_OFFSET, _MAC_TYPE = field_layout(SADP_DEVICE_INFO_V40, DEVICE_INFO_FIELDS["mac"])
+_MAC_DECODER = struct.Struct(field_format(_MAC_TYPE))
+
+
+RESULT_OFFSET, _RESULT_TYPE = field_layout(SADP_DEVICE_INFO_V40, DEVICE_INFO_FIELDS["result"])
+_RESULT_DECODER = struct.Struct("=" + field_format(_RESULT_TYPE))
+
+
+def record_result(buffer, offset: int = 0) -> int:
+    """不解码整条记录，直接从原始数据中读取消息类型(iResult)
+
+    Args:
+        buffer: 包含SADP_DEVICE_INFO_V40结构体数据的缓冲区
+        offset: 结构体在缓冲区中的偏移
+
+    Returns:
+        int: 消息类型
+    """
+    return _RESULT_DECODER.unpack_from(buffer, offset + RESULT_OFFSET)[0]
+
+
+def _load_memcmp():
+    """加载C运行库的memcmp，不可用时返回None"""
+    try:
+        libc = ctypes.cdll.msvcrt if sys.platform == "win32" else ctypes.CDLL(None)
+        memcmp = libc.memcmp
+    except (OSError, AttributeError, TypeError):
+        return None
+    memcmp.restype = ctypes.c_int
+    memcmp.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+    return memcmp
+
+
+_memcmp = _load_memcmp()
+_RESULT_END = RESULT_OFFSET + _RESULT_DECODER.size
+
+
+def record_equal(old: Union[int, bytes], new: Union[int, bytes]) -> bool:
+    """在原内存上比较两条记录的全部字段，不比较消息类型(iResult)，不复制数据
+
+    Args:
+        old: 原记录的内存地址或原始字节
+        new: 新记录的内存地址或原始字节
+
+    Returns:
+        bool: 除消息类型外的字段是否完全相同
+    """
+    if isinstance(old, bytes):
+        old = ctypes.cast(old, ctypes.c_void_p).value
+    if isinstance(new, bytes):
+        new = ctypes.cast(new, ctypes.c_void_p).value
+    if _memcmp is None:
+        return (ctypes.string_at(old, RESULT_OFFSET) == ctypes.string_at(new, RESULT_OFFSET)
+                and ctypes.string_at(old + _RESULT_END, RECORD_PREFIX - _RESULT_END)
+                == ctypes.string_at(new + _RESULT_END, RECORD_PREFIX - _RESULT_END))
+    return not (_memcmp(old, new, RESULT_OFFSET)
+                or _memcmp(old + _RESULT_END, new + _RESULT_END, RECORD_PREFIX - _RESULT_END))
+
+
+def record_diff(old, new) -> FrozenSet[str]:
+    """比较两条原始记录，得到值发生变化的DeviceInfo字段名，不比较消息类型
+
+    只在record_equal判断为不同后调用
+
+    Args:
+        old: 包含原记录的缓冲区
+        new: 包含新记录的缓冲区
+
+    Returns:
+        FrozenSet[str]: 变化的字段名
+    """
+    return frozenset(
+        name
+        for (name, _), old_value, new_value in zip(DEVICE_INFO_LAYOUT, DEVICE_INFO_DECODER.unpack_from(old),
+                                                 DEVICE_INFO_DECODER.unpack_from(new))
+        if old_value != new_value and name != "result"
+    )
+
+
+def record_mac(buffer, offset: int = 0) -> str:
+    """不解码整条记录，直接从原始数据中读取MAC地址
+
+    Args:
+        buffer: 包含SADP_DEVICE_INFO_V40结构体数据的缓冲区
+        offset: 结构体在缓冲区中的偏移
+
+    Returns:
+        str: 设备MAC地址
+    """
+    return _MAC_DECODER.unpack_from(buffer, offset + _MAC_OFFSET)[0].partition(b"\x00")[0].decode("utf-8")
+
+
+def _record_prefix(buffer, offset: int = 0) -> bytes:
+    """复制记录中覆盖全部字段的前缀
+
+    Args:
+        buffer: SADP_DEVICE_INFO_V40实例、ctypes缓冲区或bytes、bytearray、memoryview等
+        offset: 结构体在缓冲区中的偏移
+
+    Returns:
+        bytes: 长度为RECORD_PREFIX的原始字节
+
+    Raises:
+        ValueError: 缓冲区长度不足
+    """
+    if isinstance(buffer, (ctypes.Structure, ctypes.Array)):
+        if ctypes.sizeof(buffer) < offset + RECORD_PREFIX:
+            raise ValueError("原始数据长度不足")
+        return ctypes.string_at(ctypes.addressof(buffer) + offset, RECORD_PREFIX)
+    data = bytes(memoryview(buffer).cast("B")[offset:offset + RECORD_PREFIX])
+    if len(data) < RECORD_PREFIX:
+        raise ValueError("原始数据长度不足")
+    return data
+
+
+class _Field:
+    """数值字段描述符，每次访问时从原始字节解包，不缓存结果"""
+
+    __slots__ = ("name", "offset", "decoder")
+
+    def __init__(self, name: str, offset: int, decoder: struct.Struct) -> None:
+        self.name = name
+        self.offset = offset
+        self.decoder = decoder
+
+    def raw(self, instance) -> Union[int, bytes]:
+        """读取字段未解码的原始值"""
+        data = instance._data
+        if data is None:
+            value = self.decoder.unpack_from(instance._store.buffer, instance._offset + self.offset)[0]
+            data = instance._data
+            if data is None:
+                return value
+            # 读取期间槽位被覆盖，覆盖前已复制出该对象的数据，改从副本读取
+        return self.decoder.unpack_from(data, self.offset)[0]
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self.raw(instance)
+
+
+class _StrField(_Field):
+    """字符串字段描述符，首次访问时解码并缓存"""
+
+    __slots__ = ()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        cache = instance._cache
+        if cache is None:
+            cache = instance._cache = {}
+        else:
+            value = cache.get(self.name)
+            if value is not None:
+                return value
+        value = cache[self.name] = self.raw(instance).partition(b"\x00")[0].decode("utf-8")
+        return value
+
+
 class DeviceInfo:
     """设备信息类，映射SADP_DEVICE_INFO_V40结构体
 
+    各字段在访问时按偏移从原始记录解包，字符串字段首次访问时解码并缓存。
+    不在首次访问时用DEVICE_INFO_DECODER整体解包：回调通常只读取MAC、IP等少数字段，
+    整体解包会为每台设备额外持有全部字段的对象，抵消不复制记录带来的内存节省，因此逐字段解包是有意为之。
+    来自记录存储的对象是其槽位的视图，不复制数据；槽位被同一MAC的新记录覆盖或被释放前，
+    记录存储调用_detach()让对象复制出覆盖全部字段的记录前缀，此后对象只读取自己的副本
     """
+
+    __slots__ = ("_store", "_offset", "_data", "_cache", "_changed_fields")
     
     # 基本设备信息字段
     series: str
@@ -244,80 +548,131 @@ class DeviceInfo:
         Args:
             sadp_device_info_v40: SADP_DEVICE_INFO_V40结构体实例
         """
-        # 保存原始结构体引用
-        self._raw = sadp_device_info_v40
+        self._store = None
+        self._offset = 0
+        self._data = _record_prefix(sadp_device_info_v40)
+        self._cache = None
+        self._changed_fields = None
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0) -> "DeviceInfo":
+        """从原始字节解码设备信息
         
-        # 映射基础设备信息
-        base_info = sadp_device_info_v40.struSadpDeviceInfo
+        Args:
+            buffer: 包含SADP_DEVICE_INFO_V40结构体数据的缓冲区(bytes、bytearray、memoryview等)
+            offset: 结构体在缓冲区中的偏移
         
-        # 字符串字段需要解码
-        self.series = base_info.szSeries.decode('utf-8').strip('\x00')
-        self.serial_no = base_info.szSerialNO.decode('utf-8').strip('\x00')
-        self.mac = base_info.szMAC.decode('utf-8').strip('\x00')
-        self.ipv4_address = base_info.szIPv4Address.decode('utf-8').strip('\x00')
-        self.ipv4_subnet_mask = base_info.szIPv4SubnetMask.decode('utf-8').strip('\x00')
-        self.device_type = base_info.dwDeviceType
-        self.port = base_info.dwPort
-        self.number_of_encoders = base_info.dwNumberOfEncoders
-        self.number_of_hard_disk = base_info.dwNumberOfHardDisk
-        self.device_software_version = base_info.szDeviceSoftwareVersion.decode('utf-8').strip('\x00')
-        self.dsp_version = base_info.szDSPVersion.decode('utf-8').strip('\x00')
-        self.boot_time = base_info.szBootTime.decode('utf-8').strip('\x00')
-        self.result = base_info.iResult
-        self.dev_desc = base_info.szDevDesc.decode('utf-8').strip('\x00')
-        self.oem_info = base_info.szOEMinfo.decode('utf-8').strip('\x00')
-        self.ipv4_gateway = base_info.szIPv4Gateway.decode('utf-8').strip('\x00')
-        self.ipv6_address = base_info.szIPv6Address.decode('utf-8').strip('\x00')
-        self.ipv6_gateway = base_info.szIPv6Gateway.decode('utf-8').strip('\x00')
-        self.ipv6_mask_len = base_info.byIPv6MaskLen
-        self.support = base_info.bySupport
-        self.dhcp_enabled = base_info.byDhcpEnabled
-        self.device_ability = base_info.byDeviceAbility
-        self.http_port = base_info.wHttpPort
-        self.digital_channel_num = base_info.wDigitalChannelNum
-        self.cms_ipv4 = base_info.szCmsIPv4.decode('utf-8').strip('\x00')
-        self.cms_port = base_info.wCmsPort
-        self.oem_code = base_info.byOEMCode
-        self.activated = base_info.byActivated
-        self.base_desc = base_info.szBaseDesc.decode('utf-8').strip('\x00')
-        self.support1 = base_info.bySupport1
-        self.hc_platform = base_info.byHCPlatform
-        self.enable_hc_platform = base_info.byEnableHCPlatform
-        self.ezviz_code = base_info.byEZVIZCode
-        self.detail_oem_code = base_info.dwDetailOEMCode
-        self.modify_verification_code = base_info.byModifyVerificationCode
-        self.max_bind_num = base_info.byMaxBindNum
-        self.oem_command_port = base_info.wOEMCommandPort
-        self.support_wifi_region = base_info.bySupportWifiRegion
-        self.enable_wifi_enhancement = base_info.byEnableWifiEnhancement
-        self.wifi_region = base_info.byWifiRegion
-        self.support2 = base_info.bySupport2
+        Returns:
+            DeviceInfo: 设备信息对象
+        """
+        device_info = cls.__new__(cls)
+        device_info._store = None
+        device_info._offset = 0
+        device_info._data = _record_prefix(buffer, offset)
+        device_info._cache = None
+        device_info._changed_fields = None
+        return device_info
+
+    @classmethod
+    def from_store(cls, store, slot: int, changed_fields: Optional[FrozenSet[str]] = None) -> "DeviceInfo":
+        """从记录存储的槽位解码设备信息
         
-        # 映射V40扩展字段
-        self.licensed = sadp_device_info_v40.byLicensed
-        self.system_mode = sadp_device_info_v40.bySystemMode
-        self.controller_type = sadp_device_info_v40.byControllerType
-        self.ehmoe_version = sadp_device_info_v40.szEhmoeVersion.decode('utf-8').strip('\x00')
-        self.specific_device_type = sadp_device_info_v40.bySpecificDeviceType
-        self.sdk_over_tls_port = sadp_device_info_v40.dwSDKOverTLSPort
-        self.security_mode = sadp_device_info_v40.bySecurityMode
-        self.sdk_server_status = sadp_device_info_v40.bySDKServerStatus
-        self.sdk_over_tls_server_status = sadp_device_info_v40.bySDKOverTLSServerStatus
-        self.user_name = sadp_device_info_v40.szUserName.decode('utf-8').strip('\x00')
-        self.wifi_mac = sadp_device_info_v40.szWifiMAC.decode('utf-8').strip('\x00')
-        self.data_from_multicast = sadp_device_info_v40.byDataFromMulticast
-        self.support_ezviz_unbind = sadp_device_info_v40.bySupportEzvizUnbind
-        self.support_code_encrypt = sadp_device_info_v40.bySupportCodeEncrypt
-        self.support_password_reset_type = sadp_device_info_v40.bySupportPasswordResetType
-        self.ezviz_bind_status = sadp_device_info_v40.byEZVIZBindStatus
-        self.physical_access_verification = sadp_device_info_v40.szPhysicalAccessVerification.decode('utf-8').strip('\x00')
+        Args:
+            store: RecordStore记录存储
+            slot: 槽位
+            changed_fields: 相对该设备上一条记录发生变化的字段名
         
+        Returns:
+            DeviceInfo: 槽位的视图
+        """
+        device_info = cls.__new__(cls)
+        device_info._store = store
+        device_info._offset = store.offset(slot)
+        device_info._data = None
+        device_info._cache = None
+        device_info._changed_fields = changed_fields
+        store.bind(slot, device_info)
+        return device_info
+
+    def _detach(self) -> None:
+        """复制槽位中的记录前缀，由记录存储在覆盖或释放槽位前调用"""
+        self._data = ctypes.string_at(ctypes.addressof(self._store.buffer) + self._offset, RECORD_PREFIX)
+
+    def _snapshot(self) -> bytes:
+        """该对象所依据的记录前缀"""
+        data = self._data
+        if data is None:
+            copy = ctypes.string_at(ctypes.addressof(self._store.buffer) + self._offset, RECORD_PREFIX)
+            data = self._data
+            if data is None:
+                return copy
+        return data
+
+    def _with_result(self, result: int) -> "DeviceInfo":
+        """复制设备信息并替换消息类型，用于生成合成事件
+
+        Args:
+            result: 新的消息类型
+
+        Returns:
+            DeviceInfo: 新的设备信息对象
+        """
+        data = bytearray(self._snapshot())
+        _RESULT_DECODER.pack_into(data, RESULT_OFFSET, result)
+        device_info = DeviceInfo.__new__(DeviceInfo)
+        device_info._store = None
+        device_info._offset = 0
+        device_info._data = bytes(data)
+        device_info._cache = None if self._cache is None else dict(self._cache)
+        device_info._changed_fields = None
+        return device_info
+
+    def raw_value(self, name: str) -> Union[int, bytes]:
+        """获取字段未解码的原始值
+
+        Args:
+            name: DeviceInfo字段名，例如 "ipv4_address"
+
+        Returns:
+            Union[int, bytes]: 数值字段为整数；字符串字段为结构体中的定长原始字节(含结尾的NUL填充)，不解码为str
+
+        Raises:
+            AttributeError: 字段名不存在
+        """
+        try:
+            field = _FIELDS[name]
+        except KeyError:
+            raise AttributeError(f"DeviceInfo没有字段: {name}") from None
+        return field.raw(self)
+
+    @property
+    def changed_fields(self) -> Optional[FrozenSet[str]]:
+        """相对该设备上一条记录发生变化的字段名，例如 {"ipv4_address", "activated"}
+
+        设备首次出现（或下线后重新出现）时为None
+        """
+        return self._changed_fields
+
+    @property
+    def _raw(self) -> SADP_DEVICE_INFO_V40:
+        """该对象所依据的原始记录（副本），字段之后的保留字节为0"""
+        return SADP_DEVICE_INFO_V40.from_buffer_copy(self._snapshot().ljust(ctypes.sizeof(SADP_DEVICE_INFO_V40), b"\0"))
 
     def __eq__(self, value):
         if not isinstance(value, DeviceInfo):
             return False
         return self.mac == value.mac
+
+    def __hash__(self):
+        return hash(self.mac)
     
     def __str__(self):
         return f"ip:'{self.ipv4_address}', mac:'{self.mac}', serial_no:'{self.serial_no}',  {'未激活' if self.activated else '已激活' }"
-    
\ No newline at end of file
+
+
+_FIELDS: Dict[str, _Field] = {}
+for _name, _path in DEVICE_INFO_FIELDS.items():
+    _offset, _type = field_layout(SADP_DEVICE_INFO_V40, _path)
+    _FIELDS[_name] = (_StrField if issubclass(_type, ctypes.Array) else _Field)(
+        _name, _offset, struct.Struct("=" + field_format(_type)))
+    setattr(DeviceInfo, _name, _FIELDS[_name])
@@ -0,0 +1,604 @@
+"""
+SADP组播协议后端模块
+
+不依赖Sadp.dll，直接以asyncio数据报端点收发SADP组播报文(UDP 37020，组播地址239.255.255.250)：
+定时发出inquiry探测，把设备应答的ProbeMatch转换为SADP_DEVICE_INFO_V40交给SADP回调，
+与DLL路径得到相同的DeviceInfo与错误码。所有网卡的收发在同一个事件循环线程中完成。
+
+注意: 真实设备激活/修改网络参数时要求先以getencryptstring交换密钥并加密密码，
+本模块未实现该加密流程。默认拒绝激活与修改(错误码2041)，不会把明文密码发到组播组；
+只有在本机回环网卡上配合SADPResponder测试时，才应以allow_plaintext_password=True显式开启
+"""
+
+import asyncio
+import ctypes
+import logging
+import socket
+import sys
+import threading
+import uuid
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .backend import SADPBackend, deref
+from .base import SADP_DEVICE_INFO_V40, SADP_DEV_NET_PARAM, SADP_DEV_RET_NET_PARAM, SADP_ADD, SADP_DEC, \
+    SADP_UPDATE, SADP_RESTART
+from .model import DEVICE_INFO_FIELDS, DeviceInfo, field_layout
+from .registry import normalize_mac
+
+logger = logging.getLogger(__name__)
+
+SADP_PORT = 37020
+"""SADP组播端口"""
+
+SADP_MULTICAST_GROUP = "239.255.255.250"
+"""SADP组播地址"""
+
+_SADP_NOT_START_ERROR = 2002
+_SADP_SYSTEM_CALL_ERROR = 2008
+_SADP_DENY_OR_TIMEOUT_ERROR = 2009
+_SADP_TIMEOUT = 2011
+_SADP_CREATE_SOCKET_ERROR = 2012
+_SADP_BIND_SOCKET_ERROR = 2013
+_SADP_JOIN_MULTI_CAST_ERROR = 2014
+_SADP_XML_PARSE_ERROR = 2017
+_SADP_GET_EXCHANGE_CODE_ERROR = 2041
+
+# 应答中的Result -> SDK错误码，0为成功
+RESULT_CODES: Dict[str, int] = {
+    "success": 0,
+    "deny": 2009,
+    "timeout": 2011,
+    "locked": 2018,
+    "notactivated": 2019,
+    "riskpassword": 2020,
+    "activated": 2021,
+    "passworderror": 2024,
+}
+
+# ProbeMatch标签 -> DeviceInfo属性名
+DEVICE_TAGS: Tuple[Tuple[str, str], ...] = (
+    ("DeviceType", "device_type"),
+    ("DeviceDescription", "dev_desc"),
+    ("DeviceSN", "serial_no"),
+    ("CommandPort", "port"),
+    ("HttpPort", "http_port"),
+    ("MAC", "mac"),
+    ("IPv4Address", "ipv4_address"),
+    ("IPv4SubnetMask", "ipv4_subnet_mask"),
+    ("IPv4Gateway", "ipv4_gateway"),
+    ("IPv6Address", "ipv6_address"),
+    ("IPv6Gateway", "ipv6_gateway"),
+    ("IPv6MaskLen", "ipv6_mask_len"),
+    ("DHCP", "dhcp_enabled"),
+    ("AnalogChannelNum", "number_of_encoders"),
+    ("DigitalChannelNum", "digital_channel_num"),
+    ("SoftwareVersion", "device_software_version"),
+    ("DSPVersion", "dsp_version"),
+    ("BootTime", "boot_time"),
+    ("DiskNumber", "number_of_hard_disk"),
+    ("OEMInfo", "oem_info"),
+    ("Activated", "activated"),
+    ("SDKOverTLSPort", "sdk_over_tls_port"),
+)
+
+# 修改网络参数请求的标签 -> SADP_DEV_NET_PARAM字段名
+NET_PARAM_TAGS: Tuple[Tuple[str, str], ...] = (
+    ("IPv4Address", "szIPv4Address"),
+    ("IPv4SubnetMask", "szIPv4SubNetMask"),
+    ("IPv4Gateway", "szIPv4Gateway"),
+    ("IPv6Address", "szIPv6Address"),
+    ("IPv6Gateway", "szIPv6Gateway"),
+    ("IPv6MaskLen", "byIPv6MaskLen"),
+    ("CommandPort", "wPort"),
+    ("HttpPort", "wHttpPort"),
+    ("DHCP", "byDhcpEnable"),
+    ("SDKOverTLSPort", "dwSDKOverTLSPort"),
+)
+
+_BOOL_FIELDS = frozenset({"dhcp_enabled", "activated", "byDhcpEnable"})
+
+# (标签, 属性名, 偏移, ctypes类型)
+_DEVICE_LAYOUT = [(tag, name, *field_layout(SADP_DEVICE_INFO_V40, DEVICE_INFO_FIELDS[name])) for tag, name in DEVICE_TAGS]
+
+
+def new_uuid() -> str:
+    """生成报文Uuid"""
+    return str(uuid.uuid4()).upper()
+
+
+def build_message(root: str, fields: Iterable[Tuple[str, Any]]) -> bytes:
+    """构造SADP报文
+
+    Args:
+        root: 根节点，请求为"Probe"，应答为"ProbeMatch"
+        fields: (标签, 值)，bool转换为true/false
+
+    Returns:
+        bytes: UTF-8编码的XML报文
+    """
+    parts = ['<?xml version="1.0" encoding="utf-8"?>', f"<{root}>"]
+    for tag, value in fields:
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        parts.append(f"<{tag}>{escape(str(value))}</{tag}>")
+    parts.append(f"</{root}>")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_message(data: bytes) -> Optional[Tuple[str, Dict[str, str]]]:
+    """解析SADP报文
+
+    Args:
+        data: 收到的数据报
+
+    Returns:
+        Optional[Tuple[str, Dict[str, str]]]: (根节点, 标签 -> 文本)，不是合法报文时为None
+    """
+    # 不接受DTD，避免实体展开
+    if b"<!" in data:
+        return None
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return None
+    return root.tag, {child.tag: (child.text or "").strip() for child in root}
+
+
+def _parse_int(text: str) -> int:
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return int(lowered == "true")
+    return int(text, 0)
+
+
+def record_from_fields(fields: Dict[str, str]) -> SADP_DEVICE_INFO_V40:
+    """ProbeMatch转换为SADP_DEVICE_INFO_V40，缺少或无法解析的字段保持为0
+
+    Args:
+        fields: parse_message()得到的标签 -> 文本
+
+    Returns:
+        SADP_DEVICE_INFO_V40: 回调记录，iResult由调用方设置
+    """
+    record = SADP_DEVICE_INFO_V40()
+    address = ctypes.addressof(record)
+    for tag, name, offset, field_type in _DEVICE_LAYOUT:
+        text = fields.get(tag)
+        if text is None:
+            continue
+        if issubclass(field_type, ctypes.Array):
+            raw = text.encode("utf-8")[:ctypes.sizeof(field_type) - 1]
+            ctypes.memmove(address + offset, raw, len(raw))
+            continue
+        try:
+            value = _parse_int(text)
+        except ValueError:
+            continue
+        if name == "activated":
+            # 报文中true为已激活，结构体中0为已激活
+            value = 0 if value else 1
+        field_type.from_buffer(record, offset).value = value
+    record.byDataFromMulticast = 1
+    return record
+
+
+def device_fields(device_info: DeviceInfo) -> List[Tuple[str, Any]]:
+    """设备信息转换为ProbeMatch字段，record_from_fields()的逆操作"""
+    fields: List[Tuple[str, Any]] = []
+    for tag, name in DEVICE_TAGS:
+        value = getattr(device_info, name)
+        if name == "activated":
+            value = value == 0
+        elif name in _BOOL_FIELDS:
+            value = bool(value)
+        fields.append((tag, value))
+    return fields
+
+
+def net_param_fields(net_param: SADP_DEV_NET_PARAM) -> List[Tuple[str, Any]]:
+    """网络参数结构体转换为修改请求字段"""
+    fields: List[Tuple[str, Any]] = []
+    for tag, name in NET_PARAM_TAGS:
+        value = getattr(net_param, name)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", errors="ignore")
+        elif name in _BOOL_FIELDS:
+            value = bool(value)
+        fields.append((tag, value))
+    return fields
+
+
+def net_param_from_fields(fields: Dict[str, str]) -> SADP_DEV_NET_PARAM:
+    """修改请求字段转换为网络参数结构体，net_param_fields()的逆操作"""
+    net_param = SADP_DEV_NET_PARAM()
+    for tag, name in NET_PARAM_TAGS:
+        text = fields.get(tag)
+        if text is None:
+            continue
+        if isinstance(getattr(net_param, name), bytes):
+            setattr(net_param, name, text.encode("utf-8")[:getattr(SADP_DEV_NET_PARAM, name).size - 1])
+        else:
+            try:
+                setattr(net_param, name, _parse_int(text))
+            except ValueError:
+                pass
+    return net_param
+
+
+def response_code(fields: Optional[Dict[str, str]]) -> int:
+    """应答转换为SDK错误码，0为成功，未收到应答为超时"""
+    if fields is None:
+        return _SADP_TIMEOUT
+    return RESULT_CODES.get(fields.get("Result", "").lower(), _SADP_DENY_OR_TIMEOUT_ERROR)
+
+
+def open_multicast_socket(interface: str, group: str, port: int) -> socket.socket:
+    """创建加入组播组的UDP套接字
+
+    同一主机上的多个套接字可同时绑定该端口，均能收到组播报文
+
+    Args:
+        interface: 本机网卡IPv4地址，"0.0.0.0"为系统默认网卡
+        group: 组播地址
+        port: 端口
+
+    Returns:
+        socket.socket: 非阻塞套接字
+
+    Raises:
+        OSError: 附带errno之外的sadp_error属性，为对应的SDK错误码
+    """
+    stage = _SADP_CREATE_SOCKET_ERROR
+    sock = None
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            # 大量设备同时应答时避免接收缓冲区溢出，系统上限较小时保持默认
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        except OSError:
+            pass
+        stage = _SADP_BIND_SOCKET_ERROR
+        sock.bind(("", port))
+        stage = _SADP_JOIN_MULTI_CAST_ERROR
+        local = socket.inet_aton(interface)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, socket.inet_aton(group) + local)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, local)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        if sys.platform.startswith("linux"):
+            # IP_MULTICAST_ALL=0：只接收本套接字加入的组播组，多网卡时各套接字互不串扰
+            sock.setsockopt(socket.IPPROTO_IP, getattr(socket, "IP_MULTICAST_ALL", 49), 0)
+        sock.setblocking(False)
+        return sock
+    except OSError as e:
+        if sock is not None:
+            sock.close()
+        e.sadp_error = stage
+        raise
+
+
+class DatagramEndpoint(asyncio.DatagramProtocol):
+    """把收到的数据报交给处理函数"""
+
+    def __init__(self, handler: Callable[[bytes, Tuple[str, int]], None]) -> None:
+        self._handler = handler
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self._handler(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"SADP组播收发错误: {exc}")
+
+
+class MulticastSADP(SADPBackend):
+    """纯Python的SADP组播协议后端，可作为backend传给SADP
+
+    激活与修改需要allow_plaintext_password=True，否则返回错误码2041且不发送报文
+
+    Example:
+        >>> sadp = SADP(backend=MulticastSADP(interfaces=["192.168.1.10", "10.0.0.10"]))
+        >>> sadp.start()
+    """
+
+    version: int = 0x01000000
+    """SADP_GetSadpVersion返回的协议实现版本号(V1.0.0.0)"""
+
+    def __init__(self, interfaces: Iterable[str] = ("0.0.0.0",), group: str = SADP_MULTICAST_GROUP,
+                 port: int = SADP_PORT, timeout: float = 3.0, interval: int = 10, offline_after: int = 3,
+                 inquiry_delay: float = 0.2, allow_plaintext_password: bool = False) -> None:
+        """初始化
+
+        Args:
+            interfaces: 收发报文的本机网卡IPv4地址，每个网卡一个套接字，共用一个事件循环线程
+            group: 组播地址
+            port: 端口
+            timeout: 激活/修改等待设备应答的时间(秒)，超时错误码为2011
+            interval: 自动搜索间隔(秒)，0为只在开始时搜索一次，可由SADP_SetAutoRequestInterval修改
+            offline_after: 设备连续几轮自动搜索未应答视为下线
+            inquiry_delay: 激活/修改成功后延迟多久(秒)发出一次搜索，期间的成功操作共用这次搜索
+            allow_plaintext_password: 是否允许激活/修改时以明文发送密码。未实现密码加密交换，
+                明文密码会被同一网段的任何主机收到，只应在本机回环网卡上配合SADPResponder测试时开启
+        """
+        self.interfaces = list(interfaces)
+        self.group = group
+        self.port = port
+        self.timeout = timeout
+        self.interval = interval
+        self.offline_after = offline_after
+        self.inquiry_delay = inquiry_delay
+        self.allow_plaintext_password = allow_plaintext_password
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._transports: List[asyncio.DatagramTransport] = []
+        self._probe_handle: Optional[asyncio.TimerHandle] = None
+        self._inquiry_handle: Optional[asyncio.TimerHandle] = None
+        self._callback = None
+        self._user_data = None
+        self._round = 0
+        # 规范化MAC -> (最近应答的搜索轮次, 最近一条记录)，只在事件循环线程中访问
+        self._devices: Dict[str, Tuple[int, SADP_DEVICE_INFO_V40]] = {}
+        # 已判定下线的设备，再次应答时与DLL一致以SADP_RESTART上报
+        self._offline: Set[str] = set()
+        # 请求Uuid -> 等待应答的Future
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._errors = threading.local()
+
+    def _fail(self, error_code: int) -> int:
+        self._errors.code = error_code
+        return 0
+
+    def _succeed(self) -> int:
+        self._errors.code = 0
+        return 1
+
+    # ---- SDK接口 ----
+
+    def SADP_Start_V40(self, callback, user_data=None) -> int:
+        if self._thread is not None:
+            return self._fail(_SADP_DENY_OR_TIMEOUT_ERROR)
+        self._callback = callback
+        self._user_data = user_data
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="pysadp-multicast", daemon=True)
+        thread.start()
+        error_code = asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+        if error_code:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            return self._fail(error_code)
+        self._loop, self._thread = loop, thread
+        return self._succeed()
+
+    def SADP_Stop(self) -> int:
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return self._fail(_SADP_NOT_START_ERROR)
+        self._loop = None
+        if thread is threading.current_thread():
+            # 在回调中停止：关闭后由事件循环自行退出
+            self._close()
+            loop.stop()
+        else:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._thread = None
+        return self._succeed()
+
+    def SADP_GetSadpVersion(self) -> int:
+        return self.version
+
+    def SADP_SetAutoRequestInterval(self, interval: int) -> int:
+        self.interval = int(interval)
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._schedule_probe)
+        return self._succeed()
+
+    def SADP_GetLastError(self) -> int:
+        return getattr(self._errors, "code", 0)
+
+    def SADP_ActivateDevice(self, serial_no: bytes, password: bytes) -> int:
+        error_code = self._call(self.activate(serial_no.decode("utf-8"), password.decode("utf-8")))
+        return self._fail(error_code) if error_code else self._succeed()
+
+    def SADP_ModifyDeviceNetParam_V40(self, mac: bytes, password: bytes, net_param, ret_net_param,
+                                      ret_size: int) -> int:
+        ret: SADP_DEV_RET_NET_PARAM = deref(ret_net_param)
+        result = self._call(self.modify(mac.decode("utf-8"), password.decode("utf-8"), deref(net_param)))
+        if isinstance(result, int):
+            return self._fail(result)
+        error_code, ret.byRetryModifyTime, ret.bySurplusLockTime = result
+        return self._fail(error_code) if error_code else self._succeed()
+
+    def _call(self, coroutine):
+        """在事件循环线程中执行协程并等待结果，未启动或在回调线程中调用时返回错误码"""
+        loop = self._loop
+        if loop is None:
+            coroutine.close()
+            return _SADP_NOT_START_ERROR
+        if threading.current_thread() is self._thread:
+            # 在回调中同步等待应答会阻塞事件循环，应改用 submit_* 或 activate_many
+            coroutine.close()
+            logger.error("不能在SADP回调线程中同步激活或修改设备")
+            return _SADP_SYSTEM_CALL_ERROR
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    # ---- 协程接口，在事件循环线程中执行 ----
+
+    async def activate(self, serial_no: str, password: str) -> int:
+        """激活设备
+
+        Args:
+            serial_no: 设备序列号
+            password: 密码
+
+        Returns:
+            int: SDK错误码，0为成功；未开启allow_plaintext_password时为2041
+        """
+        if not self._plaintext_allowed():
+            return _SADP_GET_EXCHANGE_CODE_ERROR
+        response = await self._request([("Types", "activate"), ("DeviceSN", serial_no), ("Password", password)])
+        error_code = response_code(response)
+        if not error_code:
+            self._inquire_soon()
+        return error_code
+
+    async def modify(self, mac: str, password: str, net_param: SADP_DEV_NET_PARAM) -> Tuple[int, int, int]:
+        """修改网络参数
+
+        Args:
+            mac: 设备MAC地址
+            password: 密码
+            net_param: 网络参数
+
+        Returns:
+            Tuple[int, int, int]: (SDK错误码, 剩余尝试次数, 剩余锁定时间(分钟))，错误码0为成功；
+                未开启allow_plaintext_password时错误码为2041
+        """
+        if not self._plaintext_allowed():
+            return _SADP_GET_EXCHANGE_CODE_ERROR, 0, 0
+        response = await self._request([("Types", "update"), ("MAC", mac), ("Password", password),
+                                         *net_param_fields(net_param)])
+        error_code = response_code(response)
+        if not error_code:
+            self._inquire_soon()
+        response = response or {}
+        try:
+            retry = min(255, int(response.get("RetryModifyTime", 0)))
+            lock = min(255, int(response.get("SurplusLockTime", 0)))
+        except ValueError:
+            return _SADP_XML_PARSE_ERROR, 0, 0
+        return error_code, retry, lock
+
+    def _plaintext_allowed(self) -> bool:
+        """是否允许以明文发送密码，不允许时记录错误日志"""
+        if not self.allow_plaintext_password:
+            logger.error("组播后端未实现密码加密交换，拒绝以明文发送密码；"
+                         "仅在本机配合SADPResponder测试时设置allow_plaintext_password=True")
+        return self.allow_plaintext_password
+
+    async def _open(self) -> int:
+        """在每个网卡上打开组播端点并发出第一轮搜索，返回SDK错误码"""
+        loop = asyncio.get_running_loop()
+        for interface in self.interfaces:
+            try:
+                sock = open_multicast_socket(interface, self.group, self.port)
+            except OSError as e:
+                logger.error(f"打开网卡 {interface} 的SADP组播端口失败: {e}")
+                self._close()
+                return getattr(e, "sadp_error", _SADP_CREATE_SOCKET_ERROR)
+            transport, _ = await loop.create_datagram_endpoint(lambda: DatagramEndpoint(self._on_datagram), sock=sock)
+            self._transports.append(transport)
+        self._probe()
+        return 0
+
+    def _close(self) -> None:
+        for handle in (self._probe_handle, self._inquiry_handle):
+            if handle is not None:
+                handle.cancel()
+        self._probe_handle = self._inquiry_handle = None
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+        # 等待中的请求按超时返回
+        for waiter in self._waiters.values():
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+        self._devices.clear()
+        self._offline.clear()
+
+    async def _shutdown(self) -> None:
+        """关闭端点，并等待进行中的请求返回"""
+        self._close()
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _send(self, message: bytes) -> None:
+        for transport in self._transports:
+            transport.sendto(message, (self.group, self.port))
+
+    def _inquire(self) -> None:
+        """发出一次搜索，不计入自动搜索轮次"""
+        self._send(build_message("Probe", [("Uuid", new_uuid()), ("Types", "inquiry")]))
+
+    def _inquire_soon(self) -> None:
+        """激活/修改成功后尽快搜索以获取设备新状态，短时间内的多次操作合并为一次搜索"""
+        if self._inquiry_handle is None and self._transports:
+            self._inquiry_handle = asyncio.get_running_loop().call_later(self.inquiry_delay, self._delayed_inquiry)
+
+    def _delayed_inquiry(self) -> None:
+        self._inquiry_handle = None
+        self._inquire()
+
+    def _probe(self) -> None:
+        """一轮自动搜索：先判定下线设备，再发出搜索"""
+        self._round += 1
+        expired = [key for key, (seen, _) in self._devices.items() if seen < self._round - self.offline_after]
+        for key in expired:
+            _, record = self._devices.pop(key)
+            self._offline.add(key)
+            self._emit(record, SADP_DEC)
+        self._inquire()
+        self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+        if self.interval > 0 and self._transports:
+            self._probe_handle = asyncio.get_running_loop().call_later(self.interval, self._probe)
+
+    async def _request(self, fields: List[Tuple[str, Any]]) -> Optional[Dict[str, str]]:
+        """发出请求并等待Uuid相同的应答，超时返回None"""
+        request_id = new_uuid()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[request_id] = waiter
+        try:
+            self._send(build_message("Probe", [("Uuid", request_id), *fields]))
+            return await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.pop(request_id, None)
+
+    def _on_datagram(self, data: bytes, addr: Tuple[str, int]) -> None:
+        message = parse_message(data)
+        # 组播回环会收到本机发出的Probe，只处理应答
+        if message is None or message[0] not in ("ProbeMatch", "Hello"):
+            return
+        fields = message[1]
+        if fields.get("Types", "").lower() in ("activate", "update"):
+            waiter = self._waiters.get(fields.get("Uuid", "").upper())
+            if waiter is not None and not waiter.done():
+                waiter.set_result(fields)
+            return
+        mac = fields.get("MAC")
+        if not mac:
+            return
+        record = record_from_fields(fields)
+        key = normalize_mac(mac)
+        if key in self._devices:
+            result = SADP_UPDATE
+        elif key in self._offline:
+            self._offline.discard(key)
+            result = SADP_RESTART
+        else:
+            result = SADP_ADD
+        self._devices[key] = (self._round, record)
+        self._emit(record, result)
+
+    def _emit(self, record: SADP_DEVICE_INFO_V40, result: int) -> None:
+        record = SADP_DEVICE_INFO_V40.from_buffer_copy(record)
+        record.struSadpDeviceInfo.iResult = result
+        self._callback(ctypes.pointer(record), self._user_data)
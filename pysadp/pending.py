@@ -0,0 +1,154 @@
+"""
+待确认操作模块
+
+激活、修改网络参数等操作在SDK调用返回成功后，设备还需要一段时间才会在搜索消息中报告新状态。
+待确认操作表以MAC地址为键登记期望的设备状态，由设备事件分发路径在收到满足条件的消息时完成对应的Future，
+超过期限仍未确认的Future以TimeoutError结束
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base import SADP_DEC
+from .model import DeviceInfo
+from .registry import normalize_mac
+
+DevicePredicate = Callable[[DeviceInfo], bool]
+
+
+class OperationError(Exception):
+    """SDK调用失败，操作未被设备接受"""
+
+    def __init__(self, message: str, result: dict) -> None:
+        super().__init__(message)
+        self.result = result
+        """SDK调用结果，格式同 activate_many() / modify_device_net_param() 的返回值"""
+
+
+class _Pending:
+    __slots__ = ("key", "predicate", "future", "description")
+
+    def __init__(self, key: str, predicate: DevicePredicate, future: Future, description: str) -> None:
+        self.key = key
+        self.predicate = predicate
+        self.future = future
+        self.description = description
+
+
+class PendingOperations:
+    """待确认操作表，线程安全
+
+    设备事件到达时只需一次字典查找，没有待确认操作时开销可忽略；
+    超时由独立线程按最近的期限等待，有待确认操作时才运行
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, List[_Pending]] = {}
+        self._deadlines: List[Tuple[float, int, _Pending]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def expect(self, key: str, predicate: DevicePredicate, timeout: float, description: str = "") -> Future:
+        """登记一个待确认操作
+
+        Args:
+            key: 规范化后的MAC地址
+            predicate: 判断设备是否已达到期望状态的函数
+            timeout: 确认期限(秒)
+            description: 操作描述，用于超时信息
+
+        Returns:
+            Future: 确认时结果为设备信息；超时以TimeoutError结束
+        """
+        future: Future = Future()
+        entry = _Pending(key, predicate, future, description)
+        with self._cond:
+            self._entries.setdefault(key, []).append(entry)
+            heapq.heappush(self._deadlines, (time.monotonic() + timeout, next(self._counter), entry))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._expire, name="pysadp-pending", daemon=True)
+                self._thread.start()
+            else:
+                self._cond.notify()
+        return future
+
+    def _remove(self, entry: _Pending) -> bool:
+        """从表中移除，已移除则返回False，调用时需持有锁"""
+        entries = self._entries.get(entry.key)
+        if entries is None or entry not in entries:
+            return False
+        entries.remove(entry)
+        if not entries:
+            del self._entries[entry.key]
+        return True
+
+    @staticmethod
+    def _complete(future: Future, result: Optional[DeviceInfo] = None,
+                  exception: Optional[BaseException] = None) -> None:
+        # 已被调用方取消的Future不再设置结果
+        if future.set_running_or_notify_cancel():
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def fail(self, key: str, future: Future, exception: BaseException) -> None:
+        """以异常结束一个待确认操作，例如SDK调用失败时
+
+        Args:
+            key: 登记时的MAC地址
+            future: expect()返回的Future
+            exception: 异常
+        """
+        with self._cond:
+            entry = next((item for item in self._entries.get(key, ()) if item.future is future), None)
+            if entry is None or not self._remove(entry):
+                return
+        self._complete(future, exception=exception)
+
+    def resolve(self, device_info: DeviceInfo) -> None:
+        """用设备事件检查并完成对应设备的待确认操作，下线消息不作为确认
+
+        Args:
+            device_info: 设备信息
+        """
+        if not self._entries or device_info.result == SADP_DEC:
+            return
+        key = normalize_mac(device_info.mac)
+        done: List[_Pending] = []
+        with self._cond:
+            for entry in list(self._entries.get(key, ())):
+                if entry.predicate(device_info):
+                    self._remove(entry)
+                    done.append(entry)
+        for entry in done:
+            self._complete(entry.future, device_info)
+
+    def _expire(self) -> None:
+        """超时线程：按最近的期限等待，到期的操作以TimeoutError结束，表为空时退出"""
+        while True:
+            expired: List[_Pending] = []
+            with self._cond:
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, _, entry = heapq.heappop(self._deadlines)
+                    if self._remove(entry):
+                        expired.append(entry)
+                # 已确认操作的期限条目留在堆中，到期后直接丢弃
+                if not expired:
+                    if not self._entries:
+                        self._deadlines.clear()
+                        self._thread = None
+                        return
+                    self._cond.wait(self._deadlines[0][0] - now)
+                    continue
+            for entry in expired:
+                self._complete(entry.future, exception=TimeoutError(f"等待设备{entry.key}确认超时: {entry.description}"))
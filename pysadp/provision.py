@@ -0,0 +1,382 @@
+"""
+批量部署模块
+
+按部署计划(CSV、JSON或JSON Lines)逐台激活设备并修改网络参数，计划逐项读取，
+每一步的结果追加写入日志文件(JSON Lines)。中断后重新运行时跳过日志中已确认完成的步骤，只处理剩余设备
+"""
+
+import csv
+import json
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Set, Tuple, Union
+
+from .model import DeviceInfo
+from .pending import OperationError
+from .registry import normalize_mac
+
+logger = logging.getLogger(__name__)
+
+STEP_ACTIVATE = "activate"
+"""激活设备"""
+
+STEP_MODIFY = "modify"
+"""修改网络参数"""
+
+STATUS_CONFIRMED = "confirmed"
+"""设备已报告目标状态"""
+
+STATUS_FAILED = "failed"
+"""SDK调用失败"""
+
+STATUS_TIMEOUT = "timeout"
+"""SDK调用成功但设备未在期限内报告目标状态"""
+
+STATUS_MISSING = "missing"
+"""设备列表中找不到计划中的设备"""
+
+# 计划中的网络参数列 -> 类型，列名同 modify_device_net_param() 参数名
+PLAN_PARAMS = {
+    "ipv4_address": str,
+    "ipv4_subnet_mask": str,
+    "ipv4_gateway": str,
+    "port": int,
+    "http_port": int,
+    "ipv6_address": str,
+    "ipv6_gateway": str,
+    "ipv6_mask_len": int,
+    "dhcp_enable": bool,
+}
+
+
+class PlanEntry(NamedTuple):
+    """部署计划中的一台设备"""
+
+    key: str
+    """设备标识：规范化后的MAC地址或序列号，用于日志"""
+
+    mac: Optional[str]
+    """设备MAC地址(规范化后)"""
+
+    serial_no: Optional[str]
+    """设备序列号"""
+
+    params: Dict[str, Any]
+    """目标网络参数，参数名同 modify_device_net_param()"""
+
+
+def _parse_value(name: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    kind = PLAN_PARAMS[name]
+    if kind is bool and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return kind(value)
+
+
+def _plan_entry(row: Dict[str, Any], line: int) -> PlanEntry:
+    mac = row.get("mac") or None
+    serial_no = row.get("serial_no") or None
+    if mac is None and serial_no is None:
+        raise ValueError(f"部署计划第{line}项缺少mac或serial_no")
+    mac = normalize_mac(mac) if mac else None
+    params = {}
+    for name in PLAN_PARAMS:
+        value = _parse_value(name, row.get(name))
+        if value is not None:
+            params[name] = value
+    return PlanEntry(mac or serial_no, mac, serial_no, params)
+
+
+def _iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """逐个解析文件中JSON对象数组的元素，每次只读入一块数据
+
+    Args:
+        f: 文本文件对象
+        chunk_size: 每次读取的字符数
+
+    Yields:
+        Dict[str, Any]: 数组元素
+
+    Raises:
+        ValueError: 内容不是完整的JSON对象数组
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    # start: 等待"["；first: 等待第一个元素或"]"；value: 等待元素；next: 等待","或"]"
+    state = "start"
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("JSON部署计划不完整")
+            buffer, pos = f.read(chunk_size), 0
+            eof = not buffer
+            continue
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError("JSON部署计划必须为对象数组")
+            pos += 1
+            state = "first"
+        elif char == "]" and state in ("first", "next"):
+            return
+        elif state == "next":
+            if char != ",":
+                raise ValueError(f"JSON部署计划格式错误: {buffer[pos:pos + 20]!r}")
+            pos += 1
+            state = "value"
+        else:
+            if char != "{":
+                raise ValueError("JSON部署计划的元素必须为对象")
+            try:
+                row, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                # 对象跨越了块边界，读入下一块后重新解析
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield row
+            state = "next"
+
+
+def load_plan(path: str) -> Iterator[PlanEntry]:
+    """逐项读取部署计划，不把整个文件读入内存
+
+    CSV文件首行为列名；JSON文件为对象数组；JSON Lines文件每行一个对象。
+    列名/键名为 mac 或 serial_no(至少一个)，以及 PLAN_PARAMS 中的网络参数，空值表示不修改
+
+    Args:
+        path: 计划文件路径，按扩展名 .csv / .json / .jsonl 区分格式
+
+    Yields:
+        PlanEntry: 计划项
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield _plan_entry(row, line)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            for line, row in enumerate(_iter_json_array(f), start=1):
+                yield _plan_entry(row, line)
+    elif extension == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line, text in enumerate(f, start=1):
+                if text.strip():
+                    yield _plan_entry(json.loads(text), line)
+    else:
+        raise ValueError(f"不支持的部署计划格式: {path}")
+
+
+class ProvisionJournal:
+    """只追加的部署日志，每行一条JSON记录，写入后立即落盘"""
+
+    def __init__(self, path: str) -> None:
+        """打开日志文件，已存在时读取其中已确认的步骤
+
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+        self._confirmed: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 中断时可能留下不完整的最后一行
+                        continue
+                    if record.get("status") == STATUS_CONFIRMED:
+                        self._confirmed[(record["key"], record["step"])] = record.get("params")
+        self._file = open(path, "a", encoding="utf-8")
+
+    def confirmed(self, key: str, step: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """判断步骤是否已确认完成，修改步骤还需目标参数与日志中一致
+
+        Args:
+            key: 设备标识
+            step: 步骤
+            params: 修改步骤的目标参数
+
+        Returns:
+            bool: 是否已完成
+        """
+        if (key, step) not in self._confirmed:
+            return False
+        return step != STEP_MODIFY or self._confirmed[(key, step)] == params
+
+    def record(self, key: str, step: str, status: str, **detail: Any) -> None:
+        """追加一条记录
+
+        Args:
+            key: 设备标识
+            step: 步骤
+            status: 结果
+            **detail: 其它信息，例如 mac、params、error
+        """
+        record = {"time": datetime.now().isoformat(timespec="seconds"), "key": key, "step": step,
+                  "status": status, **detail}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if status == STATUS_CONFIRMED:
+                self._confirmed[(key, step)] = detail.get("params")
+
+    def close(self) -> None:
+        """关闭日志文件"""
+        self._file.close()
+
+    def __enter__(self) -> "ProvisionJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Provisioner:
+    """按部署计划批量激活设备并修改网络参数，可中断后续跑
+
+    Example:
+        >>> sadp.discover()
+        >>> with Provisioner(sadp, "abc123456", "provision.jsonl") as provisioner:
+        ...     summary = provisioner.run(load_plan("plan.csv"))
+    """
+
+    def __init__(self, sadp, password: str, journal: Union[str, ProvisionJournal], concurrency: int = 8,
+                 timeout: float = 60.0) -> None:
+        """初始化
+
+        Args:
+            sadp: 已开始搜索的SADP对象
+            password: 设备密码，未激活设备以此密码激活
+            journal: 日志文件路径或日志对象，传入路径时由close()关闭日志文件，传入日志对象时由调用方关闭
+            concurrency: 同时处理的设备数
+            timeout: 每一步等待设备报告目标状态的超时时间(秒)
+        """
+        if concurrency <= 0:
+            raise ValueError(f"并发数必须大于0: {concurrency}")
+        self.sadp = sadp
+        self.password = password
+        self._owns_journal = not isinstance(journal, ProvisionJournal)
+        self.journal = ProvisionJournal(journal) if self._owns_journal else journal
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def close(self) -> None:
+        """关闭由本对象打开的日志文件"""
+        if self._owns_journal:
+            self.journal.close()
+
+    def __enter__(self) -> "Provisioner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _find(self, entry: PlanEntry) -> Optional[DeviceInfo]:
+        if entry.mac is not None:
+            return self.sadp.devices.get(entry.mac)
+        return self.sadp.devices.first(serial_no=entry.serial_no)
+
+    def _step(self, entry: PlanEntry, step: str, device_info: DeviceInfo, submit) -> Tuple[Optional[DeviceInfo], str]:
+        """执行一步并记录结果，返回确认后设备的新状态(未确认为None)及结果"""
+        params = entry.params if step == STEP_MODIFY else None
+        try:
+            device_info = submit().result()
+        except OperationError as e:
+            self.journal.record(entry.key, step, STATUS_FAILED, mac=device_info.mac, params=params,
+                                error_code=e.result.get("error_code"), error=e.result.get("error_message"))
+            return None, STATUS_FAILED
+        except TimeoutError:
+            self.journal.record(entry.key, step, STATUS_TIMEOUT, mac=device_info.mac, params=params)
+            return None, STATUS_TIMEOUT
+        except Exception as e:
+            logger.exception(f"部署设备异常: {entry.key} {step}")
+            self.journal.record(entry.key, step, STATUS_FAILED, mac=device_info.mac, params=params,
+                                error_code=-1, error=str(e))
+            return None, STATUS_FAILED
+        self.journal.record(entry.key, step, STATUS_CONFIRMED, mac=device_info.mac, params=params)
+        return device_info, STATUS_CONFIRMED
+
+    def _completed(self, entry: PlanEntry) -> bool:
+        """日志中是否已确认计划项的全部步骤"""
+        if entry.params:
+            return self.journal.confirmed(entry.key, STEP_MODIFY, entry.params)
+        return self.journal.confirmed(entry.key, STEP_ACTIVATE)
+
+    def provision(self, entry: PlanEntry) -> str:
+        """处理一台设备
+
+        Args:
+            entry: 计划项
+
+        Returns:
+            str: 最后一步的结果，全部完成为confirmed
+        """
+        device_info = self._find(entry)
+        if device_info is None:
+            # 已完成的设备可能已改用新地址或不在当前网段，不再记为缺失
+            if self._completed(entry):
+                return STATUS_CONFIRMED
+            self.journal.record(entry.key, STEP_ACTIVATE, STATUS_MISSING)
+            return STATUS_MISSING
+        if not device_info.is_activated and not self.journal.confirmed(entry.key, STEP_ACTIVATE):
+            device_info, status = self._step(entry, STEP_ACTIVATE, device_info,
+                                             lambda: self.sadp.submit_activate(device_info, self.password,
+                                                                               self.timeout))
+            if device_info is None:
+                return status
+        if entry.params and not self.journal.confirmed(entry.key, STEP_MODIFY, entry.params):
+            device_info, status = self._step(entry, STEP_MODIFY, device_info,
+                                             lambda: self.sadp.submit_modify(device_info, self.password,
+                                                                             self.timeout, **entry.params))
+            if device_info is None:
+                return status
+        return STATUS_CONFIRMED
+
+    def run(self, plan: Iterable[PlanEntry]) -> Dict[str, str]:
+        """按计划处理全部设备，计划逐项读取，同时处理的设备数不超过concurrency
+
+        Args:
+            plan: 计划项，例如 load_plan() 的返回值
+
+        Returns:
+            Dict[str, str]: 设备标识 -> 结果(confirmed / failed / timeout / missing)
+        """
+        summary: Dict[str, str] = {}
+        slots = threading.BoundedSemaphore(self.concurrency)
+        keys: Set[str] = set()
+
+        def work(entry: PlanEntry) -> None:
+            try:
+                summary[entry.key] = self.provision(entry)
+            except Exception:
+                logger.exception(f"部署设备失败: {entry.key}")
+                summary[entry.key] = STATUS_FAILED
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pysadp-provision") as executor:
+            for entry in plan:
+                if entry.key in keys:
+                    logger.warning(f"部署计划中重复的设备: {entry.key}")
+                    continue
+                keys.add(entry.key)
+                slots.acquire()
+                executor.submit(work, entry)
+        failed = sum(1 for status in summary.values() if status != STATUS_CONFIRMED)
+        logger.info(f"部署完成，成功{len(summary) - failed}台，失败{failed}台")
+        return summary
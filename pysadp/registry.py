@@ -0,0 +1,435 @@
+"""
+设备注册表模块
+
+以规范化的MAC地址为键维护已发现设备，插入、更新、删除均为O(1)，
+并提供与原 device_list 列表兼容的只读视图
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union, overload
+
+from .base import SADP_DEC
+from .index import DeviceIndex
+from .model import DeviceInfo
+
+
+def normalize_mac(mac: str) -> str:
+    """规范化MAC地址，统一为小写并以'-'分隔
+
+    Args:
+        mac: MAC地址，例如 "AC-CB-51-12-34-56" 或 "ac:cb:51:12:34:56"
+
+    Returns:
+        str: 规范化后的MAC地址，例如 "ac-cb-51-12-34-56"
+    """
+    return mac.strip().lower().replace(":", "-")
+
+
+class InventoryDelta(NamedTuple):
+    """两个版本之间的设备清单变化"""
+
+    version: int
+    """变化截止的版本号，可作为下一次查询的起点"""
+
+    updated: List[DeviceInfo]
+    """新增或更新的设备，按变化先后倒序"""
+
+    removed: List[str]
+    """已删除设备的MAC地址（规范化后）"""
+
+    resync: bool = False
+    """起始版本过旧，部分删除记录已被淘汰：此时updated为全部当前设备、removed为空，调用方应以其替换本地副本"""
+
+
+class InventorySnapshot:
+    """设备清单的不可变快照
+
+    快照创建后内容不再变化，可在任意线程中无锁遍历。
+    """
+
+    version: int
+    """快照版本号，每次注册表变化递增"""
+
+    def __init__(self, version: int, devices: Dict[str, DeviceInfo], log: Dict[str, int], horizon: int = 0) -> None:
+        self.version = version
+        self._devices = devices
+        self._log = log
+        self._horizon = horizon
+        # 首次按下标访问时生成的设备列表，快照不变故只生成一次
+        self._items: Optional[List[DeviceInfo]] = None
+
+    def get(self, mac: str) -> Optional[DeviceInfo]:
+        """按MAC地址获取设备
+
+        Args:
+            mac: 设备MAC地址
+
+        Returns:
+            Optional[DeviceInfo]: 设备信息，不存在则为None
+        """
+        return self._devices.get(normalize_mac(mac))
+
+    def macs(self) -> List[str]:
+        """获取全部设备的MAC地址（规范化后）"""
+        return list(self._devices)
+
+    def changed_since(self, version: int) -> InventoryDelta:
+        """获取指定版本之后发生变化的设备
+
+        Args:
+            version: 起始版本号（不含），0表示全部
+
+        Returns:
+            InventoryDelta: 变化的设备与已删除的MAC地址；version早于已淘汰的删除记录时resync为True
+        """
+        if version < self._horizon:
+            return InventoryDelta(self.version, list(self._devices.values()), [], True)
+        updated: List[DeviceInfo] = []
+        removed: List[str] = []
+        # 变更记录按变化先后排列，倒序遍历到旧版本即可停止
+        for key, changed_version in reversed(self._log.items()):
+            if changed_version <= version:
+                break
+            device_info = self._devices.get(key)
+            if device_info is None:
+                removed.append(key)
+            else:
+                updated.append(device_info)
+        return InventoryDelta(self.version, updated, removed)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, DeviceInfo):
+            item = item.mac
+        if not isinstance(item, str):
+            return False
+        return normalize_mac(item) in self._devices
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[DeviceInfo]:
+        return iter(self._devices.values())
+
+    @overload
+    def __getitem__(self, index: int) -> DeviceInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[DeviceInfo]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[DeviceInfo, List[DeviceInfo]]:
+        items = self._items
+        if items is None:
+            items = self._items = list(self._devices.values())
+        return items[index]
+
+    def __repr__(self) -> str:
+        return f"InventorySnapshot(version={self.version}, devices={len(self._devices)})"
+
+
+class DeviceRegistry:
+    """已发现设备注册表
+
+    SDK回调线程写入，其它线程读取。写入采用写时复制：
+    有快照引用当前数据时，写入方先复制再修改，读取方持有的快照永不改变。
+    """
+
+    def __init__(self, max_offline: int = 0, max_tombstones: int = 1024) -> None:
+        """初始化注册表
+
+        Args:
+            max_offline: 保留的已下线设备记录数上限，超出时先淘汰下线最久的记录，0表示不保留
+            max_tombstones: 变更记录中保留的删除记录数，超出时淘汰最旧的删除记录，
+                早于被淘汰记录的版本调用changed_since将得到resync=True
+        """
+        self._devices: Dict[str, DeviceInfo] = {}
+        # 已下线设备，按下线先后排列
+        self._offline: "OrderedDict[str, DeviceInfo]" = OrderedDict()
+        self._max_offline = max_offline
+        # MAC -> 最近一次变化的版本号，按变化先后排列；已删除设备的记录即删除记录
+        self._log: Dict[str, int] = {}
+        self._tombstones = 0
+        self._max_tombstones = max_tombstones
+        # 已淘汰的删除记录中最新的版本号
+        self._horizon = 0
+        self._version = 0
+        self._snapshot: Optional[InventorySnapshot] = None
+        # 当前数据是否被快照引用
+        self._shared = False
+        self._index = DeviceIndex()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """当前版本号"""
+        return self._version
+
+    @property
+    def max_offline(self) -> int:
+        """保留的已下线设备记录数上限，0表示不保留"""
+        return self._max_offline
+
+    @max_offline.setter
+    def max_offline(self, value: int) -> None:
+        with self._lock:
+            self._max_offline = value
+            self._trim_offline()
+
+    def _trim_offline(self) -> None:
+        """淘汰超出上限的已下线设备记录，调用方需持有锁"""
+        while len(self._offline) > self._max_offline:
+            self._offline.popitem(last=False)
+
+    def _touch(self, key: str, removed: bool = False) -> None:
+        """记录一次变化，调用方需持有锁
+
+        Args:
+            key: 规范化后的MAC地址
+            removed: 是否为删除，删除时设备仍在self._devices中
+        """
+        if self._shared:
+            self._devices = dict(self._devices)
+            self._log = dict(self._log)
+            self._shared = False
+        self._version += 1
+        if self._log.pop(key, None) is not None and key not in self._devices:
+            self._tombstones -= 1
+        self._log[key] = self._version
+        if removed:
+            self._tombstones += 1
+            # 超出上限一倍时才压缩，压缩的O(n)代价分摊到每次删除
+            if self._tombstones > 2 * self._max_tombstones:
+                self._compact(key)
+
+    def _compact(self, removing: str) -> None:
+        """淘汰最旧的删除记录，只保留max_tombstones条，调用方需持有锁
+
+        Args:
+            removing: 正在删除、尚未移出self._devices的MAC地址
+        """
+        drop = self._tombstones - self._max_tombstones
+        log: Dict[str, int] = {}
+        for key, version in self._log.items():
+            if drop and (key not in self._devices or key == removing):
+                drop -= 1
+                self._horizon = version
+                continue
+            log[key] = version
+        self._log = log
+        self._tombstones = self._max_tombstones
+
+    def apply(self, device_info: DeviceInfo) -> Optional[DeviceInfo]:
+        """根据消息类型更新注册表
+
+        SADP_DEC 删除设备，SADP_ADD/SADP_UPDATE/SADP_RESTART/SADP_UPDATEFAIL 插入或覆盖设备
+
+        Args:
+            device_info: 回调收到的设备信息
+
+        Returns:
+            Optional[DeviceInfo]: 该MAC之前的设备信息，不存在则为None
+        """
+        key = normalize_mac(device_info.mac)
+        with self._lock:
+            if device_info.result == SADP_DEC:
+                previous = self._pop(key)
+                if previous is not None and self._max_offline:
+                    self._offline[key] = device_info
+                    self._trim_offline()
+                return previous
+            self._offline.pop(key, None)
+            previous = self._devices.get(key)
+            self._touch(key)
+            self._devices[key] = device_info
+            if previous is not None:
+                self._index.remove(key, previous)
+            self._index.add(key, device_info)
+            return previous
+
+    def _pop(self, key: str) -> Optional[DeviceInfo]:
+        """删除设备，调用方需持有锁"""
+        if key not in self._devices:
+            return None
+        self._touch(key, removed=True)
+        device_info = self._devices.pop(key)
+        self._index.remove(key, device_info)
+        return device_info
+
+    def get(self, mac: str) -> Optional[DeviceInfo]:
+        """按MAC地址获取设备
+
+        Args:
+            mac: 设备MAC地址，大小写及分隔符不限
+
+        Returns:
+            Optional[DeviceInfo]: 设备信息，不存在则为None
+        """
+        return self._devices.get(normalize_mac(mac))
+
+    def get_offline(self, mac: str) -> Optional[DeviceInfo]:
+        """按MAC地址获取已下线设备的最后一条记录
+
+        Args:
+            mac: 设备MAC地址
+
+        Returns:
+            Optional[DeviceInfo]: 下线消息的设备信息，不存在或已被淘汰则为None
+        """
+        return self._offline.get(normalize_mac(mac))
+
+    def offline(self) -> List[DeviceInfo]:
+        """获取保留的已下线设备，按下线先后排列
+
+        Returns:
+            List[DeviceInfo]: 设备列表
+        """
+        with self._lock:
+            return list(self._offline.values())
+
+    def remove(self, mac: str) -> Optional[DeviceInfo]:
+        """按MAC地址删除设备
+
+        Args:
+            mac: 设备MAC地址
+
+        Returns:
+            Optional[DeviceInfo]: 被删除的设备信息，不存在则为None
+        """
+        with self._lock:
+            return self._pop(normalize_mac(mac))
+
+    def clear(self) -> None:
+        """清空注册表"""
+        with self._lock:
+            for key in list(self._devices):
+                self._pop(key)
+            self._offline.clear()
+            self._index.clear()
+
+    def where(self, **criteria: Any) -> List[DeviceInfo]:
+        """按条件查询设备
+
+        serial_no、ipv4_address、dev_desc、base_desc、activated、is_activated、device_type 及 subnet
+        使用二级索引；条件值为list/tuple/set时表示任一匹配；其它参数名按DeviceInfo同名属性等值过滤。
+
+        Args:
+            **criteria: 查询条件，例如 is_activated=False, subnet="192.168.1.0/24"。
+                activated 为SDK原始值(0已激活，1未激活)，is_activated 为是否已激活(bool)，
+                subnet 为CIDR网段，匹配该网段内的IPv4地址
+
+        Returns:
+            List[DeviceInfo]: 满足全部条件的设备
+
+        Raises:
+            ValueError: activated 的条件值为bool，其真假与SDK原始值相反，应改用 is_activated
+
+        Example:
+            >>> sadp.devices.where(is_activated=False, subnet="192.168.1.0/24")
+        """
+        if "activated" in criteria:
+            value = criteria["activated"]
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+            if any(isinstance(item, bool) for item in values):
+                raise ValueError("activated 为SDK原始值(0已激活，1未激活)，按是否已激活查询请使用 is_activated")
+        with self._lock:
+            keys = self._index.query(criteria)
+            if keys is None:
+                candidates = list(self._devices.values())
+            else:
+                candidates = [self._devices[key] for key in keys]
+        extra = [(name, value) for name, value in criteria.items()
+                 if name != "subnet" and name not in self._index.indexed_fields]
+        if extra:
+            candidates = [device_info for device_info in candidates
+                          if all(getattr(device_info, name) == value for name, value in extra)]
+        return candidates
+
+    def first(self, **criteria: Any) -> Optional[DeviceInfo]:
+        """按条件查询第一个设备
+
+        Args:
+            **criteria: 查询条件，同 where()
+
+        Returns:
+            Optional[DeviceInfo]: 满足条件的设备，不存在则为None
+        """
+        result = self.where(**criteria)
+        return result[0] if result else None
+
+    def snapshot(self) -> InventorySnapshot:
+        """获取当前设备清单的不可变快照，O(1)
+
+        Returns:
+            InventorySnapshot: 当前版本的快照
+        """
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version:
+                self._snapshot = InventorySnapshot(self._version, self._devices, self._log, self._horizon)
+                self._shared = True
+            return self._snapshot
+
+    def changed_since(self, version: int) -> InventoryDelta:
+        """获取指定版本之后发生变化的设备
+
+        Args:
+            version: 起始版本号（不含），0表示全部
+
+        Returns:
+            InventoryDelta: 变化的设备与已删除的MAC地址
+        """
+        return self.snapshot().changed_since(version)
+
+    def values(self) -> List[DeviceInfo]:
+        """获取当前全部设备的列表
+
+        Returns:
+            List[DeviceInfo]: 设备列表
+        """
+        return list(self.snapshot())
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, DeviceInfo):
+            item = item.mac
+        if not isinstance(item, str):
+            return False
+        return normalize_mac(item) in self._devices
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[DeviceInfo]:
+        return iter(self.snapshot())
+
+
+class DeviceListView(Sequence):
+    """设备注册表的只读列表视图，兼容原 SADP.device_list 的遍历、索引与len()用法"""
+
+    def __init__(self, registry: DeviceRegistry) -> None:
+        self._registry = registry
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+    def __iter__(self) -> Iterator[DeviceInfo]:
+        return iter(self._registry.snapshot())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._registry
+
+    @overload
+    def __getitem__(self, index: int) -> DeviceInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[DeviceInfo]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[DeviceInfo, List[DeviceInfo]]:
+        # 同一版本的快照及其设备列表被缓存，注册表不变时按下标访问为O(1)
+        return self._registry.snapshot()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, DeviceListView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._registry.values())
@@ -0,0 +1,127 @@
+"""
+SADP应答端模块
+
+在本机组播端口上代替真实设备应答inquiry/activate/update请求，
+设备状态与激活、密码错误、锁定规则来自SimulatedSADP，用于在回环网卡上测试MulticastSADP
+"""
+
+import asyncio
+import ctypes
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import SADP_DEV_RET_NET_PARAM
+from .model import DeviceInfo
+from .multicast import (SADP_MULTICAST_GROUP, SADP_PORT, RESULT_CODES, DatagramEndpoint, build_message,
+                        device_fields, net_param_from_fields, open_multicast_socket, parse_message)
+from .simulator import SimulatedSADP, SADP_TIMEOUT
+
+_RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+
+class SADPResponder:
+    """模拟设备应答SADP组播请求
+
+    Example:
+        >>> async with SADPResponder(SimulatedSADP(devices=100), interface="127.0.0.1"):
+        ...     sadp = SADP(backend=MulticastSADP(interfaces=["127.0.0.1"], allow_plaintext_password=True))
+        ...     sadp.start()
+    """
+
+    def __init__(self, simulator: Optional[SimulatedSADP] = None, interface: str = "127.0.0.1",
+                 group: str = SADP_MULTICAST_GROUP, port: int = SADP_PORT, burst: int = 64) -> None:
+        """初始化
+
+        Args:
+            simulator: 虚拟设备，为None时创建10台默认设备，模拟器的latency与error_rate同样生效
+            interface: 收发报文的本机网卡IPv4地址
+            group: 组播地址
+            port: 端口
+            burst: 应答inquiry时每发出多少条报文让出一次事件循环，避免接收端缓冲区溢出
+        """
+        self.simulator = simulator if simulator is not None else SimulatedSADP(devices=10)
+        self.interface = interface
+        self.group = group
+        self.port = port
+        self.burst = burst
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._tasks: set = set()
+
+    async def start(self) -> None:
+        """打开组播端点开始应答
+
+        Raises:
+            OSError: 创建、绑定套接字或加入组播组失败
+        """
+        loop = asyncio.get_running_loop()
+        sock = open_multicast_socket(self.interface, self.group, self.port)
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: DatagramEndpoint(self._on_datagram),
+                                                                 sock=sock)
+
+    def close(self) -> None:
+        """停止应答"""
+        for task in self._tasks:
+            task.cancel()
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def __aenter__(self) -> "SADPResponder":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(self, fields: List[Tuple[str, Any]]) -> None:
+        if self._transport is not None:
+            self._transport.sendto(build_message("ProbeMatch", fields), (self.group, self.port))
+
+    def _on_datagram(self, data: bytes, addr: Tuple[str, int]) -> None:
+        message = parse_message(data)
+        # 组播回环会收到其它应答端的ProbeMatch，只处理请求
+        if message is None or message[0] != "Probe":
+            return
+        fields = message[1]
+        types = fields.get("Types", "").lower()
+        if types == "inquiry":
+            task = asyncio.ensure_future(self._answer_inquiry(fields.get("Uuid", "")))
+        elif types in ("activate", "update"):
+            task = asyncio.ensure_future(self._answer_operation(types, fields))
+        else:
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _answer_inquiry(self, request_id: str) -> None:
+        for i, record in enumerate(self.simulator.records()):
+            self._send([("Uuid", request_id), ("Types", "inquiry"), *device_fields(DeviceInfo(record))])
+            if (i + 1) % self.burst == 0:
+                await asyncio.sleep(0.001)
+
+    async def _answer_operation(self, types: str, fields: Dict[str, str]) -> None:
+        # 模拟器的往返耗时为阻塞调用，放到线程池中执行
+        response = await asyncio.get_running_loop().run_in_executor(None, self._operate, types, fields)
+        if response is not None:
+            self._send([("Uuid", fields.get("Uuid", "")), ("Types", types), *response])
+
+    def _operate(self, types: str, fields: Dict[str, str]) -> Optional[List[Tuple[str, Any]]]:
+        """执行激活或修改，返回应答字段；设备不存在或模拟超时时不应答"""
+        password = fields.get("Password", "").encode("utf-8")
+        if types == "activate":
+            serial_no = fields.get("DeviceSN", "")
+            success = self.simulator.SADP_ActivateDevice(serial_no.encode("utf-8"), password)
+            response: List[Tuple[str, Any]] = [("DeviceSN", serial_no)]
+        else:
+            mac = fields.get("MAC", "")
+            net_param = net_param_from_fields(fields)
+            ret_net_param = SADP_DEV_RET_NET_PARAM()
+            success = self.simulator.SADP_ModifyDeviceNetParam_V40(
+                mac.encode("utf-8"), password, ctypes.byref(net_param), ctypes.byref(ret_net_param),
+                ctypes.sizeof(ret_net_param))
+            response = [("MAC", mac), ("RetryModifyTime", ret_net_param.byRetryModifyTime),
+                        ("SurplusLockTime", ret_net_param.bySurplusLockTime)]
+        error_code = 0 if success else self.simulator.SADP_GetLastError()
+        if error_code == SADP_TIMEOUT:
+            return None
+        response.append(("Result", _RESULT_NAMES.get(error_code, "failed")))
+        return response
@@ -0,0 +1,146 @@
+"""
+接收环形缓冲区模块
+
+SDK回调线程只把原始结构体以memmove复制进固定大小的环形缓冲区，
+由独立的消费线程取出后解码、更新设备清单并分发用户回调
+"""
+
+import ctypes
+import threading
+from typing import Optional
+
+from .store import RECORD_SIZE, RecordSource, record_address
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+"""缓冲区满时丢弃最旧的记录"""
+
+OVERFLOW_BLOCK = "block"
+"""缓冲区满时阻塞写入方，直到有空位"""
+
+OVERFLOW_DROP = "drop"
+"""缓冲区满时丢弃新记录并计数"""
+
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK, OVERFLOW_DROP)
+
+
+class RecordRing:
+    """固定容量的原始记录环形缓冲区，单写单读"""
+
+    def __init__(self, capacity: int = 4096, overflow: str = OVERFLOW_DROP_OLDEST) -> None:
+        """初始化环形缓冲区
+
+        Args:
+            capacity: 可容纳的记录条数
+            overflow: 缓冲区满时的策略，drop_oldest / block / drop
+        """
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须大于0: {capacity}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"不支持的溢出策略: {overflow}，可选 {OVERFLOW_POLICIES}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self._slab = ctypes.create_string_buffer(capacity * RECORD_SIZE)
+        self._base = ctypes.addressof(self._slab)
+        # 写入与读取的累计序号，缓冲区中的记录为 [_tail, _head)
+        self._head = 0
+        self._tail = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        self.pushed = 0
+        """累计写入的记录数"""
+
+        self.dropped = 0
+        """因缓冲区满而丢弃的记录数"""
+
+        self.high_water = 0
+        """缓冲区中同时积压记录数的最大值"""
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push(self, src: RecordSource) -> bool:
+        """写入一条记录，在SDK回调线程中调用
+
+        Args:
+            src: SADP_DEVICE_INFO_V40结构体指针、实例或原始字节
+
+        Returns:
+            bool: 是否写入成功，drop策略下缓冲区满或缓冲区已关闭时为False
+        """
+        address = record_address(src)
+        with self._lock:
+            if self._closed:
+                return False
+            if self._head - self._tail >= self.capacity:
+                if self.overflow == OVERFLOW_DROP:
+                    self.dropped += 1
+                    return False
+                if self.overflow == OVERFLOW_DROP_OLDEST:
+                    self._tail += 1
+                    self.dropped += 1
+                else:
+                    while self._head - self._tail >= self.capacity and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        return False
+            slot = self._head % self.capacity
+            ctypes.memmove(self._base + slot * RECORD_SIZE, address, RECORD_SIZE)
+            self._head += 1
+            self.pushed += 1
+            size = self._head - self._tail
+            if size > self.high_water:
+                self.high_water = size
+            self._not_empty.notify()
+        return True
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """取出最旧的一条记录，在消费线程中调用
+
+        Args:
+            timeout: 缓冲区为空时的最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            Optional[bytes]: 记录的原始字节，超时或缓冲区已关闭且为空时为None
+        """
+        with self._lock:
+            if self._head == self._tail:
+                if self._closed:
+                    return None
+                self._not_empty.wait(timeout)
+                if self._head == self._tail:
+                    return None
+            slot = self._tail % self.capacity
+            # 持锁复制，避免drop_oldest策略下写入方覆盖正在读取的槽位
+            data = ctypes.string_at(self._base + slot * RECORD_SIZE, RECORD_SIZE)
+            self._tail += 1
+            self._not_full.notify()
+        return data
+
+    def close(self) -> None:
+        """关闭缓冲区，唤醒等待中的读写方，已写入的记录仍可取出"""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def stats(self) -> dict:
+        """获取缓冲区统计信息
+
+        Returns:
+            dict: 统计信息
+                - capacity: int，容量
+                - size: int，当前积压记录数
+                - high_water: int，积压记录数最大值
+                - pushed: int，累计写入数
+                - dropped: int，累计丢弃数
+        """
+        return {
+            "capacity": self.capacity,
+            "size": len(self),
+            "high_water": self.high_water,
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+        }
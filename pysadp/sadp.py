@@ -1,10 +1,24 @@
 import os
 import ctypes
 import logging
-from .model import DeviceInfo
-from typing import List, Optional,Callable
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from .model import DeviceInfo, record_mac, record_result, record_diff, record_equal
+from .registry import DeviceRegistry, DeviceListView, InventorySnapshot, InventoryDelta, normalize_mac
+from .store import RecordStore, RecordSource, record_address, record_buffer
+from .ring import RecordRing, OVERFLOW_DROP_OLDEST
+from .batch import BatchDispatcher
+from .filters import RecordFilter, FilterValue
+from .discovery import SettleDetector
+from .interval import AutoRequestController
+from .liveness import LivenessTracker
+from .backend import SADPBackend, load_sdk_library
+from .pending import PendingOperations, OperationError, DevicePredicate
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union, Callable
 from .sdk_errors import sdk_err_msg
-from .base import  SADP_DEV_NET_PARAM, SADP_DEV_RET_NET_PARAM, SADP_DEVICE_INFO_V40
+from .base import  SADP_DEV_NET_PARAM, SADP_DEV_RET_NET_PARAM, SADP_DEVICE_INFO_V40, SADP_ADD, SADP_DEC, SADP_UPDATE, SADP_RESTART
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -12,41 +26,85 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 logger.addHandler(handler)
 
+# modify_device_net_param参数名 -> 确认修改结果时比较的DeviceInfo属性名
+_NET_PARAM_FIELDS = {
+    "ipv4_address": "ipv4_address",
+    "ipv4_subnet_mask": "ipv4_subnet_mask",
+    "ipv4_gateway": "ipv4_gateway",
+    "port": "port",
+    "http_port": "http_port",
+    "ipv6_address": "ipv6_address",
+    "ipv6_gateway": "ipv6_gateway",
+    "ipv6_mask_len": "ipv6_mask_len",
+    "dhcp_enable": "dhcp_enabled",
+}
+
 class SADP:
     """海康威视SADP协议封装类"""
 
-    device_list: List[DeviceInfo] = []
-    """ 已发现设备列表 """
+    devices: DeviceRegistry
+    """ 已发现设备注册表，以MAC地址为键 """
+
+    device_list: DeviceListView
+    """ 已发现设备列表（注册表的只读视图） """
     
     sadp_data_callback:Optional[Callable[[DeviceInfo],None]] = None
     """ SADP数据回调函数 """
+
+    auto_request_interval: int
+    """ 当前自动搜索的时间间隔(秒) """
+
+    interval_controller: Optional[AutoRequestController] = None
+    """ 自动搜索间隔控制器，调用enable_adaptive_interval()后有效 """
+
+    suppressed_updates: int
+    """ 因内容与上一条记录相同而被忽略的设备更新消息数 """
     
-    def __init__(self,auto_request_interval: int = 10, sdk_path: str = None) -> None:
+    def __init__(self,auto_request_interval: int = 10, sdk_path: str = None,
+                 backend: Optional[SADPBackend] = None) -> None:
         """初始化SDK
         
         Args:
             auto_request_interval: 自动搜索的时间间隔，为0则不自动搜索，默认为10秒
             sdk_path: 自定义SDK文件路径
+            backend: SDK后端，为None时加载sdk_path下的Sadp.dll，例如 SimulatedSADP(devices=5000)
         
         """
 
-        dlls = ["libcrypto-1_1-x64.dll", "libssl-1_1-x64.dll", "Sadp.dll"]
         if sdk_path is None:
             self.sdk_path = os.path.join(os.path.dirname(__file__), "sdk")
         else:
             self.sdk_path = sdk_path
+        self.lib = backend if backend is not None else self._load_library()
 
-        for dll in dlls:
-            dll_path = os.path.join(self.sdk_path, dll)
-            if not os.path.exists(dll_path):
-                raise FileNotFoundError(f"未找到sadp库文件: {dll_path}")
-            lib = ctypes.CDLL(dll_path)
-            if dll == "Sadp.dll":
-                self.lib = lib
+        self.devices = DeviceRegistry()
+        self.device_list = DeviceListView(self.devices)
+        self._store = RecordStore()
+        self._ring: Optional[RecordRing] = None
+        self._consumer: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[DeviceInfo], None]] = []
+        self._unfiltered_listeners: List[Callable[[DeviceInfo], None]] = []
+        self._filter = RecordFilter()
+        self._running = False
+        self._ingest_lock = threading.Lock()
+        self._liveness: Optional[LivenessTracker] = None
+        self._liveness_stop = threading.Event()
+        self._liveness_thread: Optional[threading.Thread] = None
+        self._pending = PendingOperations()
+        self.auto_request_interval = auto_request_interval
+        self.suppressed_updates = 0
 
         self._set_auto_request_interval(auto_request_interval)
         
 
+    def _load_library(self):
+        """加载SDK动态库
+
+        Returns:
+            Sadp.dll库对象
+        """
+        return load_sdk_library(self.sdk_path)
+
     def call_func(self, func_name: str, *args) -> int:
         """调用SDK函数
         
@@ -77,10 +135,37 @@ class SADP:
         return f"V{a}.{b}.{c}.{d}"
     
     
-    def start(self) -> bool:
+    def snapshot(self) -> InventorySnapshot:
+        """获取已发现设备的不可变快照
+
+        快照获取为O(1)且不会阻塞SDK回调线程，遍历期间内容不会变化
+
+        Returns:
+            InventorySnapshot: 当前版本的设备快照
+        """
+        return self.devices.snapshot()
+
+    def changed_since(self, version: int) -> InventoryDelta:
+        """获取指定版本之后新增、更新或删除的设备
+
+        Args:
+            version: 上一次处理到的版本号，0表示全部
+
+        Returns:
+            InventoryDelta: 变化的设备、已删除的MAC地址及当前版本号
+        """
+        return self.devices.changed_since(version)
+
+    def start(self, ring_size: int = 0, overflow: str = OVERFLOW_DROP_OLDEST) -> bool:
         """开始sadp设备搜索
         
         Args:
+            ring_size: 接收环形缓冲区容量(条)，为0时在SDK回调线程中直接处理；
+                大于0时SDK回调线程只复制原始数据，由独立线程解码、更新设备列表并调用sadp_data_callback
+            overflow: 环形缓冲区满时的策略
+                - drop_oldest: 丢弃最旧的记录(默认)
+                - block: 阻塞SDK回调线程直到有空位
+                - drop: 丢弃新记录并计数
             
         Returns:
             bool: 是否启动成功
@@ -88,18 +173,22 @@ class SADP:
         
         PDEVICE_FIND_CALLBACK_V40 = ctypes.CFUNCTYPE(None, ctypes.POINTER(SADP_DEVICE_INFO_V40), ctypes.c_void_p)
         
-        # 内部回调包装函数
-        def internal_callback(lpDeviceInfoV40, pUserData):           
-            if lpDeviceInfoV40:
-                device_info = DeviceInfo(lpDeviceInfoV40.contents)
-                if device_info not in self.device_list:
-                    self.device_list.append(device_info)
-                else:
-                    self.device_list.remove(device_info)
-                    if device_info.result != 3:
-                        self.device_list.append(device_info)
-                if self.sadp_data_callback :
-                    self.sadp_data_callback(device_info)
+        if ring_size > 0:
+            ring = self._ring = RecordRing(ring_size, overflow)
+            self._consumer = threading.Thread(target=self._consume, args=(ring,), name="pysadp-ingest", daemon=True)
+            self._consumer.start()
+
+            # 内部回调包装函数，只复制原始数据
+            def internal_callback(lpDeviceInfoV40, pUserData):
+                if lpDeviceInfoV40:
+                    ring.push(lpDeviceInfoV40)
+        else:
+            # 内部回调包装函数
+            def internal_callback(lpDeviceInfoV40, pUserData):           
+                if lpDeviceInfoV40:
+                    ingested = self._ingest(lpDeviceInfoV40)
+                    if ingested is not None:
+                        self._dispatch(*ingested)
                 
         
         # 转换回调函数为C类型
@@ -112,9 +201,299 @@ class SADP:
         res = self.call_func("SADP_Start_V40", c_callback)
         if not res:
             self.print_error("启动SADP协议失败")
+            self._stop_consumer()
             return False
+        self._running = True
         return True
+
+    def discover(self, until: Union[str, int] = "settled", confidence: float = 0.95, min_time: float = 1.0,
+                 max_time: float = 60.0, min_quiet: float = 0.5) -> InventorySnapshot:
+        """搜索设备直到收敛，未启动时自动调用start()
+
+        按新设备上线消息的到达速率判断搜索是否完成：设备少时很快返回，设备多时持续等待到上线速率降下来
+
+        Args:
+            until: "settled" 按到达速率判定完成；整数则在发现的设备数达到该值时完成
+            confidence: 判定完成的置信度，取值(0, 1)，越大越不容易漏掉设备，等待也越久
+            min_time: 最短搜索时间(秒)
+            max_time: 最长搜索时间(秒)，无论是否收敛到时即返回
+            min_quiet: 判定收敛所需静默时间的下限(秒)
+
+        Returns:
+            InventorySnapshot: 搜索完成时的设备快照
+        """
+        if until != "settled" and not isinstance(until, int):
+            raise ValueError(f"不支持的完成条件: {until}")
+        detector = SettleDetector(confidence, min_quiet=min_quiet)
+        arrived = threading.Condition()
+
+        def listener(device_info: DeviceInfo) -> None:
+            if device_info.result in (SADP_ADD, SADP_RESTART):
+                with arrived:
+                    detector.observe(time.monotonic())
+                    arrived.notify()
+
+        self.add_listener(listener, filtered=False)
+        try:
+            start = time.monotonic()
+            detector.begin(start)
+            if not self._running and not self.start():
+                return self.snapshot()
+            with arrived:
+                while True:
+                    now = time.monotonic()
+                    if now - start >= max_time:
+                        break
+                    if until == "settled":
+                        if now - start >= min_time and detector.settled(now):
+                            break
+                        deadline = max(start + min_time, detector.settle_time())
+                    else:
+                        if len(self.devices) >= until:
+                            break
+                        deadline = start + max_time
+                    arrived.wait(min(deadline, start + max_time) - now)
+        finally:
+            self.remove_listener(listener)
+        logger.info(f"设备搜索完成，用时{time.monotonic() - start:.1f}秒，已发现设备数: {len(self.devices)}")
+        return self.snapshot()
+
+    def _consume(self, ring: RecordRing) -> None:
+        """消费线程：从环形缓冲区取出记录并处理，缓冲区关闭且取空后退出"""
+        while True:
+            data = ring.pop()
+            if data is None:
+                return
+            try:
+                ingested = self._ingest(data)
+                if ingested is not None:
+                    self._dispatch(*ingested)
+            except Exception:
+                logger.exception("处理设备数据失败")
+
+    def _stop_consumer(self) -> None:
+        """关闭环形缓冲区并等待消费线程处理完剩余记录"""
+        if self._ring is not None:
+            self._ring.close()
+        if self._consumer is not None:
+            self._consumer.join()
+        self._ring = None
+        self._consumer = None
+
+    def _dispatch(self, device_info: DeviceInfo, accepted: bool = True) -> None:
+        """分发设备数据给回调
+
+        待确认操作与不受过滤条件约束的监听函数总是收到事件，
+        sadp_data_callback及其它监听函数只收到满足过滤条件的事件
+
+        Args:
+            device_info: 设备信息
+            accepted: 原始记录是否满足过滤条件
+        """
+        self._pending.resolve(device_info)
+        for listener in self._unfiltered_listeners:
+            listener(device_info)
+        if not accepted:
+            return
+        if self.sadp_data_callback :
+            self.sadp_data_callback(device_info)
+        for listener in self._listeners:
+            listener(device_info)
+
+    def add_filter(self, field: str, value: FilterValue) -> None:
+        """添加原始数据过滤条件，多个条件之间为“且”关系
+
+        条件在构造设备信息之前按原始记录中的数值判断，不满足条件的事件不分发给sadp_data_callback
+        和add_listener()注册的监听函数，但仍会更新设备列表，设备下线、存活跟踪、待确认操作
+        以及discover()、on_change()、on_batch()、IPAllocator等库内部组件仍收到全部事件
+
+        Args:
+            field: DeviceInfo数值字段名，例如 "activated"、"result"、"device_type"
+            value: 字段值、值集合，或参数为字段值的判断函数
+
+        Example:
+            >>> sadp.add_filter("activated", 1)          # 只处理未激活设备
+            >>> sadp.add_filter("result", {1, 2, 4})     # 忽略下线消息
+        """
+        self._filter.add(field, value)
+
+    def clear_filters(self) -> None:
+        """清除全部原始数据过滤条件"""
+        self._filter.clear()
+
+    def add_listener(self, listener: Callable[[DeviceInfo], None], filtered: bool = True) -> None:
+        """注册设备数据监听函数，与sadp_data_callback在同一线程中依次调用
+
+        Args:
+            listener: 监听函数，参数为设备信息
+            filtered: 是否只接收满足add_filter()过滤条件的事件，
+                依赖完整设备状态的组件(如IPAllocator、AsyncSADP)传False以接收全部事件
+        """
+        # 写时复制，分发线程遍历期间不受影响
+        if filtered:
+            self._listeners = self._listeners + [listener]
+        else:
+            self._unfiltered_listeners = self._unfiltered_listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[DeviceInfo], None]) -> None:
+        """移除设备数据监听函数
+
+        按相等比较，绑定方法可直接传入重新取得的obj.method
+
+        Args:
+            listener: 已注册的监听函数
+        """
+        self._listeners = [item for item in self._listeners if item != listener]
+        self._unfiltered_listeners = [item for item in self._unfiltered_listeners if item != listener]
+
+    def on_change(self, callback: Callable[[DeviceInfo], None],
+                  fields: Optional[Iterable[str]] = None) -> Callable[[DeviceInfo], None]:
+        """注册设备变化回调，只在在线设备的字段值发生变化时调用（不含下线消息）
+
+        Args:
+            callback: 回调函数，参数为设备信息，可通过其changed_fields获取变化的字段
+            fields: 只关注的字段名，例如 ["ipv4_address", "activated"]，为None则任意字段变化均调用
+
+        Returns:
+            Callable[[DeviceInfo], None]: 已注册的监听函数，可传给remove_listener()取消
+        """
+        watched = frozenset(fields) if fields is not None else None
+
+        def listener(device_info: DeviceInfo) -> None:
+            changed = device_info.changed_fields
+            if changed and device_info.result != SADP_DEC and (watched is None or not watched.isdisjoint(changed)):
+                callback(device_info)
+
+        self.add_listener(listener, filtered=False)
+        return listener
+
+    def on_batch(self, callback: Callable[[List[DeviceInfo]], None], max_items: int = 500,
+                 max_delay_ms: int = 50) -> BatchDispatcher:
+        """注册批量回调，设备事件按MAC合并后成批投递
+
+        同一批次内同一设备只保留最新的事件，适合批量写入数据库或消息总线
+
+        Args:
+            callback: 批量回调函数，参数为设备事件列表，在独立线程中调用
+            max_items: 单批最多事件数，达到后立即投递
+            max_delay_ms: 第一条事件到达后最长等待时间(毫秒)
+
+        Returns:
+            BatchDispatcher: 批量投递对象，调用其close()并remove_listener()可取消
+        """
+        dispatcher = BatchDispatcher(callback, max_items, max_delay_ms)
+        self.add_listener(dispatcher, filtered=False)
+        return dispatcher
+
+    def ingest_stats(self) -> Optional[dict]:
+        """获取接收环形缓冲区统计信息
+
+        Returns:
+            Optional[dict]: 统计信息，未启用环形缓冲区时为None
+                - capacity: int，容量
+                - size: int，当前积压记录数
+                - high_water: int，积压记录数最大值
+                - pushed: int，累计写入数
+                - dropped: int，累计丢弃数
+        """
+        ring = self._ring
+        return ring.stats() if ring is not None else None
     
+    def _ingest(self, src: RecordSource) -> Optional[Tuple[DeviceInfo, bool]]:
+        """将一条原始记录复制进记录存储并更新注册表
+
+        已知设备的记录先与存储中的上一条记录比较：内容未变的更新消息直接忽略，
+        其它消息记录变化的字段
+
+        Args:
+            src: SADP_DEVICE_INFO_V40结构体指针、实例或原始字节
+
+        Returns:
+            Optional[Tuple[DeviceInfo, bool]]: 设备信息及原始记录是否满足过滤条件，被忽略的更新消息为None
+        """
+        # 原地读取与比较，被忽略的更新消息不复制数据
+        address = record_address(src)
+        buffer = record_buffer(address)
+        record_filter = self._filter
+        accepted = not record_filter or record_filter.matches(buffer)
+        key = normalize_mac(record_mac(buffer))
+        result = record_result(buffer)
+        with self._ingest_lock:
+            liveness = self._liveness
+            if liveness is not None:
+                if result == SADP_DEC:
+                    liveness.forget(key)
+                else:
+                    liveness.touch(key, time.monotonic())
+            changed_fields = None
+            slot = self._store.slot_of(key)
+            if slot is not None:
+                if record_equal(self._store.address(slot), address):
+                    if result == SADP_UPDATE:
+                        self.suppressed_updates += 1
+                        return None
+                    changed_fields = frozenset()
+                else:
+                    changed_fields = record_diff(self._store.view(slot), buffer)
+            slot = self._store.put(key, address)
+            device_info = DeviceInfo.from_store(self._store, slot, changed_fields)
+            self.devices.apply(device_info)
+            if result == SADP_DEC:
+                self._store.release(key)
+        return device_info, accepted
+
+    def enable_liveness(self, ttl: float = 180.0, tick: float = 1.0, max_offline: Optional[int] = None) -> None:
+        """启用设备存活跟踪
+
+        超过ttl秒未收到任何消息(含内容未变的更新消息)的设备判定为下线：
+        从设备列表移除，并以消息类型为SADP_DEC的合成事件分发给回调(在存活跟踪线程中调用)
+
+        Args:
+            ttl: 存活时间(秒)，应大于自动搜索间隔
+            tick: 检查节拍(秒)
+            max_offline: 保留的已下线设备记录数上限，超出时先淘汰下线最久的记录；None表示不修改当前设置
+        """
+        self.disable_liveness()
+        if max_offline is not None:
+            self.devices.max_offline = max_offline
+        tracker = LivenessTracker(ttl, tick)
+        now = time.monotonic()
+        for device_info in self.devices.snapshot():
+            tracker.touch(normalize_mac(device_info.mac), now)
+        stop = threading.Event()
+        self._liveness = tracker
+        self._liveness_stop = stop
+        self._liveness_thread = threading.Thread(target=self._check_liveness, args=(tracker, stop),
+                                                 name="pysadp-liveness", daemon=True)
+        self._liveness_thread.start()
+
+    def disable_liveness(self) -> None:
+        """停用设备存活跟踪"""
+        if self._liveness_thread is not None:
+            self._liveness_stop.set()
+            self._liveness_thread.join()
+        self._liveness = None
+        self._liveness_thread = None
+
+    def _check_liveness(self, tracker: LivenessTracker, stop: threading.Event) -> None:
+        """存活跟踪线程：按节拍推进时间轮，为超时设备生成下线事件"""
+        while not stop.wait(tracker.tick):
+            for key in tracker.advance(time.monotonic()):
+                with self._ingest_lock:
+                    device_info = self.devices.get(key)
+                    if device_info is None:
+                        continue
+                    device_info = device_info._with_result(SADP_DEC)
+                    self.devices.apply(device_info)
+                    self._store.release(key)
+                logger.info(f"设备超时下线: {device_info.mac} {device_info.ipv4_address}")
+                record_filter = self._filter
+                accepted = not record_filter or record_filter.matches(device_info._snapshot())
+                try:
+                    self._dispatch(device_info, accepted)
+                except Exception:
+                    logger.exception("处理设备下线事件失败")
+
     def sadp_stop(self) -> bool:
         """停止SADP协议
         Returns:
@@ -123,6 +502,8 @@ class SADP:
         res = self.call_func("SADP_Stop")
         if not res:
             self.print_error("停止SADP协议失败")
+        self._running = False
+        self._stop_consumer()
         return bool(res)
     
     def activate_device(self, device_info: DeviceInfo, password: str) -> bool:
@@ -136,10 +517,74 @@ class SADP:
             bool: 是否激活成功
             
         """       
-        res = self.call_func("SADP_ActivateDevice", device_info.serial_no.encode("utf-8"), password.encode("utf-8")) 
-        if not res:
-            self.print_error("激活设备失败")
-        return bool(res)
+        result = self._activate(device_info, password)
+        if not result['success']:
+            logger.error(f"激活设备失败 错误码: {result['error_code']} 错误信息: {result['error_message']}")
+        return result['success']
+
+    def _activate(self, device_info: DeviceInfo, password: str) -> dict:
+        """激活设备并在同一线程中获取错误码
+
+        Returns:
+            dict: 激活结果
+                - mac: str，设备MAC地址
+                - serial_no: str，设备序列号
+                - success: bool，是否激活成功
+                - error_code: int，错误码，成功时为0
+                - error_message: str，错误信息
+        """
+        with self._operation():
+            res = self.call_func("SADP_ActivateDevice", device_info.serial_no.encode("utf-8"), password.encode("utf-8"))
+            error_code = 0 if res else self.call_func("SADP_GetLastError")
+        return {
+            'mac': device_info.mac,
+            'serial_no': device_info.serial_no,
+            'success': bool(res),
+            'error_code': error_code,
+            'error_message': sdk_err_msg(error_code),
+        }
+
+    def activate_many(self, devices: Iterable[DeviceInfo], password: str, concurrency: int = 8,
+                      progress: Optional[Callable[[DeviceInfo, dict], None]] = None) -> Dict[str, dict]:
+        """并发激活多台设备
+
+        在有界线程池中调用SADP_ActivateDevice，单台设备失败不影响其它设备；
+        调用抛出异常的设备记为失败，error_code为-1，error_message为异常信息
+
+        Args:
+            devices: 待激活的设备
+            password: 设备密码
+            concurrency: 同时进行的激活数
+            progress: 进度回调，每台设备完成时在工作线程中调用，参数为设备信息与激活结果
+
+        Returns:
+            Dict[str, dict]: 设备MAC地址 -> 激活结果，结果格式同 _activate()
+        """
+        if concurrency <= 0:
+            raise ValueError(f"并发数必须大于0: {concurrency}")
+        results: Dict[str, dict] = {}
+
+        def work(device_info: DeviceInfo) -> None:
+            try:
+                result = self._activate(device_info, password)
+            except Exception as e:
+                logger.exception(f"激活设备异常: {device_info.mac}")
+                result = {'mac': device_info.mac, 'serial_no': device_info.serial_no, 'success': False,
+                          'error_code': -1, 'error_message': str(e)}
+            results[device_info.mac] = result
+            if progress is not None:
+                try:
+                    progress(device_info, result)
+                except Exception:
+                    logger.exception("激活进度回调执行失败")
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pysadp-activate") as executor:
+            for future in [executor.submit(work, device_info) for device_info in devices]:
+                future.result()
+        failed = sum(1 for result in results.values() if not result['success'])
+        if failed:
+            logger.error(f"批量激活完成，成功{len(results) - failed}台，失败{failed}台")
+        return results
     
     
     def modify_device_net_param(self, device_info: DeviceInfo, password: str, ipv4_address: Optional[str] = None, 
@@ -171,7 +616,23 @@ class SADP:
                 - surplus_lock_time: int，剩余锁定时间(分钟)
         """
 
-        # 初始化网络参数结构体
+        net_param = self.build_net_param(device_info, ipv4_address, ipv4_subnet_mask, ipv4_gateway, port, http_port,
+                                          ipv6_address, ipv6_gateway, ipv6_mask_len, dhcp_enable)
+        result = self.modify_net_param(device_info, password, net_param)
+        if not result['success']:
+            logger.error(f"修改设备网络参数失败: {result.get('error_message')}")
+        return result
+
+    def build_net_param(self, device_info: DeviceInfo, ipv4_address: Optional[str] = None,
+                        ipv4_subnet_mask: Optional[str] = None, ipv4_gateway: Optional[str] = None,
+                        port: Optional[int] = None, http_port: Optional[int] = None, ipv6_address: Optional[str] = None,
+                        ipv6_gateway: Optional[str] = None, ipv6_mask_len: Optional[int] = None,
+                        dhcp_enable: Optional[bool] = None) -> SADP_DEV_NET_PARAM:
+        """构造网络参数结构体，参数为None的字段使用设备当前值，参数含义同 modify_device_net_param()
+
+        Returns:
+            SADP_DEV_NET_PARAM: 网络参数结构体，可传给 modify_net_param()
+        """
         sadp_dev_net_param = SADP_DEV_NET_PARAM()
         sadp_dev_net_param.szIPv4Address = ipv4_address.encode("utf-8") if ipv4_address else device_info.ipv4_address.encode("utf-8")
         sadp_dev_net_param.szIPv4SubNetMask = ipv4_subnet_mask.encode("utf-8") if ipv4_subnet_mask else device_info.ipv4_subnet_mask.encode("utf-8")
@@ -186,16 +647,32 @@ class SADP:
             sadp_dev_net_param.byDhcpEnable = 1 if dhcp_enable else 0
         else:
             sadp_dev_net_param.byDhcpEnable = device_info.dhcp_enabled   
-        
+        return sadp_dev_net_param
+
+    def modify_net_param(self, device_info: DeviceInfo, password: str, sadp_dev_net_param: SADP_DEV_NET_PARAM) -> dict:
+        """以build_net_param()构造的参数结构体修改设备网络参数，在同一线程中获取错误码，失败时不记录日志
+
+        供批量修改与重试调度使用，同一参数结构体可重复提交
+
+        Args:
+            device_info: 设备信息对象
+            password: 设备密码
+            sadp_dev_net_param: 网络参数结构体
+
+        Returns:
+            dict: 修改结果，格式同 modify_device_net_param()
+        """
         # 初始化返回参数结构体
         ret_net_param = SADP_DEV_RET_NET_PARAM()
         
-        res = self.call_func("SADP_ModifyDeviceNetParam_V40", 
-                          device_info.mac.encode("utf-8"), 
-                          password.encode("utf-8"),
-                          ctypes.byref(sadp_dev_net_param),
-                          ctypes.byref(ret_net_param),
-                          ctypes.sizeof(ret_net_param))
+        with self._operation():
+            res = self.call_func("SADP_ModifyDeviceNetParam_V40", 
+                              device_info.mac.encode("utf-8"), 
+                              password.encode("utf-8"),
+                              ctypes.byref(sadp_dev_net_param),
+                              ctypes.byref(ret_net_param),
+                              ctypes.sizeof(ret_net_param))
+            error_code = 0 if res else self.call_func("SADP_GetLastError")
 
         result = {
             'success': bool(res),
@@ -203,12 +680,8 @@ class SADP:
             'surplus_lock_time': ret_net_param.bySurplusLockTime
         }
         if not res:
-            # 获取错误码和错误信息
-            error_code = self.call_func("SADP_GetLastError")
-            error_message = sdk_err_msg(error_code)
-            
             result['error_code'] = error_code
-            result['error_message'] = error_message
+            result['error_message'] = sdk_err_msg(error_code)
             
             # 根据错误码提供更详细的信息
             if error_code == 2018:  # SADP_LOCKED
@@ -217,10 +690,132 @@ class SADP:
                 result['error_message'] = f"密码错误，剩余尝试修改次数:{ret_net_param.byRetryModifyTime}次"
             elif error_code == 2019:  # SADP_NOT_ACTIVATED
                 result['error_message'] = "设备未激活"
-
-            logger.error(f"修改设备网络参数失败: {result.get('error_message')}")
         return result
 
+    def modify_many(self, params: Mapping[DeviceInfo, dict], password: str, concurrency: int = 8,
+                    progress: Optional[Callable[[DeviceInfo, dict], None]] = None) -> Dict[str, dict]:
+        """并发修改多台设备的网络参数
+
+        先为全部设备构造参数结构体(参数有误时在修改任何设备之前抛出异常)，
+        再在有界线程池中调用SADP_ModifyDeviceNetParam_V40，单台设备失败不影响其它设备；
+        调用抛出异常的设备记为失败，error_code为-1，error_message为异常信息
+
+        Args:
+            params: 设备信息 -> 目标参数，参数名同 modify_device_net_param()，
+                例如 {device: {"ipv4_address": "192.168.1.64"}}
+            password: 设备密码
+            concurrency: 同时进行的修改数
+            progress: 进度回调，每台设备完成时在工作线程中调用，参数为设备信息与修改结果
+
+        Returns:
+            Dict[str, dict]: 设备MAC地址 -> 修改结果，结果格式同 modify_device_net_param()
+        """
+        if concurrency <= 0:
+            raise ValueError(f"并发数必须大于0: {concurrency}")
+        jobs = [(device_info, self.build_net_param(device_info, **kwargs)) for device_info, kwargs in params.items()]
+        results: Dict[str, dict] = {}
+
+        def work(device_info: DeviceInfo, net_param: SADP_DEV_NET_PARAM) -> None:
+            try:
+                result = self.modify_net_param(device_info, password, net_param)
+            except Exception as e:
+                logger.exception(f"修改设备网络参数异常: {device_info.mac}")
+                result = {'success': False, 'retry_modify_time': 0, 'surplus_lock_time': 0,
+                          'error_code': -1, 'error_message': str(e)}
+            results[device_info.mac] = result
+            if progress is not None:
+                try:
+                    progress(device_info, result)
+                except Exception:
+                    logger.exception("修改进度回调执行失败")
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pysadp-modify") as executor:
+            for future in [executor.submit(work, device_info, net_param) for device_info, net_param in jobs]:
+                future.result()
+        failed = sum(1 for result in results.values() if not result['success'])
+        if failed:
+            logger.error(f"批量修改网络参数完成，成功{len(results) - failed}台，失败{failed}台")
+        return results
+
+
+    def expect_device(self, mac: str, predicate: DevicePredicate, timeout: float = 30.0) -> Future:
+        """等待设备报告满足条件的状态，当前状态已满足时立即完成
+
+        Args:
+            mac: 设备MAC地址
+            predicate: 判断函数，参数为设备信息，例如 lambda d: d.is_activated
+            timeout: 超时时间(秒)
+
+        Returns:
+            Future: 结果为满足条件的设备信息；超时以concurrent.futures.TimeoutError结束
+        """
+        future = self._pending.expect(normalize_mac(mac), predicate, timeout, "等待设备状态")
+        current = self.devices.get(mac)
+        if current is not None:
+            self._pending.resolve(current)
+        return future
+
+    def _submit(self, device_info: DeviceInfo, predicate: DevicePredicate, timeout: float, action: str,
+                call: Callable[[], dict]) -> Future:
+        """登记待确认操作后执行SDK调用，调用失败时以OperationError结束Future"""
+        key = normalize_mac(device_info.mac)
+        # 先登记再调用，避免调用返回前到达的确认消息被遗漏
+        future = self._pending.expect(key, predicate, timeout, action)
+        result = call()
+        if not result['success']:
+            logger.error(f"{action}失败 错误码: {result.get('error_code')} 错误信息: {result.get('error_message')}")
+            self._pending.fail(key, future, OperationError(f"{action}失败: {result.get('error_message')}", result))
+        else:
+            # 设备在调用前已处于目标状态时，不会再有内容变化的消息
+            current = self.devices.get(key)
+            if current is not None:
+                self._pending.resolve(current)
+        return future
+
+    def submit_activate(self, device_info: DeviceInfo, password: str, timeout: float = 30.0) -> Future:
+        """激活设备，并返回在设备报告已激活时完成的Future
+
+        SDK调用在当前线程中执行，返回的Future由设备搜索消息确认，无需轮询设备列表
+
+        Args:
+            device_info: 设备信息对象
+            password: 设备密码
+            timeout: 等待设备报告已激活的超时时间(秒)
+
+        Returns:
+            Future: 结果为激活后的设备信息；SDK调用失败以OperationError结束，
+                超时以concurrent.futures.TimeoutError结束
+        """
+        return self._submit(device_info, lambda d: d.is_activated, timeout, "激活设备",
+                            lambda: self._activate(device_info, password))
+
+    def submit_modify(self, device_info: DeviceInfo, password: str, timeout: float = 30.0, **params) -> Future:
+        """修改设备网络参数，并返回在设备报告新参数时完成的Future
+
+        Args:
+            device_info: 设备信息对象
+            password: 设备密码
+            timeout: 等待设备报告新参数的超时时间(秒)
+            **params: 目标参数，参数名同 modify_device_net_param()
+
+        Returns:
+            Future: 结果为修改后的设备信息；SDK调用失败以OperationError结束(其result属性为修改结果)，
+                超时以concurrent.futures.TimeoutError结束
+        """
+        net_param = self.build_net_param(device_info, **params)
+        expected = {_NET_PARAM_FIELDS[name]: value for name, value in params.items() if value is not None}
+        if "dhcp_enabled" in expected:
+            expected["dhcp_enabled"] = int(expected["dhcp_enabled"])
+            if expected["dhcp_enabled"]:
+                # 启用DHCP后IPv4参数由DHCP服务器分配
+                for name in ("ipv4_address", "ipv4_subnet_mask", "ipv4_gateway"):
+                    expected.pop(name, None)
+
+        def predicate(current: DeviceInfo) -> bool:
+            return all(getattr(current, name) == value for name, value in expected.items())
+
+        return self._submit(device_info, predicate, timeout, "修改设备网络参数",
+                            lambda: self.modify_net_param(device_info, password, net_param))
 
     def _set_auto_request_interval(self, interval: int) -> bool:
         """设置自动搜索的时间间隔
@@ -232,7 +827,59 @@ class SADP:
             bool: 是否设置成功
         """
         res = self.call_func("SADP_SetAutoRequestInterval", interval)
+        if res:
+            self.auto_request_interval = interval
         return bool(res)
+
+    def enable_adaptive_interval(self, min_interval: int = 1, base_interval: int = 10, max_interval: int = 120,
+                                 burst_hold: float = 30.0) -> AutoRequestController:
+        """启用自动搜索间隔的自适应调整
+
+        激活或修改设备期间及完成后burst_hold秒内使用min_interval快速刷新，
+        有设备变化时使用base_interval，网络平静时每个间隔翻倍直到max_interval
+
+        Args:
+            min_interval: 突发模式下的间隔(秒)
+            base_interval: 有设备变化时的间隔(秒)
+            max_interval: 平静时退避的上限(秒)
+            burst_hold: 操作完成后保持突发模式的时间(秒)
+
+        Returns:
+            AutoRequestController: 控制器，其current_interval、reason及status()可用于监控
+        """
+        self.disable_adaptive_interval()
+        controller = AutoRequestController(self._set_auto_request_interval, min_interval, base_interval,
+                                           max_interval, burst_hold)
+        self.add_listener(controller.listener, filtered=False)
+        controller.start()
+        self.interval_controller = controller
+        return controller
+
+    def disable_adaptive_interval(self, interval: Optional[int] = None) -> None:
+        """停用自动搜索间隔的自适应调整
+
+        Args:
+            interval: 停用后设置的固定间隔(秒)，为None则保持当前间隔
+        """
+        controller = self.interval_controller
+        if controller is not None:
+            self.interval_controller = None
+            controller.stop()
+            self.remove_listener(controller.listener)
+        if interval is not None:
+            self._set_auto_request_interval(interval)
+
+    @contextmanager
+    def _operation(self) -> Iterator[None]:
+        """标记一次激活/修改操作，供自动搜索间隔控制器进入突发模式"""
+        controller = self.interval_controller
+        if controller is not None:
+            controller.operation_started()
+        try:
+            yield
+        finally:
+            if controller is not None:
+                controller.operation_finished()
         
     def print_error(self, prefix: str = "") -> None:
         """打印SDK错误信息
@@ -0,0 +1,187 @@
+"""
+网络参数修改调度模块
+
+批量修改网络参数时按设备返回的剩余尝试次数与锁定时间安排重试：
+密码错误时在剩余次数耗尽前停止，设备锁定时挂起到锁定结束再试，其间继续处理其它设备
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .base import SADP_DEV_NET_PARAM
+from .model import DeviceInfo
+
+logger = logging.getLogger(__name__)
+
+_SADP_LOCKED = 2018
+_SADP_NOT_ACTIVATED = 2019
+_SADP_PASSWORD_ERROR = 2024
+
+STATUS_SUCCESS = "success"
+"""修改成功"""
+
+STATUS_LOCKED = "locked"
+"""设备锁定时间超过max_lock_wait，放弃"""
+
+STATUS_PASSWORD = "password"
+"""候选密码均错误，或剩余尝试次数已到保留值，为避免锁定而放弃"""
+
+STATUS_FAILED = "failed"
+"""其它错误，重试max_attempts次后放弃"""
+
+
+class _Job:
+    __slots__ = ("device_info", "net_param", "password_index", "attempts", "failures", "result")
+
+    def __init__(self, device_info: DeviceInfo, net_param: SADP_DEV_NET_PARAM) -> None:
+        self.device_info = device_info
+        self.net_param = net_param
+        self.password_index = 0
+        self.attempts = 0
+        self.failures = 0
+        self.result: dict = {}
+
+
+class NetParamScheduler:
+    """按设备下次可尝试时间排序的网络参数修改调度器
+
+    Example:
+        >>> scheduler = NetParamScheduler(sadp, ["abc123456", "abc654321"])
+        >>> for device, ip in zip(devices, ips):
+        ...     scheduler.add(device, ipv4_address=ip)
+        >>> results = scheduler.run()
+    """
+
+    def __init__(self, sadp, passwords: Union[str, Sequence[str]], concurrency: int = 8, reserve_attempts: int = 1,
+                 max_attempts: int = 3, retry_delay: float = 5.0, max_lock_wait: float = 1800.0,
+                 minute: float = 60.0) -> None:
+        """初始化调度器
+
+        Args:
+            sadp: SADP对象
+            passwords: 设备密码或候选密码列表，密码错误时依次尝试下一个
+            concurrency: 同时进行的修改数
+            reserve_attempts: 保留的尝试次数，设备剩余尝试次数不大于该值时不再尝试其它密码，避免设备被锁定
+            max_attempts: 其它错误(如超时)的最多尝试次数
+            retry_delay: 其它错误的首次重试间隔(秒)，之后每次翻倍
+            max_lock_wait: 设备锁定时最长等待时间(秒)，超过则放弃该设备
+            minute: 设备返回的锁定时间中一分钟对应的秒数，配合SimulatedSADP测试时可调小
+        """
+        if concurrency <= 0:
+            raise ValueError(f"并发数必须大于0: {concurrency}")
+        self.sadp = sadp
+        self.passwords = [passwords] if isinstance(passwords, str) else list(passwords)
+        if not self.passwords:
+            raise ValueError("至少需要一个密码")
+        self.concurrency = concurrency
+        self.reserve_attempts = reserve_attempts
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_lock_wait = max_lock_wait
+        self.minute = minute
+        self._queue: List[Tuple[float, int, _Job]] = []
+        self._counter = itertools.count()
+        self._results: Dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        """待处理的设备数"""
+        return len(self._queue)
+
+    def add(self, device_info: DeviceInfo, **params) -> None:
+        """添加一台待修改设备
+
+        Args:
+            device_info: 设备信息
+            **params: 目标参数，参数名同 SADP.modify_device_net_param()
+        """
+        job = _Job(device_info, self.sadp.build_net_param(device_info, **params))
+        self._push(time.monotonic(), job)
+
+    def _push(self, eligible: float, job: _Job) -> None:
+        heapq.heappush(self._queue, (eligible, next(self._counter), job))
+
+    def _attempt(self, job: _Job) -> dict:
+        return self.sadp.modify_net_param(job.device_info, self.passwords[job.password_index], job.net_param)
+
+    def _finish(self, job: _Job, status: str) -> None:
+        result = dict(job.result, status=status, attempts=job.attempts)
+        self._results[job.device_info.mac] = result
+        if status != STATUS_SUCCESS:
+            logger.error(f"修改设备网络参数失败: {job.device_info.mac} {status} {result.get('error_message')}")
+
+    def _handle(self, job: _Job, result: dict) -> Optional[float]:
+        """处理一次尝试的结果
+
+        Returns:
+            Optional[float]: 需要重试时为下次可尝试时间，否则为None
+        """
+        now = time.monotonic()
+        job.attempts += 1
+        job.result = result
+        if result['success']:
+            self._finish(job, STATUS_SUCCESS)
+            return None
+        error_code = result.get('error_code')
+        if error_code == _SADP_LOCKED:
+            wait_time = result['surplus_lock_time'] * self.minute
+            if wait_time > self.max_lock_wait:
+                self._finish(job, STATUS_LOCKED)
+                return None
+            logger.info(f"设备{job.device_info.mac}已锁定，{result['surplus_lock_time']}分钟后重试")
+            # 锁定时间以分钟为单位向下取整，多等一个节拍
+            return now + wait_time + self.retry_delay
+        if error_code == _SADP_PASSWORD_ERROR:
+            job.password_index += 1
+            if job.password_index >= len(self.passwords) or result['retry_modify_time'] <= self.reserve_attempts:
+                self._finish(job, STATUS_PASSWORD)
+                return None
+            return now
+        job.failures += 1
+        if error_code == _SADP_NOT_ACTIVATED or job.failures >= self.max_attempts:
+            self._finish(job, STATUS_FAILED)
+            return None
+        return now + self.retry_delay * 2 ** (job.failures - 1)
+
+    def run(self, progress: Optional[Callable[[DeviceInfo, dict], None]] = None) -> Dict[str, dict]:
+        """执行全部待修改设备，直到每台设备成功或放弃
+
+        Args:
+            progress: 进度回调，每台设备得到最终结果时在调用run()的线程中调用，参数为设备信息与最终结果
+
+        Returns:
+            Dict[str, dict]: 设备MAC地址 -> 最终结果，格式同 modify_device_net_param()，另含
+                - status: str，success / locked / password / failed
+                - attempts: int，实际尝试次数
+        """
+        running: Dict[Future, _Job] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pysadp-scheduler") as executor:
+            while self._queue or running:
+                now = time.monotonic()
+                while self._queue and self._queue[0][0] <= now and len(running) < self.concurrency:
+                    _, _, job = heapq.heappop(self._queue)
+                    running[executor.submit(self._attempt, job)] = job
+                timeout = None
+                if self._queue and len(running) < self.concurrency:
+                    timeout = max(0.0, self._queue[0][0] - now)
+                if not running:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(running, timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.exception("修改设备网络参数异常")
+                        result = {'success': False, 'retry_modify_time': 0, 'surplus_lock_time': 0,
+                                  'error_code': -1, 'error_message': str(e)}
+                    eligible = self._handle(job, result)
+                    if eligible is not None:
+                        self._push(eligible, job)
+                    elif progress is not None:
+                        progress(job.device_info, self._results[job.device_info.mac])
+        return self._results
@@ -0,0 +1,339 @@
+"""
+SADP模拟后端模块
+
+在后台线程中为成千上万台虚拟设备生成SADP_DEVICE_INFO_V40回调，
+并模拟激活/修改网络参数的往返耗时、随机失败、密码错误与锁定，
+无需Sadp.dll和真实设备即可测量上线、批量激活与修改的吞吐
+"""
+
+import heapq
+import math
+import random
+import threading
+import time
+import ctypes
+from typing import Dict, List, Optional, Tuple
+
+from .backend import SADPBackend, deref
+from .base import (SADP_DEVICE_INFO_V40, SADP_DEV_NET_PARAM, SADP_DEV_RET_NET_PARAM,
+                   SADP_ADD, SADP_DEC, SADP_UPDATE, SADP_RESTART)
+from .registry import normalize_mac
+
+SADP_NOT_START_ERROR = 2002
+SADP_DENY_OR_TIMEOUT_ERROR = 2009
+SADP_TIMEOUT = 2011
+SADP_LOCKED = 2018
+SADP_NOT_ACTIVATED = 2019
+SADP_RISK_PASSWORD = 2020
+SADP_HAS_ACTIVATED = 2021
+SADP_PASSWORD_ERROR = 2024
+
+
+class _VirtualDevice:
+    """虚拟设备状态"""
+
+    __slots__ = ("record", "password", "online", "retries", "locked_until")
+
+    def __init__(self, record: SADP_DEVICE_INFO_V40, password: Optional[str], retries: int) -> None:
+        self.record = record
+        self.password = password
+        self.online = True
+        self.retries = retries
+        self.locked_until = 0.0
+
+
+class SimulatedSADP(SADPBackend):
+    """模拟的Sadp.dll，可作为backend传给SADP
+
+    Example:
+        >>> sadp = SADP(backend=SimulatedSADP(devices=5000, churn=0.01, latency=0.05))
+        >>> sadp.start(ring_size=65536)
+    """
+
+    version: int = 0x03010103
+    """SADP_GetSadpVersion返回的版本号(V3.1.1.3)"""
+
+    def __init__(self, devices: int = 1000, inactive_ratio: float = 0.5, password: str = "abcd1234",
+                 churn: float = 0.0, latency: float = 0.0, error_rate: float = 0.0, max_retries: int = 7,
+                 lock_minutes: int = 30, minute: float = 60.0, announce_time: float = 1.0,
+                 interval: int = 10, seed: Optional[int] = None) -> None:
+        """初始化虚拟设备
+
+        Args:
+            devices: 虚拟设备数量
+            inactive_ratio: 未激活设备的比例，未激活设备使用出厂地址192.168.1.64
+            password: 已激活设备的密码
+            churn: 每轮自动搜索中发生变化的设备比例，变化为下线、重新上线、重启或更新开机时间之一
+            latency: 激活/修改网络参数的往返耗时(秒)
+            error_rate: 激活/修改随机失败(超时)的概率
+            max_retries: 修改网络参数时允许的密码错误次数，用尽后锁定
+            lock_minutes: 锁定时长(分钟)
+            minute: 一分钟对应的实际秒数，测试锁定时可调小
+            announce_time: 开始搜索后全部设备上线所用的时间(秒)
+            interval: 自动搜索间隔(秒)，0为不自动搜索，可由SADP_SetAutoRequestInterval修改
+            seed: 随机数种子，相同种子生成相同的设备与事件序列
+        """
+        self.inactive_ratio = inactive_ratio
+        self.churn = churn
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_retries = max_retries
+        self.lock_minutes = lock_minutes
+        self.minute = minute
+        self.announce_time = announce_time
+        self.interval = interval
+        self.emitted = 0
+        """已发出的回调次数"""
+
+        self._random = random.Random(seed)
+        self._devices: List[_VirtualDevice] = [self._create(i, password) for i in range(devices)]
+        self._by_mac: Dict[str, _VirtualDevice] = {normalize_mac(d.record.struSadpDeviceInfo.szMAC.decode()): d
+                                                   for d in self._devices}
+        self._by_serial: Dict[bytes, _VirtualDevice] = {d.record.struSadpDeviceInfo.szSerialNO: d
+                                                        for d in self._devices}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # (到期时间, 序号, 设备, 信息类型)，激活/修改成功后延迟发出的更新
+        self._scheduled: List[Tuple[float, int, _VirtualDevice, int]] = []
+        self._sequence = 0
+        self._errors = threading.local()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._callback = None
+        self._user_data = None
+
+    def _create(self, index: int, password: str) -> _VirtualDevice:
+        """生成第index台虚拟设备"""
+        record = SADP_DEVICE_INFO_V40()
+        info = record.struSadpDeviceInfo
+        inactive = self._random.random() < self.inactive_ratio
+        info.szSeries = b"IPC"
+        info.szSerialNO = f"DS-2CD2T47G2-L20230101AACH{index:09d}".encode()
+        info.szMAC = f"ac-cb-51-{index >> 16 & 0xff:02x}-{index >> 8 & 0xff:02x}-{index & 0xff:02x}".encode()
+        if inactive:
+            info.szIPv4Address = b"192.168.1.64"
+            info.szIPv4SubnetMask = b"255.255.255.0"
+            info.szIPv4Gateway = b"0.0.0.0"
+        else:
+            info.szIPv4Address = f"10.{index >> 16 & 0xff}.{index >> 8 & 0xff}.{index & 0xff}".encode()
+            info.szIPv4SubnetMask = b"255.0.0.0"
+            info.szIPv4Gateway = b"10.0.0.1"
+        info.dwDeviceType = 0x20c4
+        info.dwPort = 8000
+        info.dwNumberOfEncoders = 1
+        info.szDeviceSoftwareVersion = b"V5.7.3build 220112"
+        info.szDSPVersion = b"V7.3 build 220112"
+        info.szBootTime = self._boot_time()
+        info.iResult = SADP_ADD
+        info.szDevDesc = b"DS-2CD2T47G2-L"
+        info.szIPv6Address = b"::"
+        info.szIPv6Gateway = b"::"
+        info.byIPv6MaskLen = 64
+        info.wHttpPort = 80
+        info.byActivated = 1 if inactive else 0
+        info.szBaseDesc = b"DS-2CD2T47G2-L"
+        record.bySpecificDeviceType = 2
+        record.byDataFromMulticast = 1
+        return _VirtualDevice(record, None if inactive else password, self.max_retries)
+
+    def _boot_time(self) -> bytes:
+        """随机生成开机时间"""
+        boot = time.time() - self._random.uniform(60, 30 * 86400)
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(boot)).encode()
+
+    def records(self) -> List[SADP_DEVICE_INFO_V40]:
+        """在线设备当前状态的副本
+
+        Returns:
+            List[SADP_DEVICE_INFO_V40]: 设备记录，iResult为SADP_UPDATE
+        """
+        with self._lock:
+            return [self._record(device, SADP_UPDATE) for device in self._devices if device.online]
+
+    def _fail(self, error_code: int) -> int:
+        self._errors.code = error_code
+        return 0
+
+    def _succeed(self) -> int:
+        self._errors.code = 0
+        return 1
+
+    def _schedule(self, device: _VirtualDevice, result: int) -> None:
+        """在latency之后发出设备更新，需持有锁"""
+        if self._thread is None:
+            return
+        self._sequence += 1
+        heapq.heappush(self._scheduled, (time.monotonic() + self.latency, self._sequence, device, result))
+        self._wakeup.notify()
+
+    def _roundtrip(self) -> bool:
+        """模拟往返耗时，按error_rate返回是否超时"""
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    # ---- SDK接口 ----
+
+    def SADP_Start_V40(self, callback, user_data=None) -> int:
+        if self._thread is not None:
+            return self._fail(SADP_DENY_OR_TIMEOUT_ERROR)
+        self._callback = callback
+        self._user_data = user_data
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pysadp-simulator", daemon=True)
+        self._thread.start()
+        return self._succeed()
+
+    def SADP_Stop(self) -> int:
+        thread = self._thread
+        if thread is None:
+            return self._fail(SADP_NOT_START_ERROR)
+        self._stop.set()
+        with self._lock:
+            self._wakeup.notify()
+        if thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+        return self._succeed()
+
+    def SADP_GetSadpVersion(self) -> int:
+        return self.version
+
+    def SADP_SetAutoRequestInterval(self, interval: int) -> int:
+        with self._lock:
+            self.interval = int(interval)
+            self._wakeup.notify()
+        return self._succeed()
+
+    def SADP_GetLastError(self) -> int:
+        return getattr(self._errors, "code", 0)
+
+    def SADP_ActivateDevice(self, serial_no: bytes, password: bytes) -> int:
+        if self._roundtrip():
+            return self._fail(SADP_TIMEOUT)
+        with self._lock:
+            device = self._by_serial.get(bytes(serial_no))
+            if device is None or not device.online:
+                return self._fail(SADP_TIMEOUT)
+            info = device.record.struSadpDeviceInfo
+            if not info.byActivated:
+                return self._fail(SADP_HAS_ACTIVATED)
+            if len(password) < 8:
+                return self._fail(SADP_RISK_PASSWORD)
+            info.byActivated = 0
+            device.password = password.decode("utf-8")
+            device.retries = self.max_retries
+            self._schedule(device, SADP_UPDATE)
+        return self._succeed()
+
+    def SADP_ModifyDeviceNetParam_V40(self, mac: bytes, password: bytes, net_param, ret_net_param,
+                                      ret_size: int) -> int:
+        param: SADP_DEV_NET_PARAM = deref(net_param)
+        ret: SADP_DEV_RET_NET_PARAM = deref(ret_net_param)
+        if self._roundtrip():
+            return self._fail(SADP_TIMEOUT)
+        with self._lock:
+            device = self._by_mac.get(normalize_mac(mac.decode("utf-8")))
+            if device is None or not device.online:
+                return self._fail(SADP_TIMEOUT)
+            info = device.record.struSadpDeviceInfo
+            if info.byActivated:
+                return self._fail(SADP_NOT_ACTIVATED)
+            remaining = device.locked_until - time.monotonic()
+            if remaining > 0:
+                ret.bySurplusLockTime = min(255, math.ceil(remaining / self.minute))
+                return self._fail(SADP_LOCKED)
+            if password.decode("utf-8") != device.password:
+                device.retries = max(0, device.retries - 1)
+                ret.byRetryModifyTime = device.retries
+                if not device.retries:
+                    device.locked_until = time.monotonic() + self.lock_minutes * self.minute
+                    device.retries = self.max_retries
+                    ret.bySurplusLockTime = self.lock_minutes
+                    return self._fail(SADP_LOCKED)
+                return self._fail(SADP_PASSWORD_ERROR)
+            device.retries = self.max_retries
+            ret.byRetryModifyTime = device.retries
+            info.szIPv4Address = param.szIPv4Address
+            info.szIPv4SubnetMask = param.szIPv4SubNetMask
+            info.szIPv4Gateway = param.szIPv4Gateway
+            info.szIPv6Address = param.szIPv6Address
+            info.szIPv6Gateway = param.szIPv6Gateway
+            info.byIPv6MaskLen = param.byIPv6MaskLen
+            info.dwPort = param.wPort
+            info.wHttpPort = param.wHttpPort
+            info.byDhcpEnabled = param.byDhcpEnable
+            self._schedule(device, SADP_UPDATE)
+        return self._succeed()
+
+    # ---- 回调线程 ----
+
+    def _record(self, device: _VirtualDevice, result: int) -> SADP_DEVICE_INFO_V40:
+        """复制设备当前状态作为一条回调记录，需持有锁"""
+        record = SADP_DEVICE_INFO_V40.from_buffer_copy(device.record)
+        record.struSadpDeviceInfo.iResult = result
+        return record
+
+    def _run(self) -> None:
+        """开始搜索后在announce_time内逐步发出全部设备的上线信息，之后按自动搜索间隔发出更新与变化
+
+        记录在持有锁时复制，释放锁后再调用回调，回调中可以直接激活或修改设备
+        """
+        count = len(self._devices)
+        started = time.monotonic()
+        last_round = started + self.announce_time
+        announced = 0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            records: List[SADP_DEVICE_INFO_V40] = []
+            with self._lock:
+                if announced < count:
+                    target = count if self.announce_time <= 0 else min(
+                        count, int(count * (now - started) / self.announce_time) + 1)
+                    records.extend(self._record(device, SADP_ADD)
+                                   for device in self._devices[announced:target] if device.online)
+                    announced = target
+                while self._scheduled and self._scheduled[0][0] <= now:
+                    _, _, device, result = heapq.heappop(self._scheduled)
+                    if device.online:
+                        records.append(self._record(device, result))
+                next_round = last_round + self.interval if self.interval else math.inf
+                if announced >= count and now >= next_round:
+                    self._request_round(records)
+                    last_round = now
+                    next_round = now + self.interval
+                deadline = next_round if announced >= count else now + 0.01
+                if self._scheduled:
+                    deadline = min(deadline, self._scheduled[0][0])
+            for record in records:
+                if self._stop.is_set():
+                    return
+                self.emitted += 1
+                self._callback(ctypes.pointer(record), self._user_data)
+            if not records:
+                with self._lock:
+                    if not self._stop.is_set():
+                        self._wakeup.wait(max(0.0, min(deadline - time.monotonic(), 1.0)))
+
+    def _request_round(self, records: List[SADP_DEVICE_INFO_V40]) -> None:
+        """一轮自动搜索：在线设备重新应答，其中churn比例的设备发生变化，需持有锁"""
+        changed = set(self._random.sample(range(len(self._devices)), int(len(self._devices) * self.churn)))
+        for index, device in enumerate(self._devices):
+            if index not in changed:
+                if device.online:
+                    records.append(self._record(device, SADP_UPDATE))
+                continue
+            kind = self._random.random()
+            info = device.record.struSadpDeviceInfo
+            if not device.online:
+                device.online = True
+                records.append(self._record(device, SADP_ADD))
+            elif kind < 0.4:
+                device.online = False
+                records.append(self._record(device, SADP_DEC))
+            elif kind < 0.6:
+                info.szBootTime = time.strftime("%Y-%m-%d %H:%M:%S").encode()
+                records.append(self._record(device, SADP_RESTART))
+            else:
+                info.szBootTime = self._boot_time()
+                records.append(self._record(device, SADP_UPDATE))
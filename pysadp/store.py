@@ -0,0 +1,194 @@
+"""
+原始记录存储模块
+
+将SDK回调的SADP_DEVICE_INFO_V40结构体以一次memmove复制到预分配、可增长的连续内存中，
+每台设备占用固定槽位，同一MAC的更新原地覆盖，不再持有SDK所属的内存。
+DeviceInfo是其槽位的视图；槽位被覆盖或释放前，先让绑定的视图复制出自己的那份数据
+"""
+
+import ctypes
+from typing import Any, Dict, List, Optional, Union
+
+from .base import SADP_DEVICE_INFO_V40
+
+RECORD_SIZE = ctypes.sizeof(SADP_DEVICE_INFO_V40)
+"""单条记录的字节数"""
+
+RecordSource = Union[int, bytes, ctypes.Structure, "ctypes._Pointer"]
+"""记录来源：内存地址、字节串、结构体实例或结构体指针"""
+
+_RecordArray = ctypes.c_char * RECORD_SIZE
+
+
+def record_address(src: RecordSource) -> Union[int, bytes]:
+    """将记录来源转换为可直接传给ctypes.memmove的参数
+
+    Args:
+        src: 内存地址、bytes、SADP_DEVICE_INFO_V40实例或其指针
+
+    Returns:
+        Union[int, bytes]: 内存地址或字节串
+    """
+    if isinstance(src, ctypes.Structure):
+        return ctypes.addressof(src)
+    if isinstance(src, ctypes._Pointer):
+        return ctypes.cast(src, ctypes.c_void_p).value
+    if isinstance(src, (bytearray, memoryview)):
+        return bytes(src)
+    return src
+
+
+def record_buffer(src: RecordSource) -> Union[bytes, ctypes.Array]:
+    """将记录来源转换为可供struct.unpack_from读取的缓冲区，不复制数据
+
+    Args:
+        src: 内存地址、bytes、SADP_DEVICE_INFO_V40实例或其指针
+
+    Returns:
+        Union[bytes, ctypes.Array]: 字节串本身，或指向记录内存的ctypes数组
+    """
+    address = record_address(src)
+    if isinstance(address, bytes):
+        return address
+    return _RecordArray.from_address(address)
+
+
+class RecordStore:
+    """按槽位存放原始设备记录的连续内存区
+
+    本类非线程安全，写入由单一的接收线程完成。
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        """初始化记录存储
+
+        Args:
+            capacity: 初始槽位数，写满后按倍数增长
+        """
+        self._capacity = max(1, capacity)
+        self._slab = ctypes.create_string_buffer(self._capacity * RECORD_SIZE)
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        # 槽位 -> 当前绑定的视图(DeviceInfo)
+        self._views: List[Optional[Any]] = [None] * self._capacity
+        self._next = 0
+
+    @property
+    def capacity(self) -> int:
+        """当前槽位总数"""
+        return self._capacity
+
+    @property
+    def buffer(self) -> ctypes.Array:
+        """底层连续内存"""
+        return self._slab
+
+    def _grow(self) -> None:
+        """容量翻倍，复制已有记录"""
+        capacity = self._capacity * 2
+        slab = ctypes.create_string_buffer(capacity * RECORD_SIZE)
+        ctypes.memmove(slab, self._slab, self._capacity * RECORD_SIZE)
+        self._views.extend([None] * (capacity - self._capacity))
+        self._slab = slab
+        self._capacity = capacity
+
+    def _allocate(self) -> int:
+        """分配一个空闲槽位"""
+        if self._free:
+            return self._free.pop()
+        if self._next >= self._capacity:
+            self._grow()
+        slot = self._next
+        self._next += 1
+        return slot
+
+    def put(self, key: str, src: RecordSource) -> int:
+        """写入一条记录，已存在的key原地覆盖其槽位
+
+        Args:
+            key: 规范化后的MAC地址
+            src: 记录来源，长度须为RECORD_SIZE
+
+        Returns:
+            int: 记录所在槽位
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = self._allocate()
+        else:
+            self._detach(slot)
+        ctypes.memmove(ctypes.addressof(self._slab) + slot * RECORD_SIZE, record_address(src), RECORD_SIZE)
+        return slot
+
+    def release(self, key: str) -> bool:
+        """释放key占用的槽位，槽位可被后续记录复用
+
+        Args:
+            key: 规范化后的MAC地址
+
+        Returns:
+            bool: key是否存在
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        self._detach(slot)
+        self._free.append(slot)
+        return True
+
+    def bind(self, slot: int, view: Any) -> None:
+        """将视图绑定到槽位，槽位下次被覆盖或释放前调用view._detach()
+
+        Args:
+            slot: 槽位
+            view: 读取该槽位内存的对象，须提供_detach()方法复制出自己的数据
+        """
+        self._detach(slot)
+        self._views[slot] = view
+
+    def _detach(self, slot: int) -> None:
+        """让槽位当前绑定的视图复制出自己的数据"""
+        view = self._views[slot]
+        if view is not None:
+            self._views[slot] = None
+            view._detach()
+
+    def slot_of(self, key: str) -> Optional[int]:
+        """获取key所在槽位
+
+        Args:
+            key: 规范化后的MAC地址
+
+        Returns:
+            Optional[int]: 槽位，不存在则为None
+        """
+        return self._slots.get(key)
+
+    def address(self, slot: int) -> int:
+        """槽位的内存地址，容量增长后会变化"""
+        return ctypes.addressof(self._slab) + slot * RECORD_SIZE
+
+    def offset(self, slot: int) -> int:
+        """槽位在底层内存中的字节偏移"""
+        return slot * RECORD_SIZE
+
+    def view(self, slot: int) -> SADP_DEVICE_INFO_V40:
+        """获取槽位的结构体视图（不复制）
+
+        Args:
+            slot: 槽位
+
+        Returns:
+            SADP_DEVICE_INFO_V40: 指向槽位内存的结构体
+        """
+        return SADP_DEVICE_INFO_V40.from_buffer(self._slab, slot * RECORD_SIZE)
+
+    def read(self, slot: int) -> bytes:
+        """复制槽位中的原始字节"""
+        return ctypes.string_at(ctypes.addressof(self._slab) + slot * RECORD_SIZE, RECORD_SIZE)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
@@ -0,0 +1,75 @@
+"""测试用的模拟回调数据"""
+
+import ctypes
+from typing import Tuple
+
+from pysadp.backend import SADPBackend
+from pysadp.base import SADP_DEVICE_INFO_V40, SADP_ADD
+from pysadp.model import DeviceInfo
+from pysadp.sadp import SADP
+
+
+def make_record(index: int = 1, result: int = SADP_ADD, activated: int = 1, ip: str = None,
+                mask: str = "255.255.255.0", gateway: str = "192.168.1.1") -> SADP_DEVICE_INFO_V40:
+    """构造第index台设备的一条SADP_DEVICE_INFO_V40记录"""
+    record = SADP_DEVICE_INFO_V40()
+    info = record.struSadpDeviceInfo
+    info.szSerialNO = f"DS-2CD2T47G2-L20230101AACH{index:09d}".encode()
+    info.szMAC = f"ac-cb-51-{index >> 16 & 0xff:02x}-{index >> 8 & 0xff:02x}-{index & 0xff:02x}".encode()
+    info.szIPv4Address = (ip or f"192.168.1.{index & 0xff}").encode()
+    info.szIPv4SubnetMask = mask.encode()
+    info.szIPv4Gateway = gateway.encode()
+    info.szDevDesc = b"DS-2CD2T47G2-L"
+    info.dwPort = 8000
+    info.wHttpPort = 80
+    info.iResult = result
+    info.byActivated = activated
+    return record
+
+
+def make_device(index: int = 1, **fields) -> DeviceInfo:
+    """构造第index台设备的DeviceInfo"""
+    return DeviceInfo(make_record(index, **fields))
+
+
+class StubBackend(SADPBackend):
+    """保存回调的SDK后端，由测试直接投递记录"""
+
+    def __init__(self) -> None:
+        self.callback = None
+
+    def fire(self, record: SADP_DEVICE_INFO_V40) -> None:
+        """以SDK回调的方式投递一条记录"""
+        self.callback(ctypes.pointer(record), None)
+
+    def SADP_Start_V40(self, callback, user_data=None) -> int:
+        self.callback = callback
+        return 1
+
+    def SADP_Stop(self) -> int:
+        self.callback = None
+        return 1
+
+    def SADP_GetSadpVersion(self) -> int:
+        return 0x03010103
+
+    def SADP_SetAutoRequestInterval(self, interval: int) -> int:
+        return 1
+
+    def SADP_ActivateDevice(self, serial_no: bytes, password: bytes) -> int:
+        return 1
+
+    def SADP_ModifyDeviceNetParam_V40(self, mac: bytes, password: bytes, net_param, ret_net_param,
+                                      ret_size: int) -> int:
+        return 1
+
+    def SADP_GetLastError(self) -> int:
+        return 0
+
+
+def make_sadp() -> Tuple[SADP, StubBackend]:
+    """创建使用StubBackend并已开始搜索的SADP"""
+    backend = StubBackend()
+    sadp = SADP(auto_request_interval=0, backend=backend)
+    sadp.start()
+    return sadp, backend
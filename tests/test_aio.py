@@ -0,0 +1,22 @@
+import asyncio
+
+from pysadp.aio import AsyncSADP
+
+from records import make_record, make_sadp
+
+
+def test_close_removes_the_registered_listener():
+    sadp, backend = make_sadp()
+    listeners = list(sadp._unfiltered_listeners)
+
+    async def main():
+        client = AsyncSADP(sadp)
+        waiter = asyncio.ensure_future(client.wait_for(lambda device_info: True, timeout=1))
+        await asyncio.sleep(0)
+        backend.fire(make_record(1))
+        device_info = await waiter
+        client.close()
+        return device_info
+
+    assert asyncio.run(main()).mac == make_record(1).struSadpDeviceInfo.szMAC.decode()
+    assert sadp._unfiltered_listeners == listeners
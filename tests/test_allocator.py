@@ -0,0 +1,66 @@
+import ipaddress
+import random
+
+from pysadp.allocator import IPAllocator
+
+from records import make_device
+
+
+def test_allocation_skips_taken_and_reserved_addresses():
+    allocator = IPAllocator("192.168.1.10", 24, reserved=["192.168.1.12-192.168.1.13"])
+    allocator.occupy("192.168.1.11")
+    allocator.occupy("192.168.1.14")
+    assert allocator.get_next_ip() == "192.168.1.10"
+    assert allocator.get_next_ip() == "192.168.1.15"
+
+    allocator.release("192.168.1.12")
+    assert not allocator.is_free("192.168.1.12")
+    allocator.unreserve("192.168.1.11-192.168.1.12")
+    assert allocator.is_free("192.168.1.12") and not allocator.is_free("192.168.1.11")
+    info = allocator.get_network_info()
+    assert (info["used_hosts"], info["reserved_hosts"]) == (4, 2)
+    assert allocator.get_remaining_count() == 254 - 6
+
+
+def test_matches_a_naive_model():
+    rng = random.Random(7)
+    allocator = IPAllocator("10.0.0.1", 26)
+    hosts = [str(ipaddress.IPv4Address("10.0.0.0") + i) for i in range(1, 63)]
+    reserved = {"10.0.0.1"}
+    taken = set()
+    for _ in range(2000):
+        ip = rng.choice(hosts)
+        action = rng.randrange(5)
+        if action == 0:
+            allocator.occupy(ip)
+            if ip not in reserved:
+                taken.add(ip)
+        elif action == 1:
+            allocator.release(ip)
+            taken.discard(ip)
+        elif action == 2:
+            allocator.reserve(ip)
+            reserved.add(ip)
+            taken.discard(ip)
+        elif action == 3:
+            allocator.unreserve(ip)
+            reserved.discard(ip)
+        elif len(taken | reserved) < len(hosts):
+            taken.add(allocator.get_next_ip())
+        assert [allocator.is_free(host) for host in hosts] == [host not in taken | reserved for host in hosts]
+        assert allocator.get_remaining_count() == len(hosts) - len(taken) - len(reserved)
+
+
+def test_unreserve_keeps_addresses_held_by_devices():
+    allocator = IPAllocator("192.168.1.10", 24)
+    allocator.observe(make_device(1, ip="192.168.1.1"))
+    allocator.observe(make_device(20, ip="192.168.1.20"))
+    allocator.reserve("192.168.1.1")
+    allocator.reserve("192.168.1.15-192.168.1.25")
+    allocator.unreserve("192.168.1.1")
+    allocator.unreserve("192.168.1.15-192.168.1.25")
+
+    assert not allocator.is_free("192.168.1.1")
+    assert not allocator.is_free("192.168.1.20")
+    assert allocator.is_free("192.168.1.19") and allocator.is_free("192.168.1.21")
+    assert allocator.get_network_info()["used_hosts"] == 2
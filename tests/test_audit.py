@@ -0,0 +1,28 @@
+import pytest
+
+from pysadp.audit import audit
+from pysadp.model import DEVICE_INFO_WIDTHS
+
+from records import make_device
+
+
+def test_raw_value_returns_undecoded_fixed_width_bytes():
+    device_info = make_device(7)
+    raw = device_info.raw_value("ipv4_address")
+    assert raw.__class__ is bytes and len(raw) == DEVICE_INFO_WIDTHS["ipv4_address"]
+    assert raw.rstrip(b"\0") == b"192.168.1.7"
+
+    # 访问后字符串字段已解码缓存，原始值不变
+    assert device_info.ipv4_address == "192.168.1.7"
+    assert device_info.raw_value("ipv4_address") == raw
+    assert device_info.raw_value("port") == 8000
+    with pytest.raises(AttributeError):
+        device_info.raw_value("is_activated")
+
+
+def test_audit_reports_duplicate_ip_and_foreign_gateway():
+    devices = [make_device(1), make_device(2, ip="192.168.1.1"), make_device(3, gateway="10.0.0.1")]
+    devices[0].ipv4_address
+    report = audit(devices)
+    assert report.duplicate_ips == {"192.168.1.1": [devices[0].mac, devices[1].mac]}
+    assert report.gateway_outside_subnet == [devices[2].mac]
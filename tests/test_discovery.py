@@ -0,0 +1,56 @@
+import math
+import time
+
+import pytest
+
+from pysadp.discovery import SettleDetector
+from pysadp.sadp import SADP
+from pysadp.simulator import SimulatedSADP
+
+
+def make_sadp(devices: int, announce_time: float) -> SADP:
+    return SADP(auto_request_interval=0, backend=SimulatedSADP(devices=devices, announce_time=announce_time,
+                                                               interval=0, seed=1))
+
+
+def test_detector_waits_longer_for_slower_arrivals():
+    detector = SettleDetector(confidence=0.95, smoothing=1.0, min_quiet=0.0)
+    detector.begin(0.0)
+    detector.observe(0.5)
+    assert detector.quiet_needed == pytest.approx(0.5 * math.log(20))
+    assert not detector.settled(0.5 + 1.4) and detector.settled(0.5 + 1.5)
+    detector.observe(0.6)
+    assert detector.settle_time() == pytest.approx(0.6 + 0.1 * math.log(20))
+
+
+def test_discover_settles_after_the_sweep():
+    sadp = make_sadp(devices=30, announce_time=0.3)
+    start = time.monotonic()
+    snapshot = sadp.discover(min_time=0.1, min_quiet=0.2, max_time=5)
+    elapsed = time.monotonic() - start
+
+    assert len(snapshot) == 30
+    assert 0.3 <= elapsed < 2
+    assert sadp._unfiltered_listeners == []
+    sadp.sadp_stop()
+
+
+def test_discover_returns_once_the_device_count_is_reached():
+    sadp = make_sadp(devices=10, announce_time=0)
+    start = time.monotonic()
+    assert len(sadp.discover(until=10, max_time=5)) == 10
+    assert time.monotonic() - start < 1
+    sadp.sadp_stop()
+
+
+def test_discover_gives_up_at_max_time():
+    sadp = make_sadp(devices=5, announce_time=0)
+    start = time.monotonic()
+    assert len(sadp.discover(until=6, max_time=0.3)) == 5
+    assert 0.3 <= time.monotonic() - start < 1
+    sadp.sadp_stop()
+
+
+def test_discover_rejects_unknown_conditions():
+    with pytest.raises(ValueError):
+        make_sadp(devices=1, announce_time=0).discover(until="forever")
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from pysadp.ip_generator import STRATEGY_EUI64, STRATEGY_RANDOM, IPGenerator, IPv6Generator
+
+
+def test_eui64_takes_the_mac_like_ipgenerator():
+    generator = IPv6Generator("2001:db8:1::/64", strategy=STRATEGY_EUI64)
+    assert generator.get_next_ip("ac-cb-51-12-34-56") == "2001:db8:1:0:aecb:51ff:fe12:3456"
+    assert generator.get_next_ip(mac="AC:CB:51:12:34:56") == "2001:db8:1:0:aecb:51ff:fe12:3456"
+    with pytest.raises(ValueError):
+        generator.get_next_ip()
+
+
+def test_sequential_skips_allocated_ranges_and_reuses_released_addresses():
+    generator = IPv6Generator("2001:db8::/120", start_ip="2001:db8::10")
+    assert generator.get_next_ip() == "2001:db8::10"
+    assert generator.get_next_ip() == "2001:db8::11"
+    generator.release("2001:db8::10")
+    assert generator.get_next_ip() == "2001:db8::12"
+    assert generator.get_remaining_count() == generator.max_available - 2
+    for _ in range(generator.get_remaining_count()):
+        generator.get_next_ip()
+    with pytest.raises(IndexError):
+        generator.get_next_ip()
+
+    generator.release("2001:db8::10")
+    assert generator.get_next_ip() == "2001:db8::10"
+    assert generator.get_network_info()["used_hosts"] == generator.max_available
+
+
+def test_sequential_wraps_past_a_large_allocated_range_quickly():
+    generator = IPv6Generator("2001:db8::/64")
+    for _ in range(20000):
+        generator.get_next_ip()
+    generator.release("2001:db8::5")
+    started = time.perf_counter()
+    generator._cursor = generator._last_host
+    assert generator.get_next_ip() == "2001:db8::ffff:ffff:ffff:ffff"
+    assert generator.get_next_ip() == "2001:db8::5"
+    assert time.perf_counter() - started < 0.05
+
+
+def test_ipv4_point_to_point_and_host_networks_use_every_address():
+    generator = IPGenerator("10.0.0.0", 31)
+    assert generator.max_available == 2
+    assert [generator.get_next_ip(), generator.get_next_ip()] == ["10.0.0.0", "10.0.0.1"]
+    with pytest.raises(IndexError):
+        generator.get_next_ip()
+
+    generator = IPGenerator("10.0.0.7", 32, gateway="10.0.0.7")
+    assert generator.max_available == 1 and generator.get_remaining_count() == 1
+    assert generator.get_next_ip() == "10.0.0.7"
+    assert generator.get_remaining_count() == 0
+    with pytest.raises(IndexError):
+        generator.get_next_ip()
+
+
+def test_ipv4_exhaustion_and_recycling_at_the_end_of_the_range():
+    generator = IPGenerator("192.168.1.253", "255.255.255.0")
+    assert generator.get_next_ip() == "192.168.1.253"
+    assert generator.get_next_ip() == "192.168.1.254"
+    assert generator.get_current_ip() == "192.168.1.254"
+    with pytest.raises(IndexError):
+        generator.get_next_ip()
+
+    assert generator.recycle_current_ip()
+    assert generator.get_next_ip() == "192.168.1.254"
+    generator.reset()
+    assert generator.get_current_ip() is None
+    assert generator.get_next_ip() == "192.168.1.1"
+    assert generator.get_network_info()["used_hosts"] == 1
+
+
+def test_ipv4_start_outside_the_host_range_begins_at_the_first_host():
+    assert IPGenerator("192.168.1.0", 24).get_next_ip() == "192.168.1.1"
+    assert IPGenerator("192.168.1.255", 24).get_next_ip() == "192.168.1.1"
+    with pytest.raises(ValueError):
+        IPGenerator("192.168.1.10", 24, gateway="192.168.2.1")
+
+
+def test_random_and_eui64_track_sparse_addresses_in_a_set():
+    generator = IPv6Generator("2001:db8::/64", strategy=STRATEGY_RANDOM, seed=1)
+    addresses = {generator.get_next_ip() for _ in range(1000)}
+    assert len(addresses) == 1000 and isinstance(generator._allocated, set)
+    generator.release(next(iter(addresses)))
+    assert generator.get_remaining_count() == generator.max_available - 999
+
+    small = IPv6Generator("2001:db8::/124", strategy=STRATEGY_RANDOM, seed=1)
+    assert len({small.get_next_ip() for _ in range(small.max_available)}) == small.max_available
+    with pytest.raises(IndexError):
+        small.get_next_ip()
+
+    generator = IPv6Generator("2001:db8:1::/64", strategy=STRATEGY_EUI64)
+    first = generator.get_next_ip("ac-cb-51-12-34-56")
+    generator.get_next_ip("ac-cb-51-12-34-57")
+    assert generator.get_next_ip("ac-cb-51-12-34-56") == first
+    assert generator.get_current_ip() == first
+    assert generator.get_network_info()["used_hosts"] == 2
@@ -0,0 +1,52 @@
+import ipaddress
+
+from pysadp.ip_generator import IPGenerator
+from pysadp.leases import LeaseStore
+
+MAC_A, MAC_B, MAC_C = "ac-cb-51-00-00-0a", "ac-cb-51-00-00-0b", "ac-cb-51-00-00-0c"
+
+
+def ip_int(ip: str) -> int:
+    return int(ipaddress.IPv4Address(ip))
+
+
+def test_leases_persist_across_store_instances(tmp_path):
+    path = str(tmp_path / "leases.db")
+    store = LeaseStore(path)
+    generator = IPGenerator("192.168.1.100", 24, lease_store=store)
+    assert [generator.get_next_ip(mac) for mac in (MAC_A, MAC_B)] == ["192.168.1.100", "192.168.1.101"]
+    store.close()
+
+    store = LeaseStore(path)
+    assert len(store) == 2
+    assert store.lookup("192.168.1.0/24", MAC_B.upper().replace("-", ":")) == ip_int("192.168.1.101")
+    generator = IPGenerator("192.168.1.100", 24, lease_store=store)
+    assert generator.get_next_ip(MAC_B) == "192.168.1.101"
+    assert generator.get_next_ip(MAC_C) == "192.168.1.102"
+    store.close()
+
+
+def test_same_mac_gets_the_same_address_and_reports_it_as_current():
+    generator = IPGenerator("192.168.1.100", 24, lease_store=LeaseStore(":memory:"))
+    first = generator.get_next_ip(MAC_A)
+    generator.get_next_ip(MAC_B)
+    assert generator.get_next_ip(MAC_A) == first
+    assert generator.get_current_ip() == first
+
+    assert generator.recycle_current_ip()
+    assert generator.get_current_ip() is None
+    assert generator.lease_store.lookup(str(generator.network), MAC_A) is None
+
+
+def test_skips_and_does_not_count_addresses_leased_to_other_macs():
+    store = LeaseStore(":memory:")
+    store.assign("192.168.1.0/24", MAC_B, ip_int("192.168.1.101"))
+    store.assign("192.168.1.0/24", MAC_C, ip_int("192.168.1.200"))
+    generator = IPGenerator("192.168.1.100", 24, lease_store=store)
+    assert generator.get_remaining_count() == 155 - 2
+
+    assert generator.get_next_ip(MAC_A) == "192.168.1.100"
+    assert generator.get_next_ip("ac-cb-51-00-00-0d") == "192.168.1.102"
+    assert generator.get_remaining_count() == 152 - 1
+    info = generator.get_network_info()
+    assert info["available_hosts"] + info["used_hosts"] == info["total_hosts"]
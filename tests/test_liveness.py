@@ -0,0 +1,50 @@
+import random
+
+from pysadp.liveness import LivenessTracker, TimingWheel
+
+
+def test_entries_expire_on_their_tick_across_levels():
+    wheel = TimingWheel(slots=4, levels=3)
+    rng = random.Random(3)
+    expires = {f"k{index}": rng.randrange(1, 200) for index in range(300)}
+    # 第0层、逐层下移及超出时间轮范围(4**3)后重新挂入的条目
+    expires.update(near=1, level1=5, level2=20, edge=63, beyond=150)
+    for key, expire in expires.items():
+        wheel.schedule(key, expire)
+
+    fired = {}
+    for tick in range(1, 201):
+        for key, expire in wheel.advance(tick):
+            assert key not in fired
+            fired[key] = (tick, expire)
+    assert fired == {key: (expire, expire) for key, expire in expires.items()}
+
+
+def test_advance_over_many_ticks_returns_everything_due():
+    wheel = TimingWheel(slots=4, levels=2)
+    for expire in (3, 9, 17, 40):
+        wheel.schedule(expire, expire)
+    assert sorted(key for key, _ in wheel.advance(20)) == [3, 9, 17]
+    assert wheel.advance(39) == []
+    assert wheel.advance(40) == [(40, 40)]
+
+
+def test_touch_rearms_a_device_instead_of_expiring_it():
+    tracker = LivenessTracker(ttl=10, tick=1, clock=lambda: 0.0)
+    tracker.touch("a", 0.0)
+    tracker.touch("b", 0.0)
+    tracker.touch("a", 8.0)
+
+    assert tracker.advance(10.0) == ["b"]
+    assert tracker.advance(17.0) == []
+    assert tracker.advance(18.0) == ["a"]
+    assert len(tracker) == 0
+
+
+def test_forgotten_devices_do_not_expire():
+    tracker = LivenessTracker(ttl=5, tick=1, clock=lambda: 0.0)
+    tracker.touch("a", 0.0)
+    tracker.forget("a")
+    assert tracker.advance(100.0) == []
+    tracker.touch("a", 100.0)
+    assert tracker.advance(105.0) == ["a"]
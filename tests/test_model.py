@@ -0,0 +1,71 @@
+import ctypes
+import sys
+
+import pytest
+
+from pysadp.base import SADP_DEVICE_INFO_V40, SADP_UPDATE, SADP_DEC
+from pysadp.model import DEVICE_INFO_FIELDS, DeviceInfo, field_layout
+
+from records import make_record
+
+
+def _resolve(record, path):
+    """按字段路径逐级读取ctypes属性，返回(所属结构体, 字段名)"""
+    *parents, name = path.split(".")
+    for parent in parents:
+        record = getattr(record, parent)
+    return record, name
+
+
+def _populated_record():
+    """每个字段填入互不相同的值"""
+    record = SADP_DEVICE_INFO_V40()
+    for number, path in enumerate(DEVICE_INFO_FIELDS.values(), start=1):
+        owner, name = _resolve(record, path)
+        field_type = dict(type(owner)._fields_)[name]
+        if issubclass(field_type, ctypes.Array):
+            setattr(owner, name, f"f{number}"[:ctypes.sizeof(field_type) - 1].encode())
+        else:
+            setattr(owner, name, number)
+    return record
+
+
+@pytest.mark.parametrize("name", list(DEVICE_INFO_FIELDS))
+def test_decoder_matches_ctypes_field_access(name):
+    record = _populated_record()
+    owner, attribute = _resolve(record, DEVICE_INFO_FIELDS[name])
+    expected = getattr(owner, attribute)
+    offset, field_type = field_layout(SADP_DEVICE_INFO_V40, DEVICE_INFO_FIELDS[name])
+    assert ctypes.addressof(owner) + getattr(type(owner), attribute).offset == ctypes.addressof(record) + offset
+
+    device_info = DeviceInfo(record)
+    if isinstance(expected, bytes):
+        assert getattr(device_info, name) == expected.decode("utf-8")
+        assert device_info.raw_value(name) == bytes(record)[offset:offset + ctypes.sizeof(field_type)]
+    else:
+        assert getattr(device_info, name) == expected
+        assert device_info.raw_value(name) == expected
+    assert getattr(DeviceInfo.from_buffer(b"\xff" + bytes(record), 1), name) == getattr(device_info, name)
+
+
+def test_device_info_is_a_compact_copy():
+    record = make_record(1)
+    device_info = DeviceInfo(record)
+    record.struSadpDeviceInfo.szIPv4Address = b"10.0.0.1"
+    assert device_info.ipv4_address == "192.168.1.1"
+    assert device_info._raw.struSadpDeviceInfo.szIPv4Address == b"192.168.1.1"
+    assert not hasattr(device_info, "__dict__")
+    assert sys.getsizeof(device_info) + sys.getsizeof(device_info._data) < ctypes.sizeof(SADP_DEVICE_INFO_V40)
+
+
+def test_with_result_replaces_only_the_message_type():
+    device_info = DeviceInfo(make_record(3, result=SADP_UPDATE))
+    device_info.mac
+    offline = device_info._with_result(SADP_DEC)
+    assert (offline.result, device_info.result) == (SADP_DEC, SADP_UPDATE)
+    assert offline.mac == device_info.mac and offline.serial_no == device_info.serial_no
+
+
+def test_short_buffer_is_rejected():
+    with pytest.raises(ValueError):
+        DeviceInfo.from_buffer(b"\0" * 16)
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from pysadp.base import SADP_ADD, SADP_DEC, SADP_DEV_NET_PARAM, SADP_RESTART, SADP_UPDATE
+from pysadp.model import DeviceInfo
+from pysadp.multicast import MulticastSADP, build_message, device_fields
+from pysadp.responder import SADPResponder
+from pysadp.simulator import SimulatedSADP
+
+from records import make_record
+
+
+def _refuse_request(fields):
+    raise AssertionError(f"不应发送报文: {fields}")
+
+
+def test_activate_refuses_plaintext_password(monkeypatch):
+    backend = MulticastSADP()
+    monkeypatch.setattr(backend, "_request", _refuse_request)
+    assert asyncio.run(backend.activate("SN0001", "Passw0rd!")) == 2041
+
+
+def test_modify_refuses_plaintext_password(monkeypatch):
+    backend = MulticastSADP()
+    monkeypatch.setattr(backend, "_request", _refuse_request)
+    result = asyncio.run(backend.modify("00-11-22-33-44-55", "Passw0rd!", SADP_DEV_NET_PARAM()))
+    assert result == (2041, 0, 0)
+
+
+def test_result_codes_match_the_dll_when_a_device_goes_offline_and_returns():
+    backend = MulticastSADP(offline_after=1)
+    events = []
+    backend._callback = lambda pointer, user_data: events.append(pointer.contents.struSadpDeviceInfo.iResult)
+
+    def answer(ip: str = "192.168.1.1", boot_time: bytes = b"") -> None:
+        record = make_record(1, ip=ip)
+        record.struSadpDeviceInfo.szBootTime = boot_time
+        message = [("Types", "inquiry"), *device_fields(DeviceInfo(record))]
+        backend._on_datagram(build_message("ProbeMatch", message), ("127.0.0.1", 37020))
+
+    answer()
+    backend._probe()
+    answer(ip="192.168.1.99")
+    # 开机时间变化但设备未判定下线，与DLL一致仍为更新
+    answer(boot_time=b"2026-01-01 00:00:00")
+    backend._probe()
+    backend._probe()
+    backend._probe()
+    answer()
+    answer()
+
+    assert events == [SADP_ADD, SADP_UPDATE, SADP_UPDATE, SADP_DEC, SADP_RESTART, SADP_UPDATE]
+
+
+@pytest.fixture
+def responder():
+    simulator = SimulatedSADP(devices=1, inactive_ratio=1.0, latency=0)
+    ready, loop, stop = threading.Event(), None, None
+
+    def serve():
+        async def main():
+            nonlocal loop, stop
+            loop, stop = asyncio.get_running_loop(), asyncio.Event()
+            async with SADPResponder(simulator, interface="127.0.0.1", port=37031):
+                ready.set()
+                await stop.wait()
+
+        asyncio.run(main())
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield simulator
+    loop.call_soon_threadsafe(stop.set)
+    thread.join(5)
+
+
+def test_activate_with_opt_in_reaches_responder(responder):
+    serial_no = responder._devices[0].record.struSadpDeviceInfo.szSerialNO.decode()
+    backend = MulticastSADP(interfaces=["127.0.0.1"], port=37031, timeout=1.0, allow_plaintext_password=True)
+
+    async def run():
+        assert await backend._open() == 0
+        try:
+            return await backend.activate(serial_no, "Passw0rd!")
+        finally:
+            backend._close()
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,61 @@
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from pysadp.base import SADP_DEC, SADP_UPDATE
+from pysadp.pending import OperationError, PendingOperations
+
+from records import make_device, make_record, make_sadp
+
+
+def test_activation_future_resolves_on_the_discovery_event():
+    sadp, backend = make_sadp()
+    backend.fire(make_record(1, activated=1))
+    future = sadp.submit_activate(sadp.devices.get(make_device(1).mac), "Passw0rd!", timeout=5)
+    assert not future.done()
+
+    backend.fire(make_record(1, result=SADP_DEC, activated=0))
+    assert not future.done()
+    backend.fire(make_record(1, result=SADP_UPDATE, activated=0))
+    device_info = future.result(timeout=0)
+    assert device_info.is_activated and device_info.mac == make_device(1).mac
+    assert len(sadp._pending) == 0
+
+
+def test_modify_future_waits_for_the_requested_parameters():
+    sadp, backend = make_sadp()
+    backend.fire(make_record(1, activated=0))
+    future = sadp.submit_modify(sadp.devices.get(make_device(1).mac), "Passw0rd!", timeout=5,
+                                ipv4_address="10.0.0.5")
+    backend.fire(make_record(1, result=SADP_UPDATE, activated=0, ip="10.0.0.6"))
+    assert not future.done()
+    backend.fire(make_record(1, result=SADP_UPDATE, activated=0, ip="10.0.0.5"))
+    assert future.result(timeout=0).ipv4_address == "10.0.0.5"
+
+
+def test_future_times_out_without_a_confirming_event():
+    sadp, backend = make_sadp()
+    backend.fire(make_record(1, activated=1))
+    future = sadp.submit_activate(sadp.devices.get(make_device(1).mac), "Passw0rd!", timeout=0.05)
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2)
+    assert len(sadp._pending) == 0
+
+
+def test_sdk_failure_ends_the_future_with_operation_error():
+    sadp, backend = make_sadp()
+    backend.fire(make_record(1, activated=1))
+    backend.SADP_ActivateDevice = lambda serial_no, password: 0
+    backend.SADP_GetLastError = lambda: 2020
+    future = sadp.submit_activate(sadp.devices.get(make_device(1).mac), "Passw0rd!", timeout=5)
+    with pytest.raises(OperationError) as error:
+        future.result(timeout=0)
+    assert error.value.result["error_code"] == 2020
+
+
+def test_cancelled_futures_are_dropped_quietly():
+    pending = PendingOperations()
+    future = pending.expect(make_device(1).mac, lambda device_info: True, timeout=5)
+    assert future.cancel()
+    pending.resolve(make_device(1))
+    assert len(pending) == 0
@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+
+from pysadp.provision import (STATUS_CONFIRMED, STATUS_FAILED, STATUS_MISSING, Provisioner, _iter_json_array,
+                              load_plan)
+from pysadp.sadp import SADP
+from pysadp.simulator import SimulatedSADP
+
+
+def make_sadp(devices: int = 4) -> SADP:
+    simulator = SimulatedSADP(devices=devices, inactive_ratio=0.5, seed=5, announce_time=0, interval=0)
+    sadp = SADP(auto_request_interval=0, backend=simulator)
+    sadp.discover(until=devices, max_time=5)
+    return sadp
+
+
+def write_plan(tmp_path, sadp: SADP) -> str:
+    rows = [{"mac": device.mac, "ipv4_address": f"10.9.0.{index}", "ipv4_subnet_mask": "255.255.255.0"}
+            for index, device in enumerate(sorted(sadp.snapshot(), key=lambda d: d.mac), start=1)]
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(rows), encoding="utf-8")
+    return str(path)
+
+
+def count_calls(sadp: SADP) -> dict:
+    calls = {"activate": 0, "modify": 0}
+    activate, modify = sadp.lib.SADP_ActivateDevice, sadp.lib.SADP_ModifyDeviceNetParam_V40
+
+    def counted_activate(*args):
+        calls["activate"] += 1
+        return activate(*args)
+
+    def counted_modify(*args):
+        calls["modify"] += 1
+        return modify(*args)
+
+    sadp.lib.SADP_ActivateDevice = counted_activate
+    sadp.lib.SADP_ModifyDeviceNetParam_V40 = counted_modify
+    return calls
+
+
+def crash_after(plan, count: int):
+    for index, entry in enumerate(plan):
+        if index == count:
+            raise KeyboardInterrupt
+        yield entry
+
+
+def test_resume_skips_confirmed_devices(tmp_path):
+    sadp = make_sadp()
+    plan = write_plan(tmp_path, sadp)
+    journal = str(tmp_path / "journal.jsonl")
+
+    with pytest.raises(KeyboardInterrupt):
+        with Provisioner(sadp, "abcd1234", journal, concurrency=1, timeout=5) as provisioner:
+            provisioner.run(crash_after(load_plan(plan), 2))
+    assert provisioner.journal._file.closed
+
+    calls = count_calls(sadp)
+    with Provisioner(sadp, "abcd1234", journal, concurrency=1, timeout=5) as provisioner:
+        summary = provisioner.run(load_plan(plan))
+
+    assert list(summary.values()) == [STATUS_CONFIRMED] * 4
+    assert calls["modify"] == 2
+    assert sorted(device.ipv4_address for device in sadp.snapshot()) == [f"10.9.0.{i}" for i in range(1, 5)]
+
+
+def test_confirmed_devices_are_not_journaled_as_missing(tmp_path):
+    sadp = make_sadp()
+    plan = write_plan(tmp_path, sadp)
+    journal = tmp_path / "journal.jsonl"
+    with Provisioner(sadp, "abcd1234", str(journal), timeout=5) as provisioner:
+        provisioner.run(load_plan(plan))
+    lines = journal.read_text(encoding="utf-8").splitlines()
+
+    entries = list(load_plan(plan))
+    rerun = SADP(auto_request_interval=0, backend=SimulatedSADP(devices=0))
+    with Provisioner(rerun, "abcd1234", str(journal), timeout=5) as provisioner:
+        summary = provisioner.run(entries + [entries[0]._replace(key="unknown", mac="00-00-00-00-00-00")])
+
+    assert [summary[entry.key] for entry in entries] == [STATUS_CONFIRMED] * 4
+    assert summary["unknown"] == STATUS_MISSING
+    new_lines = journal.read_text(encoding="utf-8").splitlines()[len(lines):]
+    assert [json.loads(line)["key"] for line in new_lines] == ["unknown"]
+
+
+def test_unexpected_exceptions_are_journaled_as_failed(tmp_path):
+    sadp = make_sadp(devices=1)
+    plan = write_plan(tmp_path, sadp)
+    journal = tmp_path / "journal.jsonl"
+
+    def submit(*args, **kwargs):
+        raise OSError("socket closed")
+
+    sadp.submit_activate = sadp.submit_modify = submit
+    with Provisioner(sadp, "abcd1234", str(journal), timeout=5) as provisioner:
+        summary = provisioner.run(load_plan(plan))
+
+    assert list(summary.values()) == [STATUS_FAILED]
+    record = json.loads(journal.read_text(encoding="utf-8").splitlines()[-1])
+    assert (record["status"], record["error_code"], record["error"]) == (STATUS_FAILED, -1, "socket closed")
+
+
+def test_json_plans_are_streamed_across_chunks(tmp_path):
+    rows = [{"serial_no": f"SN{index}", "ipv4_address": f"10.9.0.{index}", "note": "x" * index}
+            for index in range(20)]
+    text = json.dumps(rows, indent=1)
+    assert list(_iter_json_array(io.StringIO(text), chunk_size=7)) == rows
+    assert list(_iter_json_array(io.StringIO(" [ ] "))) == []
+    for broken in ('{"mac": "x"}', '[{"mac": "x"}', '[{"mac": "x"} {"mac": "y"}]', "[1]"):
+        with pytest.raises(ValueError):
+            list(_iter_json_array(io.StringIO(broken), chunk_size=4))
+
+    path = tmp_path / "plan.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows[:3]) + "\n", encoding="utf-8")
+    assert [entry.serial_no for entry in load_plan(str(path))] == ["SN0", "SN1", "SN2"]
@@ -0,0 +1,70 @@
+import pytest
+
+from pysadp.base import SADP_DEC, SADP_UPDATE
+from pysadp.registry import DeviceListView, DeviceRegistry
+
+from records import make_device
+
+
+def test_list_view_index_access_reuses_snapshot_list():
+    registry = DeviceRegistry()
+    view = DeviceListView(registry)
+    for index in range(1, 4):
+        registry.apply(make_device(index))
+
+    assert [device.mac for device in view] == [view[i].mac for i in range(len(view))]
+    snapshot = registry.snapshot()
+    view[0]
+    items = snapshot._items
+    view[2]
+    assert registry.snapshot() is snapshot and snapshot._items is items
+
+
+def test_list_view_reflects_new_version():
+    registry = DeviceRegistry()
+    view = DeviceListView(registry)
+    registry.apply(make_device(1))
+    assert view[0].ipv4_address == "192.168.1.1"
+
+    registry.apply(make_device(1, result=SADP_UPDATE, ip="10.0.0.1"))
+    assert view[0].ipv4_address == "10.0.0.1"
+    registry.apply(make_device(1, result=SADP_DEC))
+    assert len(view) == 0 and view[:] == []
+
+
+def test_tombstones_are_bounded_and_old_versions_resync():
+    registry = DeviceRegistry(max_tombstones=2)
+    registry.apply(make_device(100))
+    for index in range(1, 11):
+        registry.apply(make_device(index))
+        registry.apply(make_device(index, result=SADP_DEC))
+
+    assert len(registry.snapshot()._log) <= 1 + 2 * 2
+    delta = registry.changed_since(1)
+    assert delta.resync and delta.removed == []
+    assert [device.mac for device in delta.updated] == [make_device(100).mac]
+
+    recent = registry.changed_since(registry.version - 1)
+    assert not recent.resync and recent.removed == [make_device(10).mac]
+
+
+def test_where_activated_matches_raw_value_and_attribute_filter():
+    registry = DeviceRegistry()
+    registry.apply(make_device(1, activated=1))
+    registry.apply(make_device(2, activated=0))
+    inactive, active = make_device(1).mac, make_device(2).mac
+
+    assert [device.mac for device in registry.where(activated=1)] == [inactive]
+    assert [device.mac for device in registry.where(activated=0)] == [active]
+    assert [device.mac for device in registry.where(is_activated=True)] == [active]
+    assert [device.mac for device in registry.where(is_activated=False, subnet="192.168.1.0/24")] == [inactive]
+
+
+def test_where_rejects_bool_activated():
+    registry = DeviceRegistry()
+    registry.apply(make_device(1, activated=1))
+
+    with pytest.raises(ValueError, match="is_activated"):
+        registry.where(activated=False, subnet="192.168.1.0/24")
+    with pytest.raises(ValueError):
+        registry.first(activated=[True, 1])
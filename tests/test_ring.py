@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from pysadp.model import DeviceInfo
+from pysadp.ring import OVERFLOW_BLOCK, OVERFLOW_DROP, OVERFLOW_DROP_OLDEST, RecordRing
+
+from records import make_device, make_record, make_sadp
+
+
+def fill(ring: RecordRing, indexes) -> list:
+    return [ring.push(make_record(index)) for index in indexes]
+
+
+def drain(ring: RecordRing) -> list:
+    macs = []
+    while True:
+        data = ring.pop(timeout=0)
+        if data is None:
+            return macs
+        macs.append(DeviceInfo(data).mac)
+
+
+def macs(indexes) -> list:
+    return [make_device(index).mac for index in indexes]
+
+
+def test_drop_oldest_overwrites_the_oldest_records():
+    ring = RecordRing(3, OVERFLOW_DROP_OLDEST)
+    assert fill(ring, range(1, 6)) == [True] * 5
+    assert drain(ring) == macs([3, 4, 5])
+    assert ring.stats() == {"capacity": 3, "size": 0, "high_water": 3, "pushed": 5, "dropped": 2}
+
+
+def test_drop_rejects_new_records_when_full():
+    ring = RecordRing(3, OVERFLOW_DROP)
+    assert fill(ring, range(1, 6)) == [True, True, True, False, False]
+    assert drain(ring) == macs([1, 2, 3])
+    assert (ring.pushed, ring.dropped) == (3, 2)
+
+
+def test_block_waits_for_the_consumer():
+    ring = RecordRing(2, OVERFLOW_BLOCK)
+    fill(ring, (1, 2))
+    done = threading.Event()
+    writer = threading.Thread(target=lambda: (ring.push(make_record(3)), done.set()))
+    writer.start()
+    assert not done.wait(0.05)
+
+    assert DeviceInfo(ring.pop()).mac == make_device(1).mac
+    assert done.wait(2)
+    writer.join()
+    assert drain(ring) == macs([2, 3])
+    assert ring.dropped == 0
+
+
+def test_close_releases_a_blocked_writer():
+    ring = RecordRing(1, OVERFLOW_BLOCK)
+    ring.push(make_record(1))
+    results = []
+    writer = threading.Thread(target=lambda: results.append(ring.push(make_record(2))))
+    writer.start()
+    time.sleep(0.02)
+    ring.close()
+    writer.join(2)
+    assert results == [False]
+    assert drain(ring) == macs([1])
+    assert ring.pop() is None
+
+
+def test_rejects_unknown_policies():
+    with pytest.raises(ValueError):
+        RecordRing(4, "spill")
+
+
+def test_sadp_ring_mode_delivers_through_the_consumer_thread():
+    sadp, backend = make_sadp()
+    sadp.sadp_stop()
+    assert sadp.start(ring_size=8, overflow=OVERFLOW_DROP)
+    threads = set()
+    sadp.add_listener(lambda device_info: threads.add(threading.current_thread().name))
+    for index in range(1, 4):
+        backend.fire(make_record(index))
+    sadp.sadp_stop()
+    assert threads == {"pysadp-ingest"}
+    assert len(sadp.devices) == 3
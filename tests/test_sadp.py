@@ -0,0 +1,116 @@
+import pytest
+
+from pysadp.allocator import IPAllocator
+from pysadp.backend import SADPBackend
+from pysadp.base import SADP_ADD, SADP_DEC, SADP_RESTART, SADP_UPDATE
+from pysadp.multicast import MulticastSADP
+from pysadp.simulator import SimulatedSADP
+
+from records import make_device, make_record, make_sadp
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.macs = []
+
+    def on_device(self, device_info) -> None:
+        self.macs.append(device_info.mac)
+
+
+def test_remove_listener_accepts_a_fresh_bound_method():
+    sadp, backend = make_sadp()
+    recorder = Recorder()
+    sadp.add_listener(recorder.on_device)
+    backend.fire(make_record(1))
+    sadp.remove_listener(recorder.on_device)
+    backend.fire(make_record(2))
+
+    assert recorder.macs == [make_record(1).struSadpDeviceInfo.szMAC.decode()]
+    assert sadp._listeners == []
+
+
+def test_filters_apply_to_callbacks_but_not_to_the_registry():
+    sadp, backend = make_sadp()
+    recorder = Recorder()
+    sadp.add_listener(recorder.on_device)
+    sadp.add_filter("activated", 1)
+    sadp.add_filter("result", {SADP_ADD, SADP_UPDATE, SADP_RESTART})
+    backend.fire(make_record(1, activated=1))
+    backend.fire(make_record(2, activated=0))
+    mac1, mac2 = (make_record(index).struSadpDeviceInfo.szMAC.decode() for index in (1, 2))
+
+    assert recorder.macs == [mac1]
+    assert mac1 in sadp.devices and mac2 in sadp.devices
+
+    backend.fire(make_record(1, result=SADP_DEC))
+    assert mac1 not in sadp.devices and recorder.macs == [mac1]
+
+
+def test_filters_do_not_hide_devices_from_internal_listeners():
+    sadp, backend = make_sadp()
+    allocator = IPAllocator("192.168.1.10", 24)
+    allocator.attach(sadp)
+    recorder = Recorder()
+    sadp.add_listener(recorder.on_device)
+    sadp.add_filter("activated", 1)
+    backend.fire(make_record(10, activated=0, ip="192.168.1.10"))
+    backend.fire(make_record(11, activated=1, ip="192.168.1.11"))
+
+    assert recorder.macs == [make_record(11).struSadpDeviceInfo.szMAC.decode()]
+    assert allocator.get_next_ip() == "192.168.1.12"
+
+
+def test_disable_adaptive_interval_removes_its_listener():
+    sadp, _ = make_sadp()
+    listeners = list(sadp._unfiltered_listeners)
+    controller = sadp.enable_adaptive_interval()
+    assert sadp._unfiltered_listeners == listeners + [controller.listener]
+
+    sadp.disable_adaptive_interval()
+    assert sadp._unfiltered_listeners == listeners
+
+
+def test_activate_many_records_exceptions_per_device():
+    sadp, backend = make_sadp()
+    devices = [make_device(index) for index in range(1, 4)]
+
+    def activate(serial_no, password):
+        if serial_no.endswith(b"2"):
+            raise OSError("socket closed")
+        return 1
+
+    backend.SADP_ActivateDevice = activate
+    results = sadp.activate_many(devices, "Passw0rd!", concurrency=2)
+    assert [results[device.mac]["success"] for device in devices] == [True, False, True]
+    assert results[devices[1].mac]["error_code"] == -1
+    assert results[devices[1].mac]["error_message"] == "socket closed"
+    assert results[devices[1].mac].keys() == results[devices[0].mac].keys()
+    assert results[devices[1].mac]["serial_no"] == devices[1].serial_no
+
+
+def test_modify_many_records_exceptions_per_device():
+    sadp, backend = make_sadp()
+    devices = [make_device(index) for index in range(1, 4)]
+
+    def modify(mac, password, net_param, ret_net_param, ret_size):
+        if mac.endswith(b"03"):
+            raise OSError("socket closed")
+        return 1
+
+    backend.SADP_ModifyDeviceNetParam_V40 = modify
+    params = {device: {"ipv4_address": f"10.0.0.{index}"} for index, device in enumerate(devices, start=1)}
+    results = sadp.modify_many(params, "Passw0rd!", concurrency=2)
+    assert [results[device.mac]["success"] for device in devices] == [True, True, False]
+    assert results[devices[2].mac]["error_code"] == -1
+    assert results[devices[2].mac]["error_message"] == "socket closed"
+
+
+def test_backend_must_implement_every_sdk_function():
+    class Partial(SADPBackend):
+        def SADP_Start_V40(self, callback, user_data=None) -> int:
+            return 1
+
+    with pytest.raises(TypeError):
+        Partial()
+    SimulatedSADP(devices=1)
+    MulticastSADP()
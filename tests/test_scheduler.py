@@ -0,0 +1,75 @@
+import time
+
+from pysadp.model import DeviceInfo
+from pysadp.sadp import SADP
+from pysadp.scheduler import (STATUS_FAILED, STATUS_LOCKED, STATUS_PASSWORD, STATUS_SUCCESS,
+                              NetParamScheduler)
+from pysadp.simulator import SimulatedSADP
+
+MINUTE = 0.2
+
+
+def make_simulator(devices: int = 2, **kwargs):
+    simulator = SimulatedSADP(devices=devices, inactive_ratio=0, password="abcd1234", minute=MINUTE, **kwargs)
+    sadp = SADP(auto_request_interval=0, backend=simulator)
+    return sadp, simulator, [DeviceInfo(device.record) for device in simulator._devices]
+
+
+def test_stops_trying_passwords_before_the_device_locks():
+    sadp, simulator, devices = make_simulator(devices=1, max_retries=3)
+    scheduler = NetParamScheduler(sadp, ["bad-1", "bad-2", "abcd1234"], reserve_attempts=1, minute=MINUTE)
+    scheduler.add(devices[0], ipv4_address="10.1.0.1")
+    result = scheduler.run()[devices[0].mac]
+
+    assert (result["status"], result["attempts"], result["retry_modify_time"]) == (STATUS_PASSWORD, 2, 1)
+    assert simulator._devices[0].locked_until == 0.0
+
+
+def test_tries_the_next_password_after_a_password_error():
+    sadp, _, devices = make_simulator(devices=1, max_retries=3)
+    scheduler = NetParamScheduler(sadp, ["bad-1", "abcd1234"], reserve_attempts=1, minute=MINUTE)
+    scheduler.add(devices[0], ipv4_address="10.1.0.1")
+    result = scheduler.run()[devices[0].mac]
+
+    assert (result["status"], result["attempts"]) == (STATUS_SUCCESS, 2)
+
+
+def test_parks_a_locked_device_and_keeps_working_on_others():
+    sadp, simulator, devices = make_simulator(max_retries=1, lock_minutes=1)
+    net_param = sadp.build_net_param(devices[0])
+    assert sadp.modify_net_param(devices[0], "bad", net_param)["error_code"] == 2018
+
+    scheduler = NetParamScheduler(sadp, "abcd1234", concurrency=1, retry_delay=0.05, minute=MINUTE)
+    scheduler.add(devices[0], ipv4_address="10.1.0.1")
+    scheduler.add(devices[1], ipv4_address="10.1.0.2")
+    finished = []
+    start = time.monotonic()
+    results = scheduler.run(lambda device_info, result: finished.append((device_info.mac, time.monotonic())))
+
+    assert [mac for mac, _ in finished] == [devices[1].mac, devices[0].mac]
+    assert finished[0][1] - start < MINUTE
+    assert finished[1][1] - start >= MINUTE
+    assert (results[devices[0].mac]["status"], results[devices[0].mac]["attempts"]) == (STATUS_SUCCESS, 2)
+    assert simulator._devices[0].record.struSadpDeviceInfo.szIPv4Address == b"10.1.0.1"
+
+
+def test_gives_up_when_the_lock_outlasts_max_lock_wait():
+    sadp, _, devices = make_simulator(devices=1, max_retries=1, lock_minutes=5)
+    sadp.modify_net_param(devices[0], "bad", sadp.build_net_param(devices[0]))
+
+    scheduler = NetParamScheduler(sadp, "abcd1234", max_lock_wait=MINUTE * 2, minute=MINUTE)
+    scheduler.add(devices[0], ipv4_address="10.1.0.1")
+    result = scheduler.run()[devices[0].mac]
+
+    assert (result["status"], result["attempts"], result["surplus_lock_time"]) == (STATUS_LOCKED, 1, 5)
+
+
+def test_retries_other_errors_with_backoff():
+    sadp, _, devices = make_simulator(devices=1, error_rate=1.0)
+    scheduler = NetParamScheduler(sadp, "abcd1234", max_attempts=3, retry_delay=0.02, minute=MINUTE)
+    scheduler.add(devices[0], ipv4_address="10.1.0.1")
+    start = time.monotonic()
+    result = scheduler.run()[devices[0].mac]
+
+    assert (result["status"], result["attempts"]) == (STATUS_FAILED, 3)
+    assert time.monotonic() - start >= 0.02 + 0.04
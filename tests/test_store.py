@@ -0,0 +1,51 @@
+import ctypes
+
+from pysadp.base import SADP_DEC, SADP_UPDATE
+from pysadp.store import RecordStore
+
+from records import make_record, make_sadp
+
+
+def test_live_device_is_a_view_and_superseded_device_keeps_its_record():
+    sadp, backend = make_sadp()
+    backend.fire(make_record(1))
+    first = sadp.devices.get(make_record(1).struSadpDeviceInfo.szMAC.decode())
+    assert first._data is None
+
+    backend.fire(make_record(1, result=SADP_UPDATE, ip="10.0.0.1"))
+    current = sadp.devices.get(first.mac)
+    assert current is not first and current._data is None
+    assert first._data is not None
+    assert (first.ipv4_address, current.ipv4_address) == ("192.168.1.1", "10.0.0.1")
+    assert first._raw.struSadpDeviceInfo.szIPv4Address == b"192.168.1.1"
+    assert current.changed_fields == {"ipv4_address"}
+
+
+def test_unchanged_update_is_compared_in_place_without_copying(monkeypatch):
+    sadp, backend = make_sadp()
+    backend.fire(make_record(2))
+    device_info = sadp.devices.get(make_record(2).struSadpDeviceInfo.szMAC.decode())
+    update = make_record(2, result=SADP_UPDATE)
+
+    def no_copy(*args):
+        raise AssertionError("unexpected copy")
+
+    monkeypatch.setattr(ctypes, "string_at", no_copy)
+    backend.fire(update)
+    monkeypatch.undo()
+    assert sadp.suppressed_updates == 1
+    assert sadp.devices.get(device_info.mac) is device_info and device_info._data is None
+
+
+def test_released_and_reused_slots_do_not_change_old_devices():
+    sadp, backend = make_sadp()
+    sadp._store = RecordStore(capacity=1)
+    backend.fire(make_record(1))
+    gone = sadp.devices.get(make_record(1).struSadpDeviceInfo.szMAC.decode())
+    backend.fire(make_record(1, result=SADP_DEC))
+    for index in range(2, 6):
+        backend.fire(make_record(index, ip=f"10.0.0.{index}"))
+
+    assert gone.ipv4_address == "192.168.1.1" and gone.serial_no.endswith("000000001")
+    assert sadp._store.capacity >= 4
+    assert [device.ipv4_address for device in sadp.snapshot()] == [f"10.0.0.{index}" for index in range(2, 6)]